@@ -0,0 +1,320 @@
+# BENCHMARKS FOR THE MULTI-CAMERA TOOLBOX
+#
+# Builds synthetic scenes with many cameras and objects, and measures how long the
+# add-on takes for the things that happen all the time: depsgraph updates, Preview
+# Sequence playback, rebuilding the camera list, resizing the render border and
+# rendering all cameras. Run it with Blender from the root of the repository:
+#
+#   blender -b --factory-startup --python benchmarks/benchmark_multicam.py -- --output results.json
+#
+# Everything after -- is read by this script, see --help. The results are written
+# as JSON, so two releases of jb-multicamera.py can be compared by running the same
+# command against each of them (--addon picks the file to load).
+
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import platform
+import tempfile
+import statistics
+import importlib
+import importlib.util
+
+import bpy
+
+
+default_addon_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "jb-multicamera.py")
+
+
+def parse_arguments(argv):
+	parser = argparse.ArgumentParser(
+		prog="blender -b --factory-startup --python benchmarks/benchmark_multicam.py --",
+		description="Measure the performance of the Multi-Camera Toolbox in synthetic scenes.",
+	)
+	parser.add_argument("--addon", default=default_addon_path, help="The jb-multicamera.py to measure (default: the one in this repository)")
+	parser.add_argument("--cameras", type=int, nargs="+", default=[10, 100, 1000], help="Camera counts to measure, e.g. 10 1000 5000")
+	parser.add_argument("--objects", type=int, nargs="+", default=[1000, 10000], help="Object counts to measure, e.g. 1000 200000")
+	parser.add_argument("--frames", type=int, default=250, help="Length of the animation, shared by the frame ranges of the cameras")
+	parser.add_argument("--animated-share", type=float, default=0.1, help="Share of the objects with an animated hide_render")
+	parser.add_argument("--repeat", type=int, default=50, help="Samples taken of the quick measurements")
+	parser.add_argument("--render-cameras", type=int, default=10, help="Cameras rendered by Render All, 0 skips rendering")
+	parser.add_argument("--render-size", type=int, default=64, help="Width of the rendered images in pixels")
+	parser.add_argument("--engines", nargs="+", default=["BLENDER_WORKBENCH", "CYCLES"], help="Render engines to measure Render All with")
+	parser.add_argument("--seed", type=int, default=1, help="Seed for the random placement and animation")
+	parser.add_argument("--output", help="File to write the JSON results to (default: print them)")
+	return parser.parse_args(argv)
+
+
+def load_addon(path):
+	# The file name is not a valid module name, so it is loaded from its path
+	spec = importlib.util.spec_from_file_location("jb_multicamera", path)
+	addon = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(addon)
+	addon.register()
+	return addon
+
+
+def get_file_checksum(path):
+	with open(path, "rb") as addon_file:
+		return hashlib.sha256(addon_file.read()).hexdigest()
+
+
+def summarize(samples):
+	# Times in milliseconds
+	samples = sorted(samples)
+	if not samples:
+		return None
+	return {
+		"count": len(samples),
+		"mean_ms": statistics.fmean(samples) * 1000,
+		"p50_ms": samples[(len(samples) - 1) // 2] * 1000,
+		"p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+		"max_ms": samples[-1] * 1000,
+	}
+
+
+def time_calls(function, repeat):
+	samples = []
+	for _ in range(repeat):
+		start_time = time.perf_counter()
+		function()
+		samples.append(time.perf_counter() - start_time)
+	return samples
+
+
+def build_scene(camera_count, object_count, arguments):
+	# Starts from an empty file, so every case measures the same kind of scene
+	bpy.ops.wm.read_factory_settings(use_empty=True)
+	scene = bpy.context.scene
+	scene.frame_start = 1
+	scene.frame_end = arguments.frames
+	random_numbers = random.Random(arguments.seed)
+
+	# One shared triangle keeps the memory use down with many objects
+	mesh = bpy.data.meshes.new("Benchmark Triangle")
+	mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+
+	objects_collection = bpy.data.collections.new("Benchmark Objects")
+	scene.collection.children.link(objects_collection)
+	animated_count = int(object_count * arguments.animated_share)
+	for object_index in range(object_count):
+		obj = bpy.data.objects.new(f"Object {object_index:06d}", mesh)
+		obj.location = (random_numbers.uniform(-50, 50), random_numbers.uniform(-50, 50), random_numbers.uniform(0, 10))
+		objects_collection.objects.link(obj)
+		if object_index < animated_count:
+			# Hidden from renders for a random stretch of the animation
+			hidden_from = random_numbers.randint(1, arguments.frames)
+			hidden_until = min(arguments.frames, hidden_from + random_numbers.randint(1, 50))
+			for frame, hide_render in ((1, False), (hidden_from, True), (hidden_until, False)):
+				obj.hide_render = hide_render
+				obj.keyframe_insert("hide_render", frame=frame)
+
+	# The frame ranges in the camera names split the animation into equal shots
+	cameras_collection = bpy.data.collections.new("Benchmark Cameras")
+	scene.collection.children.link(cameras_collection)
+	shot_length = max(1, arguments.frames // camera_count)
+	for camera_index in range(camera_count):
+		range_start = 1 + camera_index * shot_length
+		range_end = range_start + shot_length - 1
+		camera = bpy.data.objects.new(f"Camera {camera_index:04d} {range_start}-{range_end}", bpy.data.cameras.new(f"Camera {camera_index:04d}"))
+		camera.location = (random_numbers.uniform(-60, 60), random_numbers.uniform(-60, 60), random_numbers.uniform(1, 20))
+		camera.rotation_euler = (1.2, 0, random_numbers.uniform(0, 6.28))
+		# Every other camera renders in a custom resolution
+		if camera_index % 2:
+			camera["x_dim"] = arguments.render_size
+			camera["y_dim"] = arguments.render_size * 2
+		cameras_collection.objects.link(camera)
+
+	scene.camera = cameras_collection.objects[0]
+	scene.render.resolution_x = arguments.render_size * 2
+	scene.render.resolution_y = arguments.render_size
+	scene.render.resolution_percentage = 100
+	scene.resume_interrupted_renders = False
+	return scene
+
+
+def make_camera_active(scene, camera):
+	view_layer = bpy.context.view_layer
+	for obj in view_layer.objects.selected:
+		obj.select_set(False)
+	camera.select_set(True)
+	view_layer.objects.active = camera
+
+
+def measure_depsgraph_updates(addon, scene, arguments):
+	# Moves an object and lets Blender evaluate the scene, which runs the depsgraph
+	# handler of the add-on. The handler time comes from the profiler of the add-on.
+	view_layer = bpy.context.view_layer
+	scheduled_cameras = addon.get_frame_range_index(scene).cameras
+	make_camera_active(scene, scheduled_cameras[0] if scheduled_cameras else scene.camera)
+	moved_object = bpy.data.objects[0]
+	view_layer.update()
+
+	addon.profiler.reset()
+	addon.profiler.is_recording = True
+	update_samples = []
+	for step in range(arguments.repeat):
+		moved_object.location.x += 0.01 if step % 2 else -0.01
+		start_time = time.perf_counter()
+		view_layer.update()
+		update_samples.append(time.perf_counter() - start_time)
+	addon.profiler.is_recording = False
+
+	handler_stats = addon.profiler.summary()["calls"].get("update_multiresolution_camera_frame")
+	return {"view_layer_update": summarize(update_samples), "handler": handler_stats}
+
+
+def measure_playback(scene, arguments, show_only_render):
+	# Steps through the animation the way playback does, with Preview Sequence on
+	scene.is_previewing_animation = True
+	scene.sor_show_only_render = show_only_render
+	scene.sor_refresh_with_frame = show_only_render
+	scene.frame_set(scene.frame_start)
+
+	frame_samples = []
+	start_time = time.perf_counter()
+	for frame in range(scene.frame_start, scene.frame_end + 1):
+		frame_start_time = time.perf_counter()
+		scene.frame_set(frame)
+		frame_samples.append(time.perf_counter() - frame_start_time)
+	duration = time.perf_counter() - start_time
+
+	scene.sor_refresh_with_frame = False
+	scene.sor_show_only_render = False
+	scene.is_previewing_animation = False
+	return {"frames_per_second": len(frame_samples) / duration if duration else None, "frame": summarize(frame_samples)}
+
+
+def measure_camera_list(addon, scene, arguments):
+	return summarize(time_calls(lambda: addon.populate_camera_list(scene), arguments.repeat))
+
+
+def measure_render_border(addon, scene, arguments):
+	# Alternates between two sizes, so every call has something to change
+	camera = scene.camera
+	sizes = [(arguments.render_size, arguments.render_size * 2), (arguments.render_size * 2, arguments.render_size)]
+	samples = []
+	for step in range(arguments.repeat):
+		width, height = sizes[step % 2]
+		start_time = time.perf_counter()
+		addon.resize_passepartout(camera, width, height)
+		samples.append(time.perf_counter() - start_time)
+	return summarize(samples)
+
+
+def measure_render_border_extents(addon, scene, arguments):
+	# The camera math without bpy: every camera in one vectorized call, against
+	# one call per camera. The add-on put the folder of the core on the path.
+	core = importlib.import_module("jb_multicamera_core")
+	cameras = [bpy.data.objects[camera_item.name] for camera_item in scene.cameras]
+	angles = [camera.data.angle for camera in cameras]
+	clip_starts = [camera.data.clip_start for camera in cameras]
+	widths = [camera_item.x_dim for camera_item in scene.cameras]
+	heights = [camera_item.y_dim for camera_item in scene.cameras]
+
+	def per_camera():
+		for camera_values in zip(angles, clip_starts, widths, heights):
+			core.get_render_border_vertices(*camera_values)
+
+	return {
+		"vectorized": summarize(time_calls(lambda: core.get_render_border_extents(angles, clip_starts, widths, heights), arguments.repeat)),
+		"per_camera": summarize(time_calls(per_camera, arguments.repeat)),
+	}
+
+
+def measure_render_all(addon, scene, arguments, engine, fast_batch):
+	# The setup and sampling time of the renders come from the profiler of the add-on
+	scene.render.engine = engine
+	scene.use_fast_batch = fast_batch
+	if engine == 'CYCLES':
+		scene.cycles.device = 'CPU'
+		scene.cycles.samples = 1
+		scene.cycles.use_denoising = False
+
+	camera_items = list(scene.cameras)[:arguments.render_cameras]
+	addon.profiler.reset()
+	addon.profiler.is_recording = True
+	with tempfile.TemporaryDirectory() as output_directory:
+		scene.render.filepath = output_directory + os.sep
+		start_time = time.perf_counter()
+		addon.render_images(scene, camera_items)
+		duration = time.perf_counter() - start_time
+	addon.profiler.is_recording = False
+
+	phases = [phase for camera_phases in addon.profiler.render_phases.values() for phase in camera_phases]
+	return {
+		"cameras": len(camera_items),
+		"seconds": duration,
+		"images_per_second": len(camera_items) / duration if duration else None,
+		"setup_seconds": sum(setup for setup, _ in phases),
+		"sampling_seconds": sum(sampling for _, sampling in phases),
+	}
+
+
+def run_case(addon, camera_count, object_count, arguments):
+	print(f"\nBenchmark: {camera_count} cameras, {object_count} objects")
+	start_time = time.perf_counter()
+	scene = build_scene(camera_count, object_count, arguments)
+	addon.populate_camera_list(scene)
+	addon.compile_frame_range_index(scene)
+	setup_duration = time.perf_counter() - start_time
+
+	metrics = {
+		"depsgraph_update": measure_depsgraph_updates(addon, scene, arguments),
+		"preview_sequence_playback": measure_playback(scene, arguments, False),
+		"preview_sequence_playback_show_only_render": measure_playback(scene, arguments, True),
+		"populate_camera_list": measure_camera_list(addon, scene, arguments),
+		"resize_passepartout": measure_render_border(addon, scene, arguments),
+		"render_border_extents": measure_render_border_extents(addon, scene, arguments),
+	}
+	if arguments.render_cameras > 0:
+		metrics["render_all"] = {
+			engine: {
+				"default": measure_render_all(addon, scene, arguments, engine, False),
+				"fast_batch": measure_render_all(addon, scene, arguments, engine, True),
+			}
+			for engine in arguments.engines
+		}
+
+	return {
+		"cameras": camera_count,
+		"objects": object_count,
+		"frames": arguments.frames,
+		"setup_seconds": setup_duration,
+		"metrics": metrics,
+	}
+
+
+def main(argv):
+	arguments = parse_arguments(argv)
+	addon = load_addon(arguments.addon)
+
+	results = {
+		"addon": os.path.abspath(arguments.addon),
+		"addon_sha256": get_file_checksum(arguments.addon),
+		"addon_version": ".".join(str(number) for number in addon.bl_info["version"]),
+		"blender_version": bpy.app.version_string,
+		"platform": platform.platform(),
+		"python_version": platform.python_version(),
+		"started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+		"cases": [],
+	}
+	for camera_count in arguments.cameras:
+		for object_count in arguments.objects:
+			results["cases"].append(run_case(addon, camera_count, object_count, arguments))
+
+	output = json.dumps(results, indent=2)
+	if arguments.output:
+		with open(arguments.output, "w", encoding="utf-8") as results_file:
+			results_file.write(output + "\n")
+		print(f"\nSaved benchmark results to {arguments.output}")
+	else:
+		print(output)
+
+
+if __name__ == "__main__":
+	main(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
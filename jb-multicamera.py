@@ -30,14 +30,188 @@ import time
 import math
 import bpy
 import os
-import re
+import sys
+import bisect
+import fnmatch
+import argparse
+import json
+import queue
+import threading
+import subprocess
+import hashlib
+import zlib
+import struct
+import functools
+import shutil
+import collections
+import numpy as np
+import bpy.utils.previews
 from bpy.app.handlers import persistent
 from bpy.props import BoolProperty, EnumProperty, StringProperty, IntProperty
+from bpy_extras.io_utils import ExportHelper
+
+# The camera math without bpy lives in jb_multicamera_core.py, installed next to
+# this file. Blender puts the add-ons folder on the path, running this file with
+# --python does not.
+addon_directory = os.path.dirname(os.path.abspath(__file__))
+if addon_directory not in sys.path:
+	sys.path.append(addon_directory)
+
+from jb_multicamera_core import (
+	get_render_border_vertices,
+	get_view_frame,
+	get_frustum_planes,
+	get_boxes_in_frustum,
+	ensure_extension,
+	get_image_extension,
+	get_supported_color_depth,
+	format_camera_output_path,
+	FrameRangeIndex,
+	parse_frame_ranges,
+	get_first_frame,
+	compile_frame_range_schedule,
+	build_sequence_render_plan,
+	get_contiguous_runs,
+	is_sampling_status,
+)
 
 
 key_mesh = "Multi-Resolution Camera Mesh"
 key_passepartout = "Multi-Resolution Camera Frame"
 
+# For each scene (keyed by its pointer) the camera objects in scene.cameras,
+# mapping the object pointer to the camera name. Used to sync the camera list
+# without walking every object in the scene. Only pointers are kept, never the
+# objects: a deleted object must not be touched, see resolve_indexed_cameras.
+camera_list_indices = {}
+
+# For each scene (keyed by its pointer) a CameraListCache, see get_camera_list_cache.
+camera_list_caches = {}
+
+# Signature of the inputs the render border was last built from,
+# see get_render_border_signature.
+render_border_signature = None
+
+# The compiled FrameRangeIndex of each scene, keyed by scene pointer.
+frame_range_indices = {}
+
+# The camera names the frame range schedule of each scene was parsed from, keyed
+# by scene pointer, then camera pointer. A camera whose name no longer matches
+# is the only one parsed again. Like the camera list index, only pointers and
+# names are kept, see resolve_indexed_cameras.
+frame_range_names = {}
+
+# Owner of the msgbus subscriptions of the add-on
+msgbus_owner = object()
+
+
+class Profiler:
+	# Optional timing of the handlers, operators and renders of the add-on, shown
+	# in the Diagnostics panel. While it is not recording, an instrumented call
+	# costs a single attribute check.
+
+	# Latencies kept per name for the percentiles
+	max_samples = 10000
+
+	def __init__(self):
+		self.is_recording = False
+		self.calls = {}
+		self.render_durations = {}
+		self.render_phases = {}
+		self.depths = {}
+		
+		# The last summary, until another sample is recorded. The Diagnostics
+		# panel asks for it on every redraw.
+		self.cached_summary = None
+
+	def reset(self):
+		self.calls.clear()
+		self.render_durations.clear()
+		self.render_phases.clear()
+		self.cached_summary = None
+
+	def record_call(self, name, duration, is_reentrant):
+		stats = self.calls.get(name)
+		if stats is None:
+			stats = self.calls[name] = {"count": 0, "total": 0.0, "reentrant": 0, "samples": collections.deque(maxlen=self.max_samples)}
+		stats["count"] += 1
+		stats["total"] += duration
+		stats["samples"].append(duration)
+		if is_reentrant:
+			stats["reentrant"] += 1
+		self.cached_summary = None
+
+	def record_render(self, camera_name, duration):
+		if self.is_recording:
+			self.render_durations.setdefault(camera_name, []).append(duration)
+			self.cached_summary = None
+
+	def record_render_phases(self, camera_name, setup, sampling):
+		if self.is_recording:
+			self.render_phases.setdefault(camera_name, []).append((setup, sampling))
+			self.cached_summary = None
+
+	def summary(self):
+		# Times in milliseconds
+		if self.cached_summary is not None:
+			return self.cached_summary
+		
+		calls = {}
+		for name, stats in sorted(self.calls.items()):
+			samples = sorted(stats["samples"])
+			calls[name] = {
+				"count": stats["count"],
+				"total_ms": stats["total"] * 1000,
+				"p50_ms": get_percentile(samples, 50) * 1000,
+				"p95_ms": get_percentile(samples, 95) * 1000,
+				"p99_ms": get_percentile(samples, 99) * 1000,
+				"reentrant": stats["reentrant"],
+			}
+		renders = {}
+		for camera_name, durations in sorted(self.render_durations.items()):
+			renders[camera_name] = {
+				"count": len(durations),
+				"total_s": sum(durations),
+				"mean_s": sum(durations) / len(durations),
+			}
+			phases = self.render_phases.get(camera_name)
+			if phases:
+				renders[camera_name]["setup_s"] = sum(setup for setup, _ in phases)
+				renders[camera_name]["sampling_s"] = sum(sampling for _, sampling in phases)
+		self.cached_summary = {"calls": calls, "renders": renders}
+		return self.cached_summary
+
+
+def get_percentile(sorted_samples, percentile):
+	# Nearest-rank percentile
+	if not sorted_samples:
+		return 0.0
+	rank = math.ceil(percentile / 100 * len(sorted_samples))
+	return sorted_samples[max(rank, 1) - 1]
+
+
+profiler = Profiler()
+
+
+def instrumented(name):
+	# Decorator recording the calls of a handler or operator method in the profiler.
+	# A call made while another call of the same name is running counts as re-entrant.
+	def decorator(function):
+		@functools.wraps(function)
+		def wrapper(*args, **kwargs):
+			if not profiler.is_recording:
+				return function(*args, **kwargs)
+			depth = profiler.depths.get(name, 0)
+			profiler.depths[name] = depth + 1
+			start_time = time.perf_counter()
+			try:
+				return function(*args, **kwargs)
+			finally:
+				profiler.depths[name] = depth
+				profiler.record_call(name, time.perf_counter() - start_time, depth > 0)
+		return wrapper
+	return decorator
+
 
 def on_highlighted_camera_index_update(self, context):
 	scene = context.scene	
@@ -51,7 +225,8 @@ def on_highlighted_camera_index_update(self, context):
 # Property callback function
 def update_previewing_animation(self, context):
 	if self.is_previewing_animation:
-		bpy.ops.camera.process_frame_ranges()
+		# The schedule is kept up to date, so this only compiles it the first time
+		get_frame_range_index(self)
 
 bpy.types.Object.y_dim = bpy.props.IntProperty(
 	name="Height",
@@ -61,8 +236,6 @@ bpy.types.Object.y_dim = bpy.props.IntProperty(
 	soft_max=10000,
 )
 
-bpy.types.Scene.cameras_with_frame_range = []
-
 bpy.types.Scene.move_focus_with_keys = BoolProperty(
 		name="Camera Follows Highlight",
 		description="Highlight selects Camera",
@@ -87,6 +260,124 @@ bpy.types.Scene.append_resolution = BoolProperty(
 	default=False
 )
 
+bpy.types.Scene.resume_interrupted_renders = BoolProperty(
+	name="Resume Interrupted Renders",
+	description="Skip the renders that finished before a batch was interrupted, as long as their files are unchanged. Keeps a journal in the output folder while rendering",
+	default=False
+)
+
+bpy.types.Scene.use_render_cache = BoolProperty(
+	name="Skip Unchanged Cameras",
+	description="Skip the cameras that did not change since their last render: same camera, resolution, output, render settings, lights and objects in view. Shader edits and objects casting shadows or reflections from outside the view are not noticed",
+	default=False
+)
+
+bpy.types.Scene.output_format = EnumProperty(
+	name="Output Format",
+	description="File format of the images rendered by the add-on. Cameras can override it",
+	items=(
+		('SCENE', "Scene Settings", "Use the file format set in the Output Properties"),
+		('PNG', "PNG", "Lossless, slow to compress at high compression"),
+		('JPEG', "JPEG", "Small and quick, lossy, without alpha"),
+		('OPEN_EXR', "OpenEXR", "High dynamic range, for compositing"),
+		('WEBP', "WebP", "Small, lossy or lossless"),
+	),
+	default='SCENE'
+)
+
+bpy.types.Scene.output_color_depth = EnumProperty(
+	name="Color Depth",
+	description="Bits per channel, formats that cannot store it use the nearest depth they can",
+	items=(
+		('8', "8", "8 bit integer (PNG, JPEG, WebP)"),
+		('16', "16", "16 bit integer (PNG) or half float (OpenEXR)"),
+		('32', "32", "32 bit float (OpenEXR)"),
+	),
+	default='8'
+)
+
+bpy.types.Scene.output_compression = IntProperty(
+	name="Compression",
+	description="PNG compression, lower is quicker to save but makes larger files",
+	default=15,
+	min=0,
+	max=100,
+	subtype='PERCENTAGE'
+)
+
+bpy.types.Scene.output_quality = IntProperty(
+	name="Quality",
+	description="JPEG and WebP quality, 100 is lossless for WebP",
+	default=90,
+	min=0,
+	max=100,
+	subtype='PERCENTAGE'
+)
+
+bpy.types.Scene.output_exr_codec = EnumProperty(
+	name="Codec",
+	description="OpenEXR compression",
+	items=(
+		('DWAA', "DWAA", "Lossy, small and quick, for finals"),
+		('ZIP', "ZIP", "Lossless"),
+		('PIZ', "PIZ", "Lossless, good for noisy images"),
+		('NONE', "None", "Uncompressed, quickest to save"),
+	),
+	default='ZIP'
+)
+
+bpy.types.Scene.show_camera_previews = BoolProperty(
+	name="Show Previews",
+	description="Show a small render of each camera in the Camera List, made with Build Previews",
+	default=False
+)
+
+bpy.types.Scene.write_images_in_background = BoolProperty(
+	name="Write Images in Background",
+	description="Start rendering the next camera while the PNG of the previous one is compressed and saved. Only applies to 8-bit PNG output",
+	default=False
+)
+
+bpy.types.Scene.draft_mode = EnumProperty(
+	name="Drafts",
+	description="Render a quick draft of the cameras before the finals, to catch framing mistakes early",
+	items=(
+		('OFF', "Finals Only", "Render every camera in full quality"),
+		('AUTO', "Drafts, then Finals", "Render a draft of every camera, then the finals"),
+		('APPROVAL', "Drafts, then Approved", "Render the finals of the approved cameras, and drafts of the others"),
+	),
+	default='OFF'
+)
+
+bpy.types.Scene.draft_resolution_percentage = IntProperty(
+	name="Draft Resolution",
+	description="Resolution of the drafts, relative to the resolution of each camera",
+	default=25,
+	min=1,
+	max=100,
+	subtype='PERCENTAGE'
+)
+
+bpy.types.Scene.draft_samples = IntProperty(
+	name="Draft Samples",
+	description="Samples of the drafts in Cycles and Eevee, never more than the scene uses",
+	default=16,
+	min=1,
+	max=4096
+)
+
+bpy.types.Scene.draft_folder = StringProperty(
+	name="Draft Folder",
+	description="Folder inside the output folder the drafts are saved to",
+	default="drafts"
+)
+
+bpy.types.Scene.use_fast_batch = BoolProperty(
+	name="Fast Batch",
+	description="Keep the scene data of Cycles between the renders of a batch (Persistent Data), and compile the Eevee shaders before the first camera. Uses more memory",
+	default=False
+)
+
 bpy.types.Scene.is_previewing_animation = BoolProperty(
 	name="Use Camera Frameranges",
 	description="When enabled, Scene Camera is selected/activated according to the Frame Range in their respective names (e.g.: Camera 1-10 for frame 1 to 10)",
@@ -101,6 +392,18 @@ bpy.types.Scene.objects_visibility_refresh_is_needed = BoolProperty(
 )
 
 
+class JB_MULTICAM_PG_frame_range(bpy.types.PropertyGroup):
+	# One frame range of the compiled schedule, stored in the .blend file so the
+	# camera names do not have to be parsed again after loading
+	camera: bpy.props.PointerProperty(type=bpy.types.Object)
+	
+	# The camera name the range was parsed from
+	camera_name: bpy.props.StringProperty()
+	
+	start_frame: bpy.props.IntProperty()
+	end_frame: bpy.props.IntProperty()
+
+
 class JB_MULTICAM_PG_CAMERALIST_HighlightTooltip(bpy.types.PropertyGroup):
 	highlighted_camera_index: bpy.props.IntProperty(
 		name="Double-click to edit camera name",
@@ -127,7 +430,10 @@ class JB_MULTICAM_OT_CAMERALIST_clear_custom_render_size(bpy.types.Operator):
 			self.report({'WARNING'}, f"Camera {camera_name} not found - width not reset")
 			return {'CANCELLED'}
 		
-		if self.clear_dimension == "width":
+		if self.clear_dimension == "quality":
+			selected_camera_item.set_output_quality(None)
+			return {'FINISHED'}
+		elif self.clear_dimension == "width":
 			selected_camera_item.set_x_dim(None)
 		else:
 			selected_camera_item.set_y_dim(None)
@@ -142,18 +448,34 @@ class JB_MULTICAM_PG_CAMERALIST_CameraItem(bpy.types.PropertyGroup):
 	
 	# Used to store the unique name of the camera
 	name: bpy.props.StringProperty()
+	
+	# The camera itself, which stays valid when the camera is renamed
+	camera: bpy.props.PointerProperty(type=bpy.types.Object)
+	
+	def get_camera(self):
+		# Lists saved by older versions only have the name
+		camera = self.camera
+		if camera is None:
+			camera = bpy.data.objects.get(self.name)
+		return camera
 
 	def get_selected_for_rendering(self):
-		obj = bpy.data.objects.get(self.name)
-		if obj is not None and "use_camera" in obj.keys() and obj["use_camera"] is not None:
-			return obj["use_camera"]
-		else:
-			return True
+		camera = self.get_camera()
+		if camera is not None:
+			use_camera = camera.get("use_camera")
+			if use_camera is not None:
+				return use_camera
+		return True
 
 	def set_selected_for_rendering(self, value):
-		obj = bpy.data.objects.get(self.name)
-		if value in {True, False} and obj is not None and obj.type == "CAMERA":
-			obj["use_camera"] = value
+		camera = self.get_camera()
+		if value in {True, False} and camera is not None and camera.type == "CAMERA":
+			camera["use_camera"] = value
+			
+			# Keeps the selected count of the panel without counting again
+			cache = camera_list_caches.get(self.id_data.as_pointer())
+			if cache is not None:
+				cache.set_selected(camera, value)
 	
 	# Cameras selected for rendering
 	selected_for_rendering: bpy.props.BoolProperty(
@@ -164,25 +486,22 @@ class JB_MULTICAM_PG_CAMERALIST_CameraItem(bpy.types.PropertyGroup):
 	
 
 	def get_x_dim(self):
-		obj = bpy.data.objects.get(self.name)
-		if obj is not None and "x_dim" in obj.keys() and obj["x_dim"] is not None:
-			return obj["x_dim"]
+		camera = self.get_camera()
+		x_dim = camera.get("x_dim") if camera is not None else None
+		if x_dim is not None:
+			return x_dim
 		else:
-			# Fallback to scene default
-			return bpy.context.scene.render.resolution_x
+			# Fallback to the default of the scene owning the list
+			return self.id_data.render.resolution_x
 
 	def set_x_dim(self, value):
-		obj = bpy.data.objects.get(self.name)
-		if obj is None or obj.type != "CAMERA":
+		camera = self.get_camera()
+		if camera is None or camera.type != "CAMERA":
 			# Camera object not found
 			return {'CANCELLED'}
-		if value is None:
-			# Clear the custom resolution
-			# This prevents the camera to fake a custom setting when the user
-			# changes the rendering resolution of the scene.
-			obj["x_dim"] = None
-		if obj is not None:
-			obj["x_dim"] = value
+		# None clears the custom resolution. This prevents the camera to fake a
+		# custom setting when the user changes the rendering resolution of the scene.
+		camera["x_dim"] = value
 
 	x_dim: bpy.props.IntProperty(
 		name="Width of Render Border",
@@ -193,25 +512,22 @@ class JB_MULTICAM_PG_CAMERALIST_CameraItem(bpy.types.PropertyGroup):
 	)
 
 	def get_y_dim(self):
-		obj = bpy.data.objects.get(self.name)
-		if obj is not None and "y_dim" in obj.keys() and obj["y_dim"] is not None:
-			return obj["y_dim"]
+		camera = self.get_camera()
+		y_dim = camera.get("y_dim") if camera is not None else None
+		if y_dim is not None:
+			return y_dim
 		else:
-			# Fallback to scene default
-			return bpy.context.scene.render.resolution_y
+			# Fallback to the default of the scene owning the list
+			return self.id_data.render.resolution_y
 
 	def set_y_dim(self, value):
-		obj = bpy.data.objects.get(self.name)
-		if obj is None or obj.type != "CAMERA":
+		camera = self.get_camera()
+		if camera is None or camera.type != "CAMERA":
 			# Camera object not found
 			return {'CANCELLED'}
-		if value is None:
-			# Clear the custom resolution
-			# This prevents the camera to fake a custom setting when the user
-			# changes the rendering resolution of the scene.
-			obj["y_dim"] = None
-		if obj is not None:
-			obj["y_dim"] = value
+		# None clears the custom resolution. This prevents the camera to fake a
+		# custom setting when the user changes the rendering resolution of the scene.
+		camera["y_dim"] = value
 
 	y_dim: bpy.props.IntProperty(
 		name="Height of Render Border",
@@ -222,8 +538,151 @@ class JB_MULTICAM_PG_CAMERALIST_CameraItem(bpy.types.PropertyGroup):
 	)
 	
 	def has_custom_resolution(self):
-		obj = bpy.data.objects.get(self.name)
-		return obj is not None and (("x_dim" in obj.keys() and obj["x_dim"] is not None) or ("y_dim" in obj.keys() and obj["y_dim"] is not None))
+		camera = self.get_camera()
+		return camera is not None and (camera.get("x_dim") is not None or camera.get("y_dim") is not None)
+	
+	# Output overrides, stored on the camera next to its custom resolution.
+	# BATCH uses the output format of the batch.
+	
+	output_format_items = (
+		('BATCH', "Batch", "Use the output format of the batch", 0),
+		('PNG', "PNG", "Lossless", 1),
+		('JPEG', "JPEG", "Small and quick, lossy", 2),
+		('OPEN_EXR', "OpenEXR", "High dynamic range", 3),
+		('WEBP', "WebP", "Small, lossy or lossless", 4),
+	)
+	
+	output_color_depth_items = (
+		('BATCH', "Batch", "Use the color depth of the batch", 0),
+		('8', "8", "8 bit integer", 1),
+		('16', "16", "16 bit integer or half float", 2),
+		('32', "32", "32 bit float", 3),
+	)
+	
+	output_exr_codec_items = (
+		('BATCH', "Batch", "Use the OpenEXR codec of the batch", 0),
+		('DWAA', "DWAA", "Lossy, small and quick", 1),
+		('ZIP', "ZIP", "Lossless", 2),
+		('PIZ', "PIZ", "Lossless, good for noisy images", 3),
+		('NONE', "None", "Uncompressed", 4),
+	)
+	
+	def get_camera_override(self, key, items):
+		# The number of the stored enum item, 0 (BATCH) when there is none
+		camera = self.get_camera()
+		value = camera.get(key) if camera is not None else None
+		for identifier, _, _, number in items:
+			if identifier == value:
+				return number
+		return 0
+	
+	def set_camera_override(self, key, items, number):
+		camera = self.get_camera()
+		if camera is None or camera.type != "CAMERA":
+			return
+		identifier = items[number][0]
+		if identifier == 'BATCH':
+			if key in camera:
+				del camera[key]
+		else:
+			camera[key] = identifier
+	
+	def get_output_format(self):
+		return self.get_camera_override("output_format", self.output_format_items)
+	
+	def set_output_format(self, value):
+		self.set_camera_override("output_format", self.output_format_items, value)
+	
+	output_format: bpy.props.EnumProperty(
+		name="Output Format",
+		description="File format of this camera's images",
+		items=output_format_items,
+		get=get_output_format,
+		set=set_output_format,
+	)
+	
+	def get_output_color_depth(self):
+		return self.get_camera_override("output_color_depth", self.output_color_depth_items)
+	
+	def set_output_color_depth(self, value):
+		self.set_camera_override("output_color_depth", self.output_color_depth_items, value)
+	
+	output_color_depth: bpy.props.EnumProperty(
+		name="Color Depth",
+		description="Bits per channel of this camera's images",
+		items=output_color_depth_items,
+		get=get_output_color_depth,
+		set=set_output_color_depth,
+	)
+	
+	def get_output_exr_codec(self):
+		return self.get_camera_override("output_exr_codec", self.output_exr_codec_items)
+	
+	def set_output_exr_codec(self, value):
+		self.set_camera_override("output_exr_codec", self.output_exr_codec_items, value)
+	
+	output_exr_codec: bpy.props.EnumProperty(
+		name="Codec",
+		description="OpenEXR compression of this camera's images",
+		items=output_exr_codec_items,
+		get=get_output_exr_codec,
+		set=set_output_exr_codec,
+	)
+	
+	def get_file_format(self):
+		# The format this camera is rendered in, SCENE for the Output Properties
+		return self.output_format if self.output_format != 'BATCH' else self.id_data.output_format
+	
+	def has_output_quality(self):
+		camera = self.get_camera()
+		return camera is not None and camera.get("output_quality") is not None
+	
+	def get_output_quality(self):
+		camera = self.get_camera()
+		quality = camera.get("output_quality") if camera is not None else None
+		if quality is not None:
+			return quality
+		else:
+			# Fallback to the batch setting of the format
+			return get_batch_quality(self.id_data, self.get_file_format()) or 0
+	
+	def set_output_quality(self, value):
+		camera = self.get_camera()
+		if camera is None or camera.type != "CAMERA":
+			return
+		# None clears the override, like the custom resolution
+		if value is None:
+			if "output_quality" in camera:
+				del camera["output_quality"]
+		else:
+			camera["output_quality"] = value
+	
+	# The PNG compression, or the JPEG and WebP quality, of this camera's images
+	output_quality: bpy.props.IntProperty(
+		name="Quality",
+		description="PNG compression, or JPEG and WebP quality, of this camera's images",
+		get=get_output_quality,
+		set=set_output_quality,
+		min=0,
+		max=100,
+		subtype='PERCENTAGE'
+	)
+	
+	def get_draft_approved(self):
+		return is_draft_approved(self.get_camera())
+	
+	def set_draft_approved(self, value):
+		camera = self.get_camera()
+		if camera is not None and camera.type == "CAMERA":
+			camera["draft_approved"] = value
+	
+	# Cameras whose draft was checked, their finals are rendered with Drafts, then Approved
+	draft_approved: bpy.props.BoolProperty(
+		name="Approved",
+		description="The draft of this camera looks right, render its final",
+		get=get_draft_approved,
+		set=set_draft_approved,
+	)
 
 
 class JB_MULTICAM_OT_update_viewport_visibility(bpy.types.Operator):
@@ -231,10 +690,12 @@ class JB_MULTICAM_OT_update_viewport_visibility(bpy.types.Operator):
 		bl_label = "Refresh Visibility"
 		bl_description = "Will refresh objects Viewport visibility according to state of Disabled in Renders (camera with cross)"
 		
+		@instrumented("object.refresh_visbility_of_objects_in_scene")
 		def execute(self, context):
 			if context.scene.sor_show_only_render:
-				for obj in bpy.context.scene.objects:
-					obj.hide_set(obj.hide_render)
+				# Also picks up keyframes that were added or moved since the last refresh
+				visibility_engine.invalidate_timeline()
+				visibility_engine.apply_all(context.scene, context.view_layer, True)
 			return {'FINISHED'}
 
 
@@ -251,6 +712,8 @@ class JB_MULTICAM_PT_animation_panel(bpy.types.Panel):
 			render_box = self.layout.box()
 			render_box_row = render_box.row()
 			render_box_row.operator("camera.render_scene_camera_frames_with_custom_resolution", text="Render Active Camera", icon="RENDER_ANIMATION")
+			render_box_row = render_box.row()
+			render_box_row.operator("camera.render_selected_animations", text="Render Selected Cameras", icon="RENDER_ANIMATION")
 			
 			# ANIMATION PREVIEW BOX
 
@@ -326,6 +789,45 @@ class JB_MULTICAM_PT_addon_settings(bpy.types.Panel):
 		row = layout.row()
 		row.prop(scene, "append_resolution", text="Filename includes Resolution")
 		
+		# The "Resume Interrupted Renders" checkbox
+		row = layout.row()
+		row.prop(scene, "resume_interrupted_renders", text="Resume Interrupted Renders")
+		
+		# The "Skip Unchanged Cameras" checkbox
+		row = layout.row(align=True)
+		row.prop(scene, "use_render_cache", text="Skip Unchanged Cameras")
+		row.operator("render.multicam_clear_render_cache", text="", icon='TRASH')
+		
+		# The "Write Images in Background" checkbox
+		row = layout.row()
+		row.prop(scene, "write_images_in_background", text="Write Images in Background")
+		
+		# The "Fast Batch" checkbox
+		row = layout.row()
+		row.prop(scene, "use_fast_batch", text="Fast Batch")
+		
+		# The file format of the rendered images
+		box = layout.box()
+		col = box.column(align=True)
+		col.prop(scene, "output_format", text="Format")
+		if scene.output_format in {'PNG', 'OPEN_EXR'}:
+			col.prop(scene, "output_color_depth", text="Color Depth")
+		if scene.output_format == 'PNG':
+			col.prop(scene, "output_compression")
+		elif scene.output_format in {'JPEG', 'WEBP'}:
+			col.prop(scene, "output_quality")
+		elif scene.output_format == 'OPEN_EXR':
+			col.prop(scene, "output_exr_codec")
+		
+		# Quick drafts of the cameras before the finals
+		box = layout.box()
+		col = box.column(align=True)
+		col.prop(scene, "draft_mode")
+		if scene.draft_mode != 'OFF':
+			col.prop(scene, "draft_resolution_percentage", text="Resolution")
+			col.prop(scene, "draft_samples", text="Samples")
+			col.prop(scene, "draft_folder", text="Folder")
+		
 		# COMING FEATURES:
 		# The "Adjust render size (keeping aspect ratio)" checkbox
 		# row = layout.row()
@@ -432,16 +934,38 @@ class JB_MULTICAM_OT_render_current_scene_camera_with_custom_resolution(bpy.type
 	bl_label = "Render Scene Frames"
 	bl_description = "Renders the current Animation Range using the current Scene Camera (i.e. the active camera) in the associated (custom) resolution"
 	
+	@instrumented("camera.render_scene_camera_frames_with_custom_resolution")
+	def execute(self, context):
+		scene = context.scene
+		if scene.camera is None:
+			self.report({'WARNING'}, "Scene has no camera")
+			return {'CANCELLED'}
+		
+		camera_item = scene.cameras.get(scene.camera.name)
+		render_feedback = render_camera_animation(scene, scene.camera, camera_item)
+		self.report({'INFO'}, render_feedback)
+		return {'FINISHED'}
+
+
+class JB_MULTICAM_OT_render_selected_animations(bpy.types.Operator):
+	bl_idname = "camera.render_selected_animations"
+	bl_label = "Render Selected Cameras"
+	bl_description = "Renders the current Animation Range from every Camera selected in the list, each in its (custom) resolution. Every frame is evaluated once and rendered from all cameras"
+	
+	@instrumented("camera.render_selected_animations")
 	def execute(self, context):
-		current_camera_name = context.scene.camera.name
-		initial_filepath = context.scene.render.filepath
-		for i in range(bpy.data.scenes["Scene"].frame_start, bpy.data.scenes["Scene"].frame_end+1, bpy.data.scenes["Scene"].frame_step):
-			print("Rendering Frame:", i, "on camera:", current_camera_name)			
-			output_path = "%s/%s/%03d" % (initial_filepath, current_camera_name, i)
-			context.scene.frame_set(i)
-			context.scene.render.filepath = output_path
-			bpy.ops.render.render_still_with_custom_resolution(camera_name=current_camera_name)
-		context.scene.render.filepath = initial_filepath
+		scene = context.scene
+		selected_camera_items = [camera_item for camera_item in scene.cameras if camera_item.selected_for_rendering]
+		if not selected_camera_items:
+			self.report({'WARNING'}, "No cameras selected")
+			return {'CANCELLED'}
+		
+		if not bpy.app.background:
+			# Rendering in the background keeps the interface responsive
+			return start_render_queue(self, scene, plan_frame_major_queue(scene, selected_camera_items))
+		
+		render_feedback = render_cameras_frame_major(scene, selected_camera_items)
+		self.report({'INFO'}, render_feedback)
 		return {'FINISHED'}
 
 
@@ -451,44 +975,154 @@ class JB_MULTICAM_OT_update_frame_ranges_for_all_cameras(bpy.types.Operator):
 	bl_label = "Process Camera Ranges"
 	bl_description = "Execute to refresh frame ranges for all cameras. Range format: <Start>-<End> (e.g. Camera 1-1240)"
 	
+	@instrumented("camera.process_frame_ranges")
 	def execute(self, context):
-		scene = context.scene
-		
-		# Find all cameras with valid frame ranges in their names
-		scene.cameras_with_frame_range.clear()
-		
+		compile_frame_range_index(context.scene, verbose=True)
+		return {'FINISHED'}
+
+
+def compile_frame_range_index(scene, verbose=False):
+	# Parses the names of all cameras in the scene into the stored schedule
+	schedule = scene.frame_range_schedule
+	schedule.clear()
+	
+	if verbose:
 		print("\nUpdating Camera Ranges for each Camera in Scene:")
 
-		for camera_data in scene.cameras:
-			camera = bpy.data.objects.get(camera_data.name)
-			if camera and camera.type == 'CAMERA':
-				
-				# Allowing multiple ranges per camera:
-				
-				# Extract all digit ranges from the camera name
-				matches = re.findall(r'(\d+)-(\d+)', camera.name)
-				
-				if matches:
-					# Create a list to store all the ranges
-					ranges = []
-					
-					# Iterate through the matches and extract the start and end values of each range
-					for range_start, range_end in matches:
-						ranges.append((int(range_start), int(range_end)))
-					
-					# Print the extracted ranges
-					for start_frame, end_frame in ranges:
-						scene.cameras_with_frame_range.append((camera, start_frame, end_frame))
-						print(f"Camera {camera.name} has range {start_frame}-{end_frame}.")
-				else:
-					print(f"Camera {camera.name} does not have a frame range with valid format: Abc <startframe>-<endframe>.")
-		
-		# Sort cameras based on their frame ranges
-		scene.cameras_with_frame_range.sort(key=lambda x: (x[1], x[2]))
-		number_of_cameras_in_sequence = len(scene.cameras_with_frame_range)
-		print(f"\nFound {number_of_cameras_in_sequence} cameras in the scene with a correctly formatted frame range.\n")
-		
-		return {'FINISHED'}
+	cameras = {}
+	for camera_data in scene.cameras:
+		camera = camera_data.get_camera()
+		if camera and camera.type == 'CAMERA':
+			cameras[camera.name] = camera
+	
+	# Sorted by their frame ranges
+	for camera_name, start_frame, end_frame in compile_frame_range_schedule(cameras):
+		add_frame_range(schedule, cameras[camera_name], start_frame, end_frame)
+	
+	if verbose:
+		for camera_name in cameras:
+			ranges = parse_frame_ranges(camera_name)
+			for start_frame, end_frame in ranges:
+				print(f"Camera {camera_name} has range {start_frame}-{end_frame}.")
+			if not ranges:
+				print(f"Camera {camera_name} does not have a frame range with valid format: Abc <startframe>-<endframe>.")
+
+	frame_range_names[scene.as_pointer()] = {camera.as_pointer(): camera_name for camera_name, camera in cameras.items()}
+	index = build_frame_range_index(scene)
+
+	if verbose:
+		number_of_cameras_in_sequence = len(schedule)
+		print(f"\nFound {number_of_cameras_in_sequence} cameras in the scene with a correctly formatted frame range.")
+		for earlier_camera_name, camera_name, start_frame, end_frame in index.overlaps:
+			print(f"Overlap: {camera_name} is hidden by {earlier_camera_name} for frames {start_frame}-{end_frame}.")
+		for start_frame, end_frame in index.gaps:
+			print(f"Gap: no camera has frames {start_frame}-{end_frame}.")
+		print()
+	
+	return index
+
+
+def add_frame_range(schedule, camera, start_frame, end_frame):
+	entry = schedule.add()
+	entry.camera = camera
+	entry.camera_name = camera.name
+	entry.start_frame = start_frame
+	entry.end_frame = end_frame
+
+
+def build_frame_range_index(scene):
+	# Builds the index from the stored schedule, without looking at any names
+	ranges = [(entry.camera, entry.start_frame, entry.end_frame) for entry in scene.frame_range_schedule if entry.camera is not None]
+	index = FrameRangeIndex(ranges)
+	frame_range_indices[scene.as_pointer()] = index
+	return index
+
+
+def load_frame_range_index(scene):
+	# Restores the index of a loaded file (or after undo) from the stored schedule.
+	# Only a scene that was never compiled has its camera names parsed.
+	schedule = scene.frame_range_schedule
+	if not schedule:
+		return compile_frame_range_index(scene)
+	
+	# The names the schedule was parsed from, with the current camera list for
+	# the cameras without a frame range
+	names = {}
+	for camera_data in scene.cameras:
+		camera = camera_data.get_camera()
+		if camera and camera.type == 'CAMERA':
+			names[camera.as_pointer()] = camera_data.name
+	for entry in schedule:
+		if entry.camera is not None:
+			names[entry.camera.as_pointer()] = entry.camera_name
+	frame_range_names[scene.as_pointer()] = names
+	
+	# Renamed while the schedule was not watched, e.g. by a script
+	if not update_renamed_frame_ranges(scene):
+		build_frame_range_index(scene)
+	return frame_range_indices[scene.as_pointer()]
+
+
+def update_frame_range_schedule(scene, changed_cameras=(), removed_pointers=()):
+	# Parses the names of the given cameras again and drops the removed ones,
+	# leaving the rest of the schedule as it is
+	names = frame_range_names.get(scene.as_pointer())
+	if names is None:
+		# Never compiled, it is compiled in full when first needed
+		return
+	
+	stale_pointers = set(removed_pointers) | {camera.as_pointer() for camera in changed_cameras}
+	schedule = scene.frame_range_schedule
+	for row in reversed(range(len(schedule))):
+		camera = schedule[row].camera
+		if camera is None or camera.as_pointer() in stale_pointers:
+			schedule.remove(row)
+	
+	for pointer in removed_pointers:
+		names.pop(pointer, None)
+	for camera in changed_cameras:
+		for start_frame, end_frame in parse_frame_ranges(camera.name):
+			add_frame_range(schedule, camera, start_frame, end_frame)
+		names[camera.as_pointer()] = camera.name
+	
+	build_frame_range_index(scene)
+
+
+def update_renamed_frame_ranges(scene):
+	# Finds the cameras renamed or deleted since their names were parsed.
+	# Returns True when the schedule changed.
+	names = frame_range_names.get(scene.as_pointer())
+	if not names:
+		return False
+	
+	renamed_cameras = []
+	removed_pointers = []
+	for pointer, camera in resolve_indexed_cameras(scene, names).items():
+		if camera is None:
+			# The camera was deleted or unlinked
+			removed_pointers.append(pointer)
+		elif camera.name != names[pointer]:
+			renamed_cameras.append(camera)
+	
+	if not (renamed_cameras or removed_pointers):
+		return False
+	update_frame_range_schedule(scene, renamed_cameras, removed_pointers)
+	return True
+
+
+def on_object_renamed():
+	# msgbus callback for Object.name, which does not say which object was renamed
+	for scene in bpy.data.scenes:
+		update_renamed_camera_items(scene)
+		update_renamed_frame_ranges(scene)
+
+
+def get_frame_range_index(scene):
+	# The compiled index, restoring it from the stored schedule if needed (e.g. after undo)
+	index = frame_range_indices.get(scene.as_pointer())
+	if index is None:
+		index = load_frame_range_index(scene)
+	return index
 
 
 class JB_MULTICAM_OT_render_animation_sequence(bpy.types.Operator):
@@ -499,57 +1133,20 @@ class JB_MULTICAM_OT_render_animation_sequence(bpy.types.Operator):
 		# Valid values: "CYCLES", "BLENDER_EEVEE", "BLENDER_WORKBENCH"
 		render_engine: bpy.props.StringProperty()
 		
+		@instrumented("camera.render_animations")
 		def execute(self, context):		
 			# Set the selected render engine:
-			bpy.context.scene.render.engine = self.render_engine
+			context.scene.render.engine = self.render_engine
 			
-			scene = context.scene
-			output_path = scene.render.filepath
+			if not bpy.app.background:
+				# Rendering in the background keeps the interface responsive
+				return start_render_queue(self, context.scene, plan_sequence_queue(context.scene))
 			
-			# Parsing the currently define frame range
-			for render_frame in range(context.scene.frame_start, context.scene.frame_end, 1):
-				
-				scene.frame_current = render_frame
-				
-				# Check if the current frame is within the frame range of any camera, and render frame only if a camera was found:
-				for camera, start_frame, end_frame in scene.cameras_with_frame_range:
-					if start_frame <= render_frame <= end_frame:
-						
-						scene.camera = camera
-		
-						# Render the animation
-						self.progress_feedback(context)
-
-						# Set the frame you want to render
-						scene.frame_set(render_frame)
-											
-						# Set the render output settings (if needed)
-						scene.render.image_settings.file_format = 'PNG'
-						
-						# Generate the filename with leading zeros
-						filename = f"{scene.frame_current:04d}.png"  # This formats the frame number to have at least 4 digits
-						output_filepath = f"{output_path}{filename}"
-						scene.render.filepath = output_filepath
-												
-						# Render the current frame using the specified file output path
-						bpy.ops.render.render(write_still=True)
-		
-			scene.render.filepath = output_path
+			render_feedback = render_sequence_in_passes(context.scene)
+			self.report({'INFO'}, render_feedback)
 			return {'FINISHED'}
 			
 			
-		def progress_feedback(self, context):
-			scene = context.scene
-			
-			start_time = time.time()			
-			frame_count = context.scene.frame_end - context.scene.frame_start
-			sequence_frame = scene.frame_current - context.scene.frame_start
-			percentage_done = (sequence_frame/frame_count) * 100
-			
-			feedback = f"\n{sequence_frame} of {frame_count} — {percentage_done:.1f}% done: Rendering {scene.camera.name}.\nStarted rendering at {time.strftime('%H:%M:%S', time.localtime(start_time))}."
-			print(feedback)
-			
-			
 			
 class JB_MULTICAM_PT_camera_list(bpy.types.Panel):
 	bl_label = "Camera List"	
@@ -585,6 +1182,29 @@ class JB_MULTICAM_PT_camera_list(bpy.types.Panel):
 				row = layout.row(align=True)
 				row.prop(camera_item, "y_dim", text="Height")
 				row.operator("camera_list.clear_custom_dimension", text="", icon="LOOP_BACK").clear_dimension="height"
+				
+				row = layout.row(align=True)
+				row.prop(camera_item, "output_format", text="")
+				row.prop(camera_item, "output_color_depth", text="")
+				
+				file_format = camera_item.get_file_format()
+				if file_format in {'PNG', 'JPEG', 'WEBP'}:
+					row = layout.row(align=True)
+					row.prop(camera_item, "output_quality", text="Compression" if file_format == 'PNG' else "Quality")
+					row.operator("camera_list.clear_custom_dimension", text="", icon="LOOP_BACK").clear_dimension="quality"
+				elif file_format == 'OPEN_EXR':
+					layout.prop(camera_item, "output_exr_codec")
+				
+				# The preview of the highlighted camera, large enough to judge the framing
+				highlighted_camera = camera_item.get_camera()
+				if scene.show_camera_previews and highlighted_camera is not None:
+					preview_icon = get_camera_preview_icon(highlighted_camera)
+					if preview_icon:
+						layout.template_icon(icon_value=preview_icon, scale=8)
+			
+			row = layout.row(align=True)
+			row.operator("camera.multicam_build_previews", icon='IMAGE_DATA')
+			row.prop(scene, "show_camera_previews", text="", icon='HIDE_OFF' if scene.show_camera_previews else 'HIDE_ON')
 					
 		else:
 			# Draw the update button spanning two columns
@@ -594,8 +1214,7 @@ class JB_MULTICAM_PT_camera_list(bpy.types.Panel):
 	
 		# Render buttons
 		
-		selected_camera_items = [camera_item for camera_item in bpy.context.scene.cameras if camera_item.selected_for_rendering]
-		selected_camera_count = len(selected_camera_items)
+		selected_camera_count = get_camera_list_cache(scene).selected_count
 		
 		render_selection_text = f"Render {selected_camera_count}"
 		render_selection_toggle = selected_camera_count > 0
@@ -609,20 +1228,174 @@ class JB_MULTICAM_PT_camera_list(bpy.types.Panel):
 		
 		row.operator("render.confirm_dialog_all_cameras", text="Render All") #, icon="OUTPUT")
 		
+		# Progress of the render queue
+		
+		if render_queue.items:
+			draw_render_queue(layout)
+		
+		
+
+
+
+
+class JB_MULTICAM_PT_diagnostics(bpy.types.Panel):
+	bl_label = "Diagnostics"
+	bl_idname = "VIEW3D_PT_multicam_diagnostics"
+	bl_parent_id = "VIEW3D_PT_camera_list"
+	bl_space_type = 'VIEW_3D'
+	bl_region_type = 'UI'
+	bl_category = 'Cameras'
+	bl_options = {'DEFAULT_CLOSED'}
+	
+	def draw(self, context):
+		layout = self.layout
+		
+		row = layout.row(align=True)
+		row.operator("camera.multicam_toggle_profiling", text="Stop Recording" if profiler.is_recording else "Record Timings", icon='PAUSE' if profiler.is_recording else 'REC')
+		row.operator("camera.multicam_reset_profiling", text="", icon='TRASH')
+		row.operator("camera.multicam_export_profiling", text="", icon='EXPORT')
+		
+		summary = profiler.summary()
+		if not summary["calls"]:
+			layout.label(text="No timings recorded")
+			return
 		
+		# Handler and operator latencies in milliseconds
+		col = layout.column(align=True)
+		row = col.row()
+		row.label(text="Name")
+		row.label(text="Calls")
+		row.label(text="p50 / p95 / p99 ms")
+		for name, stats in summary["calls"].items():
+			row = col.row()
+			row.label(text=name)
+			reentrant = f" ({stats['reentrant']} nested)" if stats["reentrant"] else ""
+			row.label(text=f"{stats['count']}{reentrant}")
+			row.label(text=f"{stats['p50_ms']:.2f} / {stats['p95_ms']:.2f} / {stats['p99_ms']:.2f}")
+		
+		if summary["renders"]:
+			col = layout.column(align=True)
+			col.label(text="Render time per camera:")
+			for camera_name, stats in summary["renders"].items():
+				row = col.row()
+				row.label(text=camera_name)
+				setup = f", {stats['setup_s'] / stats['total_s']:.0%} setup" if stats.get("setup_s") is not None and stats["total_s"] else ""
+				row.label(text=f"{stats['count']} × {stats['mean_s']:.2f} s{setup}")
+
+
+class JB_MULTICAM_OT_toggle_profiling(bpy.types.Operator):
+	bl_idname = "camera.multicam_toggle_profiling"
+	bl_label = "Record Timings"
+	bl_description = "Records how long the handlers, operators and renders of the add-on take"
+	
+	def execute(self, context):
+		profiler.is_recording = not profiler.is_recording
+		return {'FINISHED'}
+
+
+class JB_MULTICAM_OT_reset_profiling(bpy.types.Operator):
+	bl_idname = "camera.multicam_reset_profiling"
+	bl_label = "Clear Timings"
+	bl_description = "Clears the recorded timings"
+	
+	def execute(self, context):
+		profiler.reset()
+		return {'FINISHED'}
+
+
+class JB_MULTICAM_OT_export_profiling(bpy.types.Operator, ExportHelper):
+	bl_idname = "camera.multicam_export_profiling"
+	bl_label = "Export Timings"
+	bl_description = "Saves the recorded timings as JSON"
+	
+	filename_ext = ".json"
+	filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+	
+	def execute(self, context):
+		export_profiling_summary(self.filepath)
+		self.report({'INFO'}, f"Saved timings to {self.filepath}")
+		return {'FINISHED'}
 
 
+def export_profiling_summary(filepath):
+	with open(filepath, "w", encoding="utf-8") as summary_file:
+		json.dump(profiler.summary(), summary_file, indent=2)
 
 
 class JB_MULTICAM_UL_CAMERALIST_TEMPLATE_camera_list_item(bpy.types.UIList):
+	
+	filter_custom_resolution: bpy.props.BoolProperty(
+		name="Custom Resolution",
+		description="Only show cameras with a custom resolution",
+		default=False,
+	)
+	
+	filter_selected: bpy.props.BoolProperty(
+		name="Selected",
+		description="Only show cameras selected for rendering",
+		default=False,
+	)
+	
+	sort_by: bpy.props.EnumProperty(
+		name="Sort By",
+		items=(
+			('LIST', "List", "Keep the order of the list"),
+			('NAME', "Name", "Sort by camera name"),
+			('PIXELS', "Pixels", "Sort by the number of pixels rendered"),
+			('FRAME_RANGE', "Frame Range", "Sort by the first frame in the camera name, cameras without a frame range last"),
+		),
+		default='LIST',
+	)
+	
+	def draw_filter(self, context, layout):
+		row = layout.row(align=True)
+		row.prop(self, "filter_name", text="")
+		row.prop(self, "use_filter_invert", text="", icon='ARROW_LEFTRIGHT')
+		
+		row = layout.row(align=True)
+		row.prop(self, "filter_custom_resolution", toggle=True)
+		row.prop(self, "filter_selected", toggle=True)
+		
+		row = layout.row(align=True)
+		row.prop(self, "sort_by", expand=True)
+		row.prop(self, "use_filter_sort_reverse", text="", icon='SORT_DESC' if self.use_filter_sort_reverse else 'SORT_ASC')
+	
+	def filter_items(self, context, data, propname):
+		# Only walks the items when a filter or sort is in use, empty lists show
+		# everything in list order
+		items = getattr(data, propname)
+		helper = bpy.types.UI_UL_list
+		
+		flt_flags = []
+		if self.filter_name:
+			flt_flags = helper.filter_items_by_name(self.filter_name, self.bitflag_filter_item, items, "name")
+		if self.filter_custom_resolution or self.filter_selected:
+			if not flt_flags:
+				flt_flags = [self.bitflag_filter_item] * len(items)
+			for row, item in enumerate(items):
+				if not flt_flags[row]:
+					continue
+				if (self.filter_custom_resolution and not item.has_custom_resolution()) or (self.filter_selected and not item.selected_for_rendering):
+					flt_flags[row] = 0
+		
+		flt_neworder = []
+		if self.sort_by == 'NAME':
+			flt_neworder = helper.sort_items_by_name(items, "name")
+		elif self.sort_by == 'PIXELS':
+			flt_neworder = helper.sort_items_helper([(row, item.x_dim * item.y_dim) for row, item in enumerate(items)], key=lambda entry: entry[1])
+		elif self.sort_by == 'FRAME_RANGE':
+			flt_neworder = helper.sort_items_helper([(row, get_first_frame(item.name)) for row, item in enumerate(items)], key=lambda entry: entry[1])
+		
+		return flt_flags, flt_neworder
+	
 	def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
 		if self.layout_type in {'DEFAULT', 'COMPACT'}:
 			scene = context.scene
-			valid_camera = bpy.data.objects.get(item.name)
+			valid_camera = item.get_camera()
 			if valid_camera and valid_camera.type == "CAMERA":
 				row = layout.row(align=True)
 
-				camera_item = scene.cameras[index]			
+				camera_item = item
 				
 				# CHECKBOX: Toggles the selected state of a camera, allowing user
 				# to decide to include or exclude it from Render Selected
@@ -630,11 +1403,24 @@ class JB_MULTICAM_UL_CAMERALIST_TEMPLATE_camera_list_item(bpy.types.UIList):
 				use_camera_checkbox = 'CHECKBOX_HLT' if camera_item.selected_for_rendering else 'CHECKBOX_DEHLT'
 				row.operator("camera_list.toggle_use_camera", text="", icon=use_camera_checkbox, emboss=False).camera_name = item.name
 
+				# PREVIEW: a small render of the camera, see Build Previews
+				if scene.show_camera_previews:
+					preview_icon = get_camera_preview_icon(valid_camera)
+					if preview_icon:
+						row.label(text="", icon_value=preview_icon)
+					else:
+						row.label(text="", icon='BLANK1')
+				
 				# NAME: Name of the camera
 				# Click to modify dimensions of camera.
 				# Double click to modify name.
 				row.prop(valid_camera, "name", text="", emboss=False)
 
+				# APPROVED: the draft of the camera was checked, its final is rendered next
+				if scene.draft_mode == 'APPROVAL':
+					approved_icon = 'CHECKMARK' if camera_item.draft_approved else 'RADIOBUT_OFF'
+					row.prop(camera_item, "draft_approved", text="", icon=approved_icon, emboss=False)
+
 				# WRENCH: shows as filled when camera has custom dimensions
 				has_been_customized = camera_item.has_custom_resolution()
 				modifier_icon = 'MODIFIER_ON' if has_been_customized else 'MODIFIER_OFF'
@@ -682,6 +1468,7 @@ class JB_MULTICAM_OT_CAMERALIST_select_camera(bpy.types.Operator):
 	camera_name: bpy.props.StringProperty(name="Camera Name")
 	row_index: bpy.props.IntProperty()
 	
+	@instrumented("scene.select_camera")
 	def execute(self, context):
 		camera = bpy.data.objects.get(self.camera_name)
 		if camera:
@@ -732,6 +1519,7 @@ class JB_MULTICAM_OT_initialize_camera_list(bpy.types.Operator):
 
 	scene_name = bpy.props.StringProperty()
 
+	@instrumented("scene.initialize_camera_list_operator")
 	def execute(self, context):
 		scene = bpy.context.scene
 		if scene:
@@ -781,23 +1569,23 @@ class JB_MULTICAM_OT_render_custom_resolution(bpy.types.Operator):
 
 	camera_name: bpy.props.StringProperty()
 
+	@instrumented("render.render_still_with_custom_resolution")
 	def execute(self, context):
-		camera_item = None
-		for item in context.scene.cameras:
-			if item.name == self.camera_name:
-				camera_item = item
-				break
+		row = get_camera_row(context.scene, self.camera_name)
+		camera_item = context.scene.cameras[row] if row >= 0 else None
 	
 		if camera_item is not None:
 			camera = bpy.data.objects.get(self.camera_name)
 			if camera is not None and camera.type == 'CAMERA':
-				# Store the current resolution
+				# Store the current resolution and output format
 				original_resolution_x = context.scene.render.resolution_x
 				original_resolution_y = context.scene.render.resolution_y
+				original_output_settings = get_current_output_settings(context.scene)
 	
-				# Set the custom resolution from the selected camera
+				# Set the custom resolution and output format from the selected camera
 				context.scene.render.resolution_x = camera_item.x_dim
 				context.scene.render.resolution_y = camera_item.y_dim
+				apply_output_settings(context.scene, get_output_settings(context.scene, camera_item))
 	
 				# Store the current active camera
 				original_active_camera = context.scene.camera
@@ -808,14 +1596,15 @@ class JB_MULTICAM_OT_render_custom_resolution(bpy.types.Operator):
 				self.report({'INFO'}, f"Rendering {camera.name} - interface will become unresponsive")
 	
 				# Render the image
-				bpy.ops.render.render('EXEC_DEFAULT', write_still=True)
+				bpy.ops.render.render('EXEC_DEFAULT', write_still=True, scene=context.scene.name)
 	
 				# Restore the original active camera
 				context.scene.camera = original_active_camera
 	
-				# Restore the original resolution
+				# Restore the original resolution and output format
 				context.scene.render.resolution_x = original_resolution_x
 				context.scene.render.resolution_y = original_resolution_y
+				apply_output_settings(context.scene, original_output_settings)
 	
 				# Update the area to refresh the UI
 				update_ui_if_needed(context)
@@ -846,7 +1635,7 @@ class JB_MULTICAM_OT_clear_custom_resolution(bpy.types.Operator):
 			camera_item.set_x_dim(None)
 			camera_item.set_y_dim(None)
 			
-			camera = bpy.data.objects.get(camera_item.name)
+			camera = camera_item.get_camera()
 			if not camera and camera.type != "CAMERA":
 				self.report({'WARNING'}, f"Camera {camera_data.camera_name} not found")
 				return {'FINISHED'}
@@ -868,7 +1657,7 @@ class JB_MULTICAM_OT_clear_custom_resolution(bpy.types.Operator):
 				camera_item.set_y_dim(None)
 			
 			camera_item = context.scene.cameras[self.camera_index]
-			camera = bpy.data.objects.get(camera_item.name)
+			camera = camera_item.get_camera()
 			if not camera:
 				# No camera is selected, no need to update the render border
 				return {'FINISHED'}
@@ -889,14 +1678,19 @@ class JB_MULTICAM_OT_confirmation_dialog_render_all(bpy.types.Operator):
 	bl_description = "Render all Cameras in the Scene"
 
 
+	@instrumented("render.confirm_dialog_all_cameras")
 	def execute(self, context):
 		scene = context.scene
 		
 		if not scene.cameras:
 			self.report({'WARNING'}, "No cameras in scene")
 			return {'CANCELLED'}
+		
+		if not bpy.app.background:
+			# Rendering in the background keeps the interface responsive
+			return start_render_queue(self, scene, plan_still_queue(scene, scene.cameras))
 			
-		render_feedback = render_images(scene, scene.cameras)
+		render_feedback = render_images_in_passes(scene, scene.cameras)
 		self.report({'INFO'}, render_feedback)
 		
 		return {'FINISHED'}
@@ -909,13 +1703,15 @@ class JB_MULTICAM_OT_confirmation_dialog_render_all(bpy.types.Operator):
 		
 		box = layout.box()  # Create a box layout
 		col = box.column()
-		col.label(text="Launch Blender from the terminal")
-		col.label(text="to see Render Progress.")
+		col.label(text="Progress is shown below")
+		col.label(text="the Camera List.")
 		col = box.column()
-		col.label(text="Try Ctrl+C in Python Console")
-		col.label(text="to cancel the rendering.")
+		col.label(text="Press Esc or Cancel there")
+		col.label(text="to stop the rendering.")
 
 		col = layout.column()
+		if context.scene.draft_mode != 'OFF':
+			col.label(text="Drafts are rendered first.")
 		col.label(text=f"Proceed to render all Cameras?")  # Add another line of text here
 
 # Confirmation dialog box
@@ -935,19 +1731,24 @@ class JB_MULTICAM_OT_confirmation_dialog_render_selected(bpy.types.Operator):
 		bl_label = "RENDER SELECTED CAMERAS"
 		bl_description = "Render only Cameras that are Selected in the list above"
 		
+		@instrumented("render.confirm_dialog_selected_cameras")
 		def execute(self, context):
 			scene = context.scene
 			selected_camera_items = [camera_item for camera_item in scene.cameras if camera_item.selected_for_rendering]
 			if not selected_camera_items:
 				self.report({'WARNING'}, "No cameras selected")
 				return {'CANCELLED'}
+			
+			if not bpy.app.background:
+				# Rendering in the background keeps the interface responsive
+				return start_render_queue(self, scene, plan_still_queue(scene, selected_camera_items))
 				
-			render_feedback = render_images(scene, selected_camera_items)
+			render_feedback = render_images_in_passes(scene, selected_camera_items)
 			self.report({'INFO'}, render_feedback)
 			return {'FINISHED'}
 		
 		def invoke(self, context, event):
-			selected_camera_count = len([camera_item for camera_item in bpy.context.scene.cameras if camera_item.selected_for_rendering])
+			selected_camera_count = get_camera_list_cache(context.scene).selected_count
 			if selected_camera_count > 0:
 				return context.window_manager.invoke_props_dialog(self, width=200)
 			else:
@@ -959,110 +1760,2049 @@ class JB_MULTICAM_OT_confirmation_dialog_render_selected(bpy.types.Operator):
 
 			box = layout.box()  # Create a box layout
 			col = box.column()
-			col.label(text="Launch Blender from the terminal")
-			col.label(text="to see Render Progress.")
+			col.label(text="Progress is shown below")
+			col.label(text="the Camera List.")
 			col = box.column() # Creates a bit more space
-			col.label(text="Try Ctrl+C in Python Console")
-			col.label(text="to cancel the rendering.")
+			col.label(text="Press Esc or Cancel there")
+			col.label(text="to stop the rendering.")
 			
-			selected_camera_items = [camera_item for camera_item in bpy.context.scene.cameras if camera_item.selected_for_rendering]
-			camera_count = len(selected_camera_items)
+			camera_count = get_camera_list_cache(context.scene).selected_count
 									
 			col = layout.column()
+			if context.scene.draft_mode != 'OFF':
+				col.label(text="Drafts are rendered first.")
 			col.label(text=f"Proceed to render {camera_count} cameras?")  # Add another line of text here
 
 
-def render_images(scene, cameras_to_render):
-	
-	# Retain original camera details
-	original_camera = scene.camera
-	original_resolution_x = scene.render.resolution_x
-	original_resolution_y = scene.render.resolution_y
+class RenderJournal:
+	# A record of the renders that finished in an output directory, so a batch that
+	# was interrupted (crashed, killed, Ctrl+C) resumes where it stopped instead of
+	# rendering everything again.
+	#
+	# Each finished render is appended as one JSON line with a single write that is
+	# flushed, so a crash of Blender leaves at most a partial last line, which is
+	# ignored. Syncing to disk, which also survives a power loss, is slow on network
+	# drives, so it is done at most every sync_interval seconds.
+	# Rewriting the journal goes through a temporary file that replaces it.
+	# A render only counts as done while its file has the recorded size and checksum.
+
+	file_name = ".multicam_render_journal.jsonl"
+	sync_interval = 10.0
+
+	def __init__(self, directory):
+		self.path = os.path.join(directory, self.file_name)
+		self.entries = {}
+		self.lock = threading.Lock()
+		self.synced_at = time.monotonic()
+		
+		try:
+			with open(self.path, encoding="utf-8") as journal_file:
+				for line in journal_file:
+					try:
+						entry = json.loads(line)
+					except ValueError:
+						# Partial line from a crash
+						continue
+					self.entries[entry["path"]] = entry
+		except FileNotFoundError:
+			pass
+
+	def is_done(self, output_path, camera_name, frame, resolution):
+		entry = self.entries.get(output_path)
+		if entry is None or entry["camera"] != camera_name or entry["frame"] != frame or entry["resolution"] != list(resolution):
+			return False
+		try:
+			return os.path.getsize(output_path) == entry["size"] and get_file_checksum(output_path) == entry["checksum"]
+		except OSError:
+			return False
+
+	def record(self, output_path, camera_name, frame, resolution):
+		try:
+			size = os.path.getsize(output_path)
+			checksum = get_file_checksum(output_path)
+		except OSError:
+			# Nothing was written
+			return
+		
+		entry = {
+			"camera": camera_name,
+			"frame": frame,
+			"resolution": list(resolution),
+			"path": output_path,
+			"size": size,
+			"checksum": checksum,
+		}
+		with self.lock:
+			self.entries[output_path] = entry
+			with open(self.path, "a", encoding="utf-8") as journal_file:
+				journal_file.write(json.dumps(entry) + "\n")
+				journal_file.flush()
+				if time.monotonic() - self.synced_at >= self.sync_interval:
+					os.fsync(journal_file.fileno())
+					self.synced_at = time.monotonic()
+
+	def finish(self, output_paths=None):
+		# The batch completed, so its renders no longer need to be resumed.
+		# Without output paths the whole journal is done.
+		with self.lock:
+			if output_paths is None:
+				self.entries.clear()
+			else:
+				for output_path in output_paths:
+					self.entries.pop(output_path, None)
 			
-	# get output path
-	file_path = bpy.path.abspath(scene.render.filepath)
-	file_dir = os.path.dirname(file_path)
+			if not self.entries:
+				try:
+					os.remove(self.path)
+				except FileNotFoundError:
+					pass
+				return
+			
+			temporary_path = self.path + ".tmp"
+			with open(temporary_path, "w", encoding="utf-8") as journal_file:
+				for entry in self.entries.values():
+					journal_file.write(json.dumps(entry) + "\n")
+				journal_file.flush()
+				os.fsync(journal_file.fileno())
+			os.replace(temporary_path, self.path)
+
+
+def get_file_checksum(file_path):
+	checksum = hashlib.sha256()
+	with open(file_path, "rb") as output_file:
+		for block in iter(lambda: output_file.read(1024 * 1024), b""):
+			checksum.update(block)
+	return checksum.hexdigest()
+
+
+def open_render_journal(scene, directory):
+	# Returns None when finished renders should not be skipped
+	if not scene.resume_interrupted_renders:
+		return None
+	os.makedirs(directory, exist_ok=True)
+	return RenderJournal(directory)
+
+
+def get_output_directory(scene):
+	file_dir = os.path.dirname(bpy.path.abspath(scene.render.filepath))
 	if not file_dir:
 		file_dir = bpy.path.abspath("//")
+	return file_dir
+
+
+def get_render_samples(scene):
+	if scene.render.engine == 'CYCLES':
+		return scene.cycles.samples
+	if scene.render.engine.startswith('BLENDER_EEVEE'):
+		return scene.eevee.taa_render_samples
+	return None
+
+
+def set_render_samples(scene, samples):
+	if scene.render.engine == 'CYCLES':
+		set_if_changed(scene.cycles, "samples", samples)
+	elif scene.render.engine.startswith('BLENDER_EEVEE'):
+		set_if_changed(scene.eevee, "taa_render_samples", samples)
+
+
+def get_scene_render_state_key(scene):
+	# The current render settings, in the same order as get_render_state_key
+	return (
+		scene.render.resolution_x,
+		scene.render.resolution_y,
+		scene.render.engine,
+		get_render_samples(scene),
+		get_current_output_settings(scene),
+	)
+
+
+def get_render_state_key(scene, camera_item):
+	# The render settings a camera is rendered with. Switching these between
+	# renders is what costs (e.g. Eevee reallocating its render buffers).
+	return (
+		camera_item.x_dim,
+		camera_item.y_dim,
+		scene.render.engine,
+		get_render_samples(scene),
+		get_output_settings(scene, camera_item),
+	)
+
+
+def get_current_output_settings(scene):
+	# The image settings of the scene as (file format, color depth, quality, EXR codec),
+	# where quality is the PNG compression or the JPEG and WebP quality
+	image_settings = scene.render.image_settings
+	file_format = image_settings.file_format
+	quality = None
+	if file_format == 'PNG':
+		quality = image_settings.compression
+	elif file_format in {'JPEG', 'WEBP'}:
+		quality = image_settings.quality
+	exr_codec = image_settings.exr_codec if file_format in {'OPEN_EXR', 'OPEN_EXR_MULTILAYER'} else None
+	return (file_format, image_settings.color_depth, quality, exr_codec)
+
+
+def get_batch_quality(scene, file_format):
+	# The PNG compression or the JPEG and WebP quality of the batch, None for other formats
+	if file_format == 'PNG':
+		return scene.output_compression
+	elif file_format in {'JPEG', 'WEBP'}:
+		return scene.output_quality
+	return None
+
+
+def get_output_settings(scene, camera_item=None):
+	# The image settings a camera is rendered with: the batch settings of the
+	# add-on, overridden by the camera. With Scene Settings the Output Properties
+	# are used as they are, unless the camera has a format of its own.
+	file_format = scene.output_format
+	color_depth = scene.output_color_depth
+	if camera_item is not None:
+		file_format = camera_item.get_file_format()
+		if camera_item.output_color_depth != 'BATCH':
+			color_depth = camera_item.output_color_depth
 	
-	# Starting state
-	render_progress = 1 # Yeah, feels right to start on 1.
-	number_of_cameras_to_render = len(cameras_to_render)
-	start_time = time.time()
-	
-	# Render each camera with custom resolution, or default resolution if not set
-	for camera_data in cameras_to_render:
+	if file_format == 'SCENE':
+		return get_current_output_settings(scene)
 	
-		camera = bpy.data.objects.get(camera_data.name)
-		if not camera:
-			self.report({'WARNING'}, f"Camera {camera_data.name} not found")
-			continue
-			
-		# set camera as active
+	quality = get_batch_quality(scene, file_format)
+	exr_codec = scene.output_exr_codec if file_format == 'OPEN_EXR' else None
+	if camera_item is not None:
+		if quality is not None and camera_item.has_output_quality():
+			quality = camera_item.output_quality
+		if exr_codec is not None and camera_item.output_exr_codec != 'BATCH':
+			exr_codec = camera_item.output_exr_codec
+	return (file_format, get_supported_color_depth(file_format, color_depth), quality, exr_codec)
+
+
+def apply_output_settings(scene, output_settings):
+	file_format, color_depth, quality, exr_codec = output_settings
+	image_settings = scene.render.image_settings
+	set_if_changed(image_settings, "file_format", file_format)
+	if image_settings.color_depth != color_depth:
+		try:
+			image_settings.color_depth = color_depth
+		except TypeError:
+			# The format has a single color depth
+			pass
+	if quality is not None:
+		set_if_changed(image_settings, "compression" if file_format == 'PNG' else "quality", quality)
+	if exr_codec is not None:
+		set_if_changed(image_settings, "exr_codec", exr_codec)
+
+
+def get_frame_output_path(scene, frame, output_settings):
+	# The file an animation frame is written to, once the output settings are applied
+	frame_path = scene.render.frame_path(frame=frame)
+	if scene.render.use_file_extension:
+		current_extension = scene.render.file_extension
+		if frame_path.endswith(current_extension):
+			frame_path = frame_path[:-len(current_extension)]
+		frame_path += get_image_extension(output_settings[0])
+	return frame_path
+
+
+def count_render_state_switches(scene, keys):
+	switches = 0
+	current_key = get_scene_render_state_key(scene)
+	for key in keys:
+		if key != current_key:
+			switches += 1
+			current_key = key
+	return switches
+
+
+def schedule_by_render_state(scene, camera_items):
+	# Orders the cameras so the ones sharing render settings are rendered back to
+	# back. The groups keep the order in which they first appear in the list.
+	# Returns the ordered cameras, and how many render state switches that avoided.
+	keyed_items = [(get_render_state_key(scene, camera_item), camera_item) for camera_item in camera_items]
+	
+	groups = {}
+	for key, camera_item in keyed_items:
+		groups.setdefault(key, []).append(camera_item)
+	
+	scheduled_items = [camera_item for group in groups.values() for camera_item in group]
+	switches_in_list_order = count_render_state_switches(scene, [key for key, _ in keyed_items])
+	switches_scheduled = count_render_state_switches(scene, list(groups.keys()))
+	return scheduled_items, switches_in_list_order - switches_scheduled
+
+
+def set_if_changed(data, attribute, value):
+	# Writing a render setting can be expensive even when the value is the same
+	if getattr(data, attribute) != value:
+		setattr(data, attribute, value)
+		return True
+	return False
+
+
+# DRAFT PASS
+#
+# A batch can be rendered twice: first a draft of every camera at a fraction of
+# its resolution and samples, saved to the draft folder, then the finals. The
+# drafts of a whole batch are done in minutes, so framing mistakes show up before
+# hours of finals. With Drafts, then Approved only the finals of the cameras that
+# were approved in the Camera List are rendered, the others get a draft.
+
+def is_draft_approved(camera):
+	return camera is not None and bool(camera.get("draft_approved", False))
+
+
+def get_render_passes(scene, entries, get_camera):
+	# Splits a batch into (is_draft, entries) passes, in the order they are
+	# rendered. get_camera returns the camera of an entry.
+	entries = list(entries)
+	if scene.draft_mode == 'AUTO':
+		passes = [(True, entries), (False, entries)]
+	elif scene.draft_mode == 'APPROVAL':
+		passes = [
+			(True, [entry for entry in entries if not is_draft_approved(get_camera(entry))]),
+			(False, [entry for entry in entries if is_draft_approved(get_camera(entry))]),
+		]
+	else:
+		passes = [(False, entries)]
+	return [(is_draft, pass_entries) for is_draft, pass_entries in passes if pass_entries]
+
+
+def get_pass_settings(scene):
+	# The settings a draft lowers, as (resolution percentage, samples)
+	return (scene.render.resolution_percentage, get_render_samples(scene))
+
+
+def get_draft_pass_settings(scene, final_settings):
+	_, samples = final_settings
+	return (scene.draft_resolution_percentage, None if samples is None else min(samples, scene.draft_samples))
+
+
+def apply_pass_settings(scene, pass_settings):
+	resolution_percentage, samples = pass_settings
+	set_if_changed(scene.render, "resolution_percentage", resolution_percentage)
+	if samples is not None:
+		set_render_samples(scene, samples)
+
+
+def get_pass_directory(scene, file_dir, is_draft):
+	return os.path.join(file_dir, scene.draft_folder) if is_draft else file_dir
+
+
+def get_pass_filepath(scene, filepath, is_draft):
+	# Drafts of a sequence keep the file names of the finals, in the draft folder
+	if not is_draft:
+		return filepath
+	directory, name = os.path.split(filepath)
+	return os.path.join(directory, scene.draft_folder, name)
+
+
+def get_camera_output_path(scene, file_dir, camera_item):
+	extension = get_image_extension(get_output_settings(scene, camera_item)[0])
+	return format_camera_output_path(file_dir, camera_item.name, camera_item.x_dim, camera_item.y_dim, scene.append_resolution, extension)
+
+
+def get_still_output_path(scene, filepath=None):
+	# The file a still render is written to, for the given or current output path
+	file_path = bpy.path.abspath(scene.render.filepath if filepath is None else filepath)
+	if scene.render.use_file_extension:
+		file_path = bpy.path.ensure_ext(file_path, scene.render.file_extension)
+	return file_path
+
+
+class AsyncImageWriter:
+	# Compresses and saves PNG files on background threads, so Blender can start
+	# rendering the next camera right away.
+	#
+	# Blender does not hand out the pixels of the Render Result, so each render is
+	# saved as an uncompressed Targa first, which is quick, and a thread turns it
+	# into the PNG. zlib releases the GIL while compressing, so the threads work in
+	# parallel with the render. The queue is bounded: when the threads fall behind,
+	# submit waits, so at most a few uncompressed images are kept on disk.
+
+	thread_count = 2
+	max_pending = 4
+
+	def __init__(self, journal=None, render_cache=None):
+		self.journal = journal
+		self.render_cache = render_cache
+		self.errors = []
+		self.jobs = queue.Queue(maxsize=self.max_pending)
+		self.threads = [threading.Thread(target=self.run, daemon=True) for _ in range(self.thread_count)]
+		for thread in self.threads:
+			thread.start()
+
+	def submit(self, targa_path, output_path, compression, camera_name, frame, resolution, cache_key=None):
+		# Blocks while max_pending images are waiting. Blender's PNG compression
+		# is 0-100, zlib's level 0-9.
+		self.jobs.put((targa_path, output_path, round(compression / 100 * 9), camera_name, frame, resolution, cache_key))
+
+	def close(self):
+		# Waits for every image to be written, returns the errors
+		for _ in self.threads:
+			self.jobs.put(None)
+		for thread in self.threads:
+			thread.join()
+		return self.errors
+
+	def run(self):
+		while True:
+			job = self.jobs.get()
+			if job is None:
+				return
+			targa_path, output_path, level, camera_name, frame, resolution, cache_key = job
+			try:
+				write_png_from_targa(targa_path, output_path, level)
+				os.remove(targa_path)
+			except (OSError, ValueError, zlib.error) as error:
+				# The Targa is left behind, so the render is not lost
+				self.errors.append(f"{camera_name}: {error}")
+				continue
+			if self.journal:
+				self.journal.record(output_path, camera_name, frame, resolution)
+			if self.render_cache and cache_key:
+				self.render_cache.record(output_path, cache_key)
+
+
+def read_targa(path):
+	# Reads an uncompressed Targa as saved by Blender. Returns the width, height,
+	# channels and the rows top to bottom, in RGB(A) order.
+	with open(path, "rb") as targa_file:
+		data = targa_file.read()
+	
+	id_length, color_map_type, image_type = data[0], data[1], data[2]
+	width, height, pixel_depth, descriptor = struct.unpack_from("<HHBB", data, 12)
+	if color_map_type != 0 or image_type not in (2, 3) or pixel_depth not in (8, 24, 32):
+		raise ValueError(f"{path} is not an uncompressed Targa")
+	
+	channels = pixel_depth // 8
+	pixels = bytearray(data[18 + id_length:18 + id_length + width * height * channels])
+	if len(pixels) != width * height * channels:
+		raise ValueError(f"{path} is incomplete")
+	if channels >= 3:
+		# BGR(A) to RGB(A)
+		pixels[0::channels], pixels[2::channels] = pixels[2::channels], pixels[0::channels]
+	
+	stride = width * channels
+	rows = [pixels[start:start + stride] for start in range(0, len(pixels), stride)]
+	if not descriptor & 0x20:
+		# Stored bottom to top
+		rows.reverse()
+	return width, height, channels, rows
+
+
+def write_png_from_targa(targa_path, output_path, level):
+	width, height, channels, rows = read_targa(targa_path)
+	color_type = {1: 0, 3: 2, 4: 6}[channels]
+	
+	def chunk(chunk_type, chunk_data):
+		return struct.pack(">I", len(chunk_data)) + chunk_type + chunk_data + struct.pack(">I", zlib.crc32(chunk_type + chunk_data))
+	
+	# Every row starts with filter type 0 (none)
+	image_data = zlib.compress(b"".join(b"\x00" + row for row in rows), level)
+	png = b"".join((
+		b"\x89PNG\r\n\x1a\n",
+		chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)),
+		chunk(b"IDAT", image_data),
+		chunk(b"IEND", b""),
+	))
+	
+	# Written next to the output and moved in place, so a half written PNG is never left behind
+	temporary_path = output_path + ".part"
+	with open(temporary_path, "wb") as png_file:
+		png_file.write(png)
+	os.replace(temporary_path, output_path)
+
+
+def open_image_writer(scene, journal, render_cache=None):
+	# An AsyncImageWriter when writing in the background is enabled. It is used
+	# for the cameras whose output is an 8-bit PNG, which is what it produces.
+	if not scene.write_images_in_background:
+		return None
+	return AsyncImageWriter(journal, render_cache)
+
+
+def is_written_in_background(output_settings):
+	file_format, color_depth, _, _ = output_settings
+	return file_format == 'PNG' and color_depth == '8'
+
+
+# RENDER SESSION
+#
+# Every camera of a batch is a render of its own, and each render starts with a
+# setup: Cycles syncs the scene and builds the BVH, Eevee compiles its shaders.
+# The session times the setup and sampling of every render, so the cost of the
+# setup is visible. The split comes from the render status lines, which Blender
+# only passes to the render_stats handlers when it renders in the background
+# (from the command line); renders in the interface are not split. With Fast Batch, Cycles keeps the scene data between renders
+# (Persistent Data), and the Eevee shaders are compiled once before the batch.
+# The batch is ordered by render state (see schedule_by_render_state), so the
+# renders sharing a resolution and output follow each other.
+
+# The session of the running batch. Renders started within it, e.g. the jobs of
+# a render worker, do not start one of their own.
+active_render_session = None
+
+
+class RenderSession:
+	# Started by begin_render_session, one per batch
+
+	def __init__(self, scene, first_camera=None):
+		self.phases = []
+		self.started_at = None
+		self.sampling_started_at = None
+		self.original_persistent_data = None
+		
+		if scene.use_fast_batch:
+			self.original_persistent_data = scene.render.use_persistent_data
+			set_if_changed(scene.render, "use_persistent_data", True)
+			if scene.render.engine.startswith('BLENDER_EEVEE'):
+				try:
+					prewarm_eevee(scene, first_camera)
+				except Exception:
+					# No session is returned to finish, so restore it here
+					set_if_changed(scene.render, "use_persistent_data", self.original_persistent_data)
+					raise
+		
+		# In the interface every render would count as all setup
+		if bpy.app.background:
+			bpy.app.handlers.render_pre.append(self.on_render_pre)
+			bpy.app.handlers.render_stats.append(self.on_render_stats)
+			bpy.app.handlers.render_post.append(self.on_render_post)
+
+	def on_render_pre(self, scene, depsgraph=None):
+		self.started_at = time.time()
+		self.sampling_started_at = None
+
+	def on_render_stats(self, stats, depsgraph=None):
+		if self.started_at is not None and self.sampling_started_at is None and is_sampling_status(stats):
+			self.sampling_started_at = time.time()
+
+	def on_render_post(self, scene, depsgraph=None):
+		if self.started_at is None:
+			return
+		ended_at = time.time()
+		# Without sampling messages, e.g. from Workbench, it all counts as setup
+		sampling_started_at = self.sampling_started_at or ended_at
+		setup = sampling_started_at - self.started_at
+		sampling = ended_at - sampling_started_at
+		camera_name = scene.camera.name if scene.camera else ""
+		self.phases.append((camera_name, setup, sampling))
+		profiler.record_render_phases(camera_name, setup, sampling)
+		self.started_at = None
+		print(f"Setup took {setup:.2f} s, sampling {sampling:.2f} s.")
+
+	def finish(self, scene):
+		for handlers, handler in (
+			(bpy.app.handlers.render_pre, self.on_render_pre),
+			(bpy.app.handlers.render_stats, self.on_render_stats),
+			(bpy.app.handlers.render_post, self.on_render_post),
+		):
+			if handler in handlers:
+				handlers.remove(handler)
+		
+		# Without a scene, e.g. after another file was loaded, there is nothing to restore
+		if self.original_persistent_data is not None and scene is not None:
+			set_if_changed(scene.render, "use_persistent_data", self.original_persistent_data)
+		
+		if self.phases:
+			setup = sum(setup for _, setup, _ in self.phases)
+			sampling = sum(sampling for _, _, sampling in self.phases)
+			share = setup / (setup + sampling) if setup + sampling else 0
+			fast_batch = "on" if self.original_persistent_data is not None else "off"
+			print(f"Setup took {format_duration(setup)} ({share:.0%}) and sampling {format_duration(sampling)} over {len(self.phases)} renders, Fast Batch {fast_batch}.")
+
+
+def begin_render_session(scene, first_camera=None):
+	# Returns the new session, or None when a session is running already
+	global active_render_session
+	if active_render_session is not None:
+		return None
+	active_render_session = RenderSession(scene, first_camera)
+	return active_render_session
+
+
+def end_render_session(scene, session):
+	global active_render_session
+	if session is None:
+		return
+	session.finish(scene)
+	if active_render_session is session:
+		active_render_session = None
+
+
+def prewarm_eevee(scene, camera=None):
+	# Renders the first camera once at the smallest size and a single sample, so
+	# the shaders are compiled before the batch instead of during its first render
+	original_camera = scene.camera
+	original_percentage = scene.render.resolution_percentage
+	original_samples = scene.eevee.taa_render_samples
+	if camera is not None:
 		scene.camera = camera
+	scene.render.resolution_percentage = 1
+	scene.eevee.taa_render_samples = 1
+	
+	started_at = time.time()
+	try:
+		bpy.ops.render.render(scene=scene.name)
+	finally:
+		scene.camera = original_camera
+		scene.render.resolution_percentage = original_percentage
+		scene.eevee.taa_render_samples = original_samples
+	print(f"Compiled the Eevee shaders in {format_duration(time.time() - started_at)}")
+
+
+# RENDER CACHE
+#
+# Each still is recorded with a key: a hash of everything that goes into it. The
+# camera, its resolution and output settings, the render settings, world and
+# lights, and the objects inside the frustum of the camera. When a camera's key
+# matches the image it rendered before, it is skipped, so after moving one prop
+# only the cameras that see it are rendered again.
+
+class RenderCache:
+	# The keys of the images in an output directory, stored like the render
+	# journal: one JSON line per image, the last line of an image counts. An
+	# image counts as long as its size and modification time are unchanged.
+	# The file is rewritten without the outdated lines when it is opened.
+
+	file_name = ".multicam_render_cache.jsonl"
+
+	def __init__(self, directory):
+		self.path = os.path.join(directory, self.file_name)
+		self.entries = {}
+		self.paths_by_key = {}
+		self.lock = threading.Lock()
+		
+		line_count = 0
+		try:
+			with open(self.path, encoding="utf-8") as cache_file:
+				for line in cache_file:
+					line_count += 1
+					try:
+						entry = json.loads(line)
+					except ValueError:
+						# Partial line from a crash
+						continue
+					self.entries[entry["path"]] = entry
+		except FileNotFoundError:
+			pass
+		
+		# Images that were deleted or overwritten can never be reused
+		self.entries = {path: entry for path, entry in self.entries.items() if self.is_unchanged(entry)}
+		for entry in self.entries.values():
+			self.paths_by_key.setdefault(entry["key"], []).append(entry["path"])
 		
-		# set resolution
-		scene.render.resolution_x = camera_data.x_dim
-		scene.render.resolution_y = camera_data.y_dim
+		if line_count > len(self.entries):
+			self.compact()
+
+	def compact(self):
+		# Keeps one line per image. Workers open the same cache, so each one uses
+		# its own temporary file; a line another worker appends meanwhile may be
+		# lost, which only renders that camera again next time.
+		if not self.entries:
+			try:
+				os.remove(self.path)
+			except FileNotFoundError:
+				pass
+			return
 		
-		# set output path
-		if bpy.context.scene.append_resolution:
-			camera_file_path = os.path.join(file_dir, f"{camera_data.name} {camera_data.x_dim} × {camera_data.y_dim}.png")
+		temporary_path = f"{self.path}.{os.getpid()}.tmp"
+		try:
+			with open(temporary_path, "w", encoding="utf-8") as cache_file:
+				for entry in self.entries.values():
+					cache_file.write(json.dumps(entry) + "\n")
+			os.replace(temporary_path, self.path)
+		except OSError as error:
+			print(f"Could not compact the render cache: {error}")
+
+	def is_unchanged(self, entry):
+		try:
+			stat = os.stat(entry["path"])
+		except OSError:
+			return False
+		return stat.st_size == entry["size"] and stat.st_mtime_ns == entry["modified"]
+
+	def find(self, output_path, key):
+		# The path of an unchanged image rendered from the key, output_path if it
+		# is one of them, or None
+		paths = [output_path] + [path for path in self.paths_by_key.get(key, ()) if path != output_path]
+		for path in paths:
+			entry = self.entries.get(path)
+			if entry is not None and entry["key"] == key and self.is_unchanged(entry):
+				return path
+		return None
+
+	def record(self, output_path, key):
+		try:
+			stat = os.stat(output_path)
+		except OSError:
+			# Nothing was written
+			return
+		
+		entry = {
+			"path": output_path,
+			"key": key,
+			"size": stat.st_size,
+			"modified": stat.st_mtime_ns,
+		}
+		with self.lock:
+			self.entries[output_path] = entry
+			self.paths_by_key.setdefault(key, []).append(output_path)
+			with open(self.path, "a", encoding="utf-8") as cache_file:
+				cache_file.write(json.dumps(entry) + "\n")
+
+
+def open_render_cache(scene, directory):
+	# Returns None when unchanged cameras should be rendered anyway
+	if not scene.use_render_cache:
+		return None
+	os.makedirs(directory, exist_ok=True)
+	return RenderCache(directory)
+
+
+def reuse_cached_render(render_cache, output_path, cache_key):
+	# True when output_path holds a render of the key. An image rendered from the
+	# same key under another name, e.g. by a duplicate camera, is copied.
+	cached_path = render_cache.find(output_path, cache_key)
+	if cached_path is None:
+		return False
+	if cached_path != output_path:
+		try:
+			shutil.copyfile(cached_path, output_path)
+		except OSError:
+			return False
+		render_cache.record(output_path, cache_key)
+	return True
+
+
+# Object types whose bounding box holds everything they render
+bounded_object_types = {'MESH', 'CURVE', 'SURFACE', 'META', 'FONT', 'VOLUME', 'CURVES', 'POINTCLOUD', 'GPENCIL'}
+
+
+def round_matrix(matrix):
+	return tuple(round(value, 5) for row in matrix for value in row)
+
+
+def get_plain_value(value):
+	# A property value as something repr gives the same text for each time
+	if isinstance(value, float):
+		return round(value, 5)
+	if isinstance(value, (bool, int, str)) or value is None:
+		return value
+	if isinstance(value, (set, frozenset)):
+		# Enum flags
+		return tuple(sorted(value))
+	return tuple(get_plain_value(item) for item in value)
+
+
+def get_rna_fingerprint(rna_struct, ignored=(), depth=6):
+	# Every property of an RNA struct, following nested structs and collections.
+	# Datablocks count by name: their content has its own fingerprint.
+	values = []
+	for prop in rna_struct.bl_rna.properties:
+		identifier = prop.identifier
+		if identifier == "rna_type" or identifier in ignored:
+			continue
+		try:
+			value = getattr(rna_struct, identifier)
+		except AttributeError:
+			# Properties of add-ons that are not loaded
+			continue
+		
+		if prop.type == 'POINTER':
+			if value is None or isinstance(value, bpy.types.ID):
+				value = getattr(value, "name", None)
+			elif depth > 0:
+				value = get_rna_fingerprint(value, depth=depth - 1)
+			else:
+				continue
+		elif prop.type == 'COLLECTION':
+			if depth == 0:
+				continue
+			value = tuple(item.name if isinstance(item, bpy.types.ID) else get_rna_fingerprint(item, depth=depth - 1) for item in value)
+		else:
+			value = get_plain_value(value)
+		values.append((identifier, value))
+	return tuple(values)
+
+
+# Settings that are part of the key of each camera, or that only change how fast
+# the render is, not the image
+render_cache_ignored_settings = {
+	"render": {"filepath", "resolution_x", "resolution_y", "resolution_percentage", "image_settings", "use_persistent_data", "use_lock_interface"},
+	"cycles": {"samples"},
+	"eevee": {"taa_render_samples"},
+	"view_layer": {"depsgraph", "objects", "active_layer_collection"},
+}
+
+
+def get_render_settings_fingerprint(scene):
+	# All render settings of the scene, its color management and the view layers
+	# that are rendered. Node trees (materials, world, compositor) are not read.
+	render = scene.render
+	settings = [
+		get_rna_fingerprint(render, render_cache_ignored_settings["render"]),
+		get_rna_fingerprint(scene.view_settings),
+		get_rna_fingerprint(scene.display_settings),
+	]
+	if render.engine == 'CYCLES' and hasattr(scene, "cycles"):
+		settings.append(get_rna_fingerprint(scene.cycles, render_cache_ignored_settings["cycles"]))
+	elif render.engine == 'BLENDER_WORKBENCH':
+		settings.append(get_rna_fingerprint(scene.display))
+	else:
+		settings.append(get_rna_fingerprint(scene.eevee, render_cache_ignored_settings["eevee"]))
+	
+	for view_layer in scene.view_layers:
+		if view_layer.use or not render.use_single_layer:
+			settings.append(get_rna_fingerprint(view_layer, render_cache_ignored_settings["view_layer"]))
+	return tuple(settings)
+
+
+def get_object_fingerprint(object_eval):
+	fingerprint = hashlib.sha1(repr((
+		object_eval.name,
+		object_eval.type,
+		round_matrix(object_eval.matrix_world),
+		object_eval.data.name if object_eval.data is not None else None,
+		tuple(slot.material.name if slot.material else None for slot in object_eval.material_slots),
+		object_eval.instance_type,
+		object_eval.instance_collection.name if object_eval.instance_collection else None,
+	)).encode("utf-8"))
+	
+	if object_eval.type == 'MESH':
+		# The evaluated mesh, so modifiers, shape keys and armatures count
+		mesh = object_eval.data
+		coordinates = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+		mesh.vertices.foreach_get("co", coordinates)
+		fingerprint.update(coordinates.tobytes())
+		fingerprint.update(repr((len(mesh.edges), len(mesh.polygons), len(mesh.loops))).encode("utf-8"))
+	return fingerprint.hexdigest()
+
+
+def get_light_fingerprint(object_eval):
+	light = object_eval.data
+	return (
+		object_eval.name,
+		round_matrix(object_eval.matrix_world),
+		light.type,
+		tuple(round(value, 5) for value in light.color),
+		round(light.energy, 5),
+		round(getattr(light, "shadow_soft_size", 0), 5),
+		round(getattr(light, "spot_size", 0), 5),
+		round(getattr(light, "spot_blend", 0), 5),
+		round(getattr(light, "size", 0), 5),
+		light.use_shadow,
+	)
+
+
+class SceneFingerprint:
+	# The inputs of the renders that are the same for every camera, read once per
+	# batch: what every camera sees (render settings, world, lights, instancers),
+	# and the fingerprint and bounding box of every other object, so each camera
+	# only counts the objects inside its frustum.
+
+	def __init__(self, scene):
+		if scene == bpy.context.scene:
+			depsgraph = bpy.context.evaluated_depsgraph_get()
 		else:
-			camera_file_path = os.path.join(file_dir, f"{camera_data.name}.png")			
-		scene.render.filepath = bpy.path.ensure_ext(camera_file_path, ".png")
+			# A scene chosen on the command line is evaluated on its own
+			depsgraph = scene.view_layers[0].depsgraph
+			depsgraph.update()
+		world = scene.world
+		shared = [
+			scene.frame_current,
+			get_render_settings_fingerprint(scene),
+			(world.name, tuple(round(value, 5) for value in world.color), world.use_nodes) if world else None,
+		]
 		
-		print(f"\nRendering {render_progress} of {number_of_cameras_to_render}: \"{camera.name}\". Interface will become unresponsive.")
+		object_keys = []
+		boxes = []
+		for obj in scene.objects:
+			if obj.hide_render:
+				continue
+			object_eval = obj.evaluated_get(depsgraph)
+			if obj.type == 'LIGHT':
+				shared.append(get_light_fingerprint(object_eval))
+			elif obj.type in bounded_object_types and obj.instance_type == 'NONE' and not obj.particle_systems:
+				object_keys.append(get_object_fingerprint(object_eval))
+				matrix_world = np.array(object_eval.matrix_world)
+				corners = np.array([corner[:] for corner in object_eval.bound_box])
+				boxes.append(corners @ matrix_world[:3, :3].T + matrix_world[:3, 3])
+			elif obj.instance_type != 'NONE' or obj.particle_systems:
+				# Instances are not inside the bounds of the instancer, so every camera counts them
+				shared.append(get_object_fingerprint(object_eval))
 		
-		# render
-		bpy.ops.render.render(write_still=True)
-					
-		render_progress += 1
+		self.shared_key = hashlib.sha1(repr(shared).encode("utf-8")).hexdigest()
+		self.object_keys = np.array(object_keys)
+		self.boxes = np.array(boxes, dtype=np.float64).reshape(-1, 8, 3)
+
+	def get_camera_key(self, scene, camera, camera_item, output_settings, pass_settings):
+		data = camera.data
+		width, height = camera_item.x_dim, camera_item.y_dim
+		
+		if data.type == 'PANO' or not len(self.object_keys):
+			visible_keys = self.object_keys
+		else:
+			is_perspective = data.type == 'PERSP'
+			frame_corners = get_view_frame(is_perspective, data.lens, data.sensor_width, data.sensor_height, data.sensor_fit, data.ortho_scale, data.shift_x, data.shift_y, width, height)
+			planes = get_frustum_planes(frame_corners, is_perspective, data.clip_start, data.clip_end)
+			visible_keys = self.object_keys[get_boxes_in_frustum(planes, self.boxes, camera.matrix_world.inverted())]
+		
+		key = (
+			self.shared_key,
+			round_matrix(camera.matrix_world),
+			data.type,
+			round(data.lens, 5),
+			round(data.ortho_scale, 5),
+			round(data.shift_x, 5),
+			round(data.shift_y, 5),
+			round(data.sensor_width, 5),
+			round(data.sensor_height, 5),
+			data.sensor_fit,
+			round(data.clip_start, 5),
+			round(data.clip_end, 5),
+			data.dof.use_dof,
+			round(data.dof.focus_distance, 5),
+			round(data.dof.aperture_fstop, 5),
+			data.dof.focus_object.name if data.dof.focus_object else None,
+			width,
+			height,
+			output_settings,
+			pass_settings,
+			tuple(visible_keys.tolist()),
+		)
+		return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+
+class JB_MULTICAM_OT_clear_render_cache(bpy.types.Operator):
+	bl_idname = "render.multicam_clear_render_cache"
+	bl_label = "Clear Render Cache"
+	bl_description = "Forget which cameras are unchanged, so the next batch renders every camera again. The images are kept"
+	
+	def execute(self, context):
+		scene = context.scene
+		removed = 0
+		for directory in {get_output_directory(scene), get_pass_directory(scene, get_output_directory(scene), True)}:
+			try:
+				os.remove(os.path.join(directory, RenderCache.file_name))
+				removed += 1
+			except FileNotFoundError:
+				pass
+		self.report({'INFO'}, "Cleared the render cache" if removed else "The render cache is empty")
+		return {'FINISHED'}
+
+
+@instrumented("render_images")
+def render_images(scene, cameras_to_render, journal=None, is_draft=False, fingerprint=None):
+	
+	# Retain original camera details
+	original_camera = scene.camera
+	original_resolution_x = scene.render.resolution_x
+	original_resolution_y = scene.render.resolution_y
+	original_filepath = scene.render.filepath
+	original_output_settings = get_current_output_settings(scene)
+	original_pass_settings = get_pass_settings(scene)
+			
+	# get output path
+	file_dir = get_pass_directory(scene, get_output_directory(scene), is_draft)
+	
+	if is_draft:
+		apply_pass_settings(scene, get_draft_pass_settings(scene, original_pass_settings))
+	
+	# Renders that finished before the batch was interrupted are skipped.
+	# A journal that is passed in belongs to the caller, who finishes it.
+	owns_journal = journal is None
+	if owns_journal:
+		journal = open_render_journal(scene, file_dir)
+	output_paths = []
+	
+	# Cameras that did not change since their last render are skipped.
+	# A fingerprint that is passed in was read by the caller for this frame.
+	render_cache = open_render_cache(scene, file_dir)
+	if render_cache and fingerprint is None:
+		fingerprint = SceneFingerprint(scene)
+	
+	# Renders are saved as Targa and turned into PNG in the background
+	image_writer = open_image_writer(scene, journal, render_cache)
+	
+	# Cameras sharing the same render settings are rendered back to back
+	cameras_to_render, switches_avoided = schedule_by_render_state(scene, cameras_to_render)
+	
+	# Starting state
+	render_progress = 1 # Yeah, feels right to start on 1.
+	number_of_cameras_to_render = len(cameras_to_render)
+	start_time = time.time()
+	session = begin_render_session(scene, cameras_to_render[0].get_camera() if cameras_to_render else None)
+	
+	# Render each camera with custom resolution, or default resolution if not set.
+	# The session is ended even when a render fails or is cancelled.
+	try:
+		for camera_data in cameras_to_render:
+		
+			camera = camera_data.get_camera()
+			if not camera:
+				print(f"Camera {camera_data.name} not found")
+				continue
+			
+			output_settings = get_output_settings(scene, camera_data)
+			camera_file_path = get_camera_output_path(scene, file_dir, camera_data)
+			output_path = bpy.path.abspath(camera_file_path)
+			written_in_background = image_writer is not None and is_written_in_background(output_settings)
+			if written_in_background:
+				camera_file_path = os.path.join(file_dir, f".{os.path.basename(output_path)}.tga")
+			resolution = (camera_data.x_dim, camera_data.y_dim)
+			output_paths.append(output_path)
+			if journal and journal.is_done(output_path, camera.name, scene.frame_current, resolution):
+				print(f"\nSkipping {render_progress} of {number_of_cameras_to_render}: \"{camera.name}\" was rendered before the batch was interrupted.")
+				render_progress += 1
+				continue
+			
+			cache_key = None
+			if render_cache:
+				cache_key = fingerprint.get_camera_key(scene, camera, camera_data, output_settings, get_pass_settings(scene))
+				if reuse_cached_render(render_cache, output_path, cache_key):
+					print(f"\nSkipping {render_progress} of {number_of_cameras_to_render}: \"{camera.name}\" did not change since its last render.")
+					render_progress += 1
+					continue
+				
+			# set camera as active
+			scene.camera = camera
+			
+			# set resolution, only when it differs as changing it reallocates render buffers
+			set_if_changed(scene.render, "resolution_x", camera_data.x_dim)
+			set_if_changed(scene.render, "resolution_y", camera_data.y_dim)
+			
+			# set output format and path
+			apply_output_settings(scene, output_settings)
+			if written_in_background:
+				scene.render.image_settings.file_format = 'TARGA_RAW'
+			scene.render.filepath = camera_file_path
+			
+			print(f"\nRendering {render_progress} of {number_of_cameras_to_render}: \"{camera.name}\". Interface will become unresponsive.")
+			
+			# render
+			render_started_at = time.time()
+			bpy.ops.render.render(write_still=True, scene=scene.name)
+			profiler.record_render(camera.name, time.time() - render_started_at)
+			
+			if written_in_background:
+				# Recorded in the journal once the PNG is written
+				image_writer.submit(get_still_output_path(scene), output_path, output_settings[2], camera.name, scene.frame_current, resolution, cache_key)
+			else:
+				if journal:
+					journal.record(output_path, camera.name, scene.frame_current, resolution)
+				if render_cache:
+					render_cache.record(output_path, cache_key)
+						
+			render_progress += 1
+	finally:
+		end_render_session(scene, session)
+		
+		if image_writer:
+			for error in image_writer.close():
+				print(f"Failed to write image for {error}")
+		
+		# Restore original camera, resolution and output format, also the Targa
+		# format of the background writer when a render failed
+		apply_output_settings(scene, original_output_settings)
+		apply_pass_settings(scene, original_pass_settings)
+		scene.camera = original_camera
+		set_if_changed(scene.render, "resolution_x", original_resolution_x)
+		set_if_changed(scene.render, "resolution_y", original_resolution_y)
+		scene.render.filepath = original_filepath
 	
 	# Done Rendering
 	
-	# Restore original camera and resolution
-	scene.camera = original_camera
-	scene.render.resolution_x = original_resolution_x
-	scene.render.resolution_y = original_resolution_y
+	if journal and owns_journal:
+		journal.finish(output_paths)
 	
 	# Record the end time
 	end_time = time.time()
 	
 	# Calculate the time taken in seconds
 	time_taken = end_time - start_time
+	print("\nTotal time taken for rendering: ", format_duration(time_taken))
+	
+	switches_feedback = f" ({switches_avoided} render state switches avoided)" if switches_avoided else ""
+	print(f"Render state switches avoided by grouping cameras: {switches_avoided}")
+	
+	rendered = "draft" if is_draft else "camera"
+	if len(cameras_to_render) == 1:
+		return f"Rendered {rendered} to {file_dir}"
+	else:
+		return f"Rendered {number_of_cameras_to_render} {rendered}s to {file_dir}{switches_feedback}"
+
+
+def render_images_in_passes(scene, camera_items):
+	# Renders the drafts of the batch, then the finals, in one session
+	render_passes = get_render_passes(scene, camera_items, lambda camera_item: camera_item.get_camera())
+	session = begin_render_session(scene, render_passes[0][1][0].get_camera() if render_passes else None)
+	try:
+		feedback = [render_images(scene, pass_items, is_draft=is_draft) for is_draft, pass_items in render_passes]
+	finally:
+		end_render_session(scene, session)
+	return "; ".join(feedback) or "Nothing to render"
+	
+
+def get_animation_frame_path(filepath, camera_name, frame):
+	# The output path of a frame of a camera's animation: <output>/<camera>/<frame>
+	return "%s/%s/%03d" % (filepath, camera_name, frame)
+
+
+@instrumented("render_camera_animation")
+def render_camera_animation(scene, camera, camera_item, frames=None, journal=None):
+	# Renders the animation range of the scene (or the given frames) from one camera,
+	# in the custom resolution of the camera if it has one. Frames are saved to
+	# <output>/<camera>/<frame>.
+	original_camera = scene.camera
+	original_resolution_x = scene.render.resolution_x
+	original_resolution_y = scene.render.resolution_y
+	initial_filepath = scene.render.filepath
+	original_output_settings = get_current_output_settings(scene)
+	
+	scene.camera = camera
+	if camera_item is not None:
+		scene.render.resolution_x = camera_item.x_dim
+		scene.render.resolution_y = camera_item.y_dim
+	apply_output_settings(scene, get_output_settings(scene, camera_item))
+	
+	if frames is None:
+		frames = range(scene.frame_start, scene.frame_end + 1, scene.frame_step)
+	
+	owns_journal = journal is None
+	if owns_journal:
+		journal = open_render_journal(scene, get_output_directory(scene))
+	resolution = (scene.render.resolution_x, scene.render.resolution_y)
+	output_paths = []
+	session = begin_render_session(scene, camera)
+	
+	try:
+		for i in frames:
+			scene.render.filepath = get_animation_frame_path(initial_filepath, camera.name, i)
+			output_path = get_still_output_path(scene)
+			output_paths.append(output_path)
+			if journal and journal.is_done(output_path, camera.name, i, resolution):
+				print("Skipping Frame:", i, "on camera:", camera.name, "(rendered before the interruption)")
+				continue
+			
+			print("Rendering Frame:", i, "on camera:", camera.name)
+			scene.frame_set(i)
+			# Preview Sequence switches to the camera of the frame range on a frame change
+			scene.camera = camera
+			render_started_at = time.time()
+			bpy.ops.render.render(write_still=True, scene=scene.name)
+			profiler.record_render(camera.name, time.time() - render_started_at)
+			
+			if journal:
+				journal.record(output_path, camera.name, i, resolution)
+	finally:
+		end_render_session(scene, session)
+		scene.camera = original_camera
+		scene.render.resolution_x = original_resolution_x
+		scene.render.resolution_y = original_resolution_y
+		scene.render.filepath = initial_filepath
+		apply_output_settings(scene, original_output_settings)
+	
+	if journal and owns_journal:
+		journal.finish(output_paths)
+	
+	return f"Rendered {len(frames)} frames of {camera.name}"
+
+
+@instrumented("render_cameras_frame_major")
+def render_cameras_frame_major(scene, camera_items, frames=None, journal=None):
+	# Renders the animation range of the scene (or the given frames) from every
+	# camera, walking the frames once: each frame is evaluated once and rendered
+	# from all cameras, instead of playing the animation again for each camera.
+	# Frames are saved to <output>/<camera>/<frame>, like render_camera_animation.
+	original_camera = scene.camera
+	original_resolution_x = scene.render.resolution_x
+	original_resolution_y = scene.render.resolution_y
+	original_frame_current = scene.frame_current
+	initial_filepath = scene.render.filepath
+	original_output_settings = get_current_output_settings(scene)
+	
+	if frames is None:
+		frames = range(scene.frame_start, scene.frame_end + 1, scene.frame_step)
+	
+	# Cameras sharing the same render settings are rendered back to back on each frame
+	camera_items, switches_avoided = schedule_by_render_state(scene, camera_items)
+	cameras = [(camera_item, camera_item.get_camera()) for camera_item in camera_items]
+	cameras = [(camera_item, camera) for camera_item, camera in cameras if camera is not None]
+	
+	owns_journal = journal is None
+	if owns_journal:
+		journal = open_render_journal(scene, get_output_directory(scene))
+	output_paths = []
+	rendered = 0
+	start_time = time.time()
+	session = begin_render_session(scene, cameras[0][1] if cameras else None)
+	
+	try:
+		for frame in frames:
+			frame_is_set = False
+			for camera_item, camera in cameras:
+				set_if_changed(scene.render, "resolution_x", camera_item.x_dim)
+				set_if_changed(scene.render, "resolution_y", camera_item.y_dim)
+				apply_output_settings(scene, get_output_settings(scene, camera_item))
+				scene.render.filepath = get_animation_frame_path(initial_filepath, camera.name, frame)
+				
+				output_path = get_still_output_path(scene)
+				resolution = (camera_item.x_dim, camera_item.y_dim)
+				output_paths.append(output_path)
+				if journal and journal.is_done(output_path, camera.name, frame, resolution):
+					print("Skipping Frame:", frame, "on camera:", camera.name, "(rendered before the interruption)")
+					continue
+				
+				# The frame is evaluated once, and only when one of its renders is still to do
+				if not frame_is_set:
+					scene.frame_set(frame)
+					frame_is_set = True
+				
+				# After the frame change, as Preview Sequence switches to the camera of the frame range
+				scene.camera = camera
+				
+				print("Rendering Frame:", frame, "on camera:", camera.name)
+				render_started_at = time.time()
+				bpy.ops.render.render(write_still=True, scene=scene.name)
+				profiler.record_render(camera.name, time.time() - render_started_at)
+				rendered += 1
+				
+				if journal:
+					journal.record(output_path, camera.name, frame, resolution)
+	finally:
+		end_render_session(scene, session)
+		scene.frame_set(original_frame_current)
+		scene.camera = original_camera
+		set_if_changed(scene.render, "resolution_x", original_resolution_x)
+		set_if_changed(scene.render, "resolution_y", original_resolution_y)
+		scene.render.filepath = initial_filepath
+		apply_output_settings(scene, original_output_settings)
+	
+	if journal and owns_journal:
+		journal.finish(output_paths)
+	
+	print(f"\nTotal time taken for rendering: {format_duration(time.time() - start_time)}")
+	
+	return f"Rendered {rendered} frames of {len(cameras)} cameras, evaluating each of the {len(frames)} frames once"
+
+
+@instrumented("render_sequence")
+def render_sequence(scene, plan=None, journal=None, is_draft=False):
+	# Renders the multi-camera sequence as one animation render per segment, so
+	# the scene state only changes when the camera does. Each segment is rendered
+	# in the custom resolution of its camera.
+	if plan is None:
+		plan = build_sequence_render_plan(get_frame_range_index(scene), scene.frame_start, scene.frame_end)
+	
+	# Retain original scene details
+	original_camera = scene.camera
+	original_resolution_x = scene.render.resolution_x
+	original_resolution_y = scene.render.resolution_y
+	original_frame_start = scene.frame_start
+	original_frame_end = scene.frame_end
+	original_frame_step = scene.frame_step
+	original_frame_current = scene.frame_current
+	output_path = scene.render.filepath
+	original_output_settings = get_current_output_settings(scene)
+	original_pass_settings = get_pass_settings(scene)
+	pass_output_path = get_pass_filepath(scene, output_path, is_draft)
+	
+	# Frames are numbered by Blender, e.g. <output path>0001.png
+	scene.frame_step = 1
+	
+	if is_draft:
+		apply_pass_settings(scene, get_draft_pass_settings(scene, original_pass_settings))
+	
+	frame_count = sum(end_frame - start_frame + 1 for _, start_frame, end_frame in plan)
+	frames_rendered = 0
+	start_time = time.time()
+	
+	owns_journal = journal is None
+	if owns_journal:
+		journal = open_render_journal(scene, get_output_directory(scene))
+	output_paths = []
+	
+	# Every frame is recorded as soon as it is written, as a crash can happen
+	# halfway through a segment.
+	recording = {}
+	def record_written_frame(scene, depsgraph=None):
+		frame = scene.frame_current
+		journal.record(scene.render.frame_path(frame=frame), recording["camera"], frame, recording["resolution"])
+	
+	if journal:
+		bpy.app.handlers.render_write.append(record_written_frame)
 	
+	session = begin_render_session(scene, plan[0][0] if plan else None)
+	
+	try:
+		for segment_number, (camera, start_frame, end_frame) in enumerate(plan, 1):
+			camera_item = scene.cameras.get(camera.name)
+			
+			scene.camera = camera
+			set_if_changed(scene.render, "resolution_x", camera_item.x_dim if camera_item else original_resolution_x)
+			set_if_changed(scene.render, "resolution_y", camera_item.y_dim if camera_item else original_resolution_y)
+			apply_output_settings(scene, get_output_settings(scene, camera_item))
+			scene.render.filepath = pass_output_path
+			recording["camera"] = camera.name
+			recording["resolution"] = (scene.render.resolution_x, scene.render.resolution_y)
+			
+			# Only the frames that were not rendered before the batch was interrupted
+			pending_frames = []
+			for frame in range(start_frame, end_frame + 1):
+				frame_path = scene.render.frame_path(frame=frame)
+				output_paths.append(frame_path)
+				if not (journal and journal.is_done(frame_path, camera.name, frame, recording["resolution"])):
+					pending_frames.append(frame)
+			
+			percentage_done = (frames_rendered / frame_count) * 100
+			skipped = end_frame - start_frame + 1 - len(pending_frames)
+			skipped_feedback = f" Skipping {skipped} frames rendered before the interruption." if skipped else ""
+			print(f"\nSegment {segment_number} of {len(plan)} — {percentage_done:.1f}% done: Rendering {camera.name}, frames {start_frame}-{end_frame}.{skipped_feedback}\nStarted rendering at {time.strftime('%H:%M:%S', time.localtime())}.")
+			
+			for run_start, run_end in get_contiguous_runs(pending_frames):
+				scene.frame_start = run_start
+				scene.frame_end = run_end
+				render_started_at = time.time()
+				bpy.ops.render.render(animation=True, scene=scene.name)
+				profiler.record_render(camera.name, time.time() - render_started_at)
+			
+			frames_rendered += end_frame - start_frame + 1
+	
+	finally:
+		end_render_session(scene, session)
+		if journal:
+			bpy.app.handlers.render_write.remove(record_written_frame)
+		
+		# Restore original scene details
+		scene.camera = original_camera
+		scene.render.resolution_x = original_resolution_x
+		scene.render.resolution_y = original_resolution_y
+		scene.frame_start = original_frame_start
+		scene.frame_end = original_frame_end
+		scene.frame_step = original_frame_step
+		scene.render.filepath = output_path
+		apply_output_settings(scene, original_output_settings)
+		apply_pass_settings(scene, original_pass_settings)
+		scene.frame_set(original_frame_current)
+	
+	if journal and owns_journal:
+		journal.finish(output_paths)
+	
+	print(f"\nTotal time taken for rendering: {format_duration(time.time() - start_time)}")
+	
+	rendered = "draft frames" if is_draft else "frames"
+	return f"Rendered {frames_rendered} {rendered} in {len(plan)} segments to {bpy.path.abspath(pass_output_path)}"
+
+
+def render_sequence_in_passes(scene):
+	# Renders the drafts of the sequence, then the finals, in one session
+	plan = build_sequence_render_plan(get_frame_range_index(scene), scene.frame_start, scene.frame_end)
+	render_passes = get_render_passes(scene, plan, lambda segment: segment[0])
+	session = begin_render_session(scene, render_passes[0][1][0][0] if render_passes else None)
+	try:
+		feedback = [render_sequence(scene, pass_plan, is_draft=is_draft) for is_draft, pass_plan in render_passes]
+	finally:
+		end_render_session(scene, session)
+	return "; ".join(feedback) or "Nothing to render"
+
+
+def format_duration(time_taken):
 	# Convert the time taken to hours, minutes, and seconds
 	hours, rem = divmod(time_taken, 3600)
 	minutes, seconds = divmod(rem, 60)
 	
 	# Display the time taken in hours, minutes, and seconds format
-	formatted_time = "{:0>2}:{:0>2}:{:05.2f}".format(int(hours), int(minutes), seconds)
-	print("\nTotal time taken for rendering: ", formatted_time)
+	return "{:0>2}:{:0>2}:{:05.2f}".format(int(hours), int(minutes), seconds)
+
+
+# RENDER QUEUE
+#
+# Renders the batch one item at a time from a modal operator, so Blender stays
+# responsive. Each item is started as a regular (non-blocking) render, and the
+# render_complete and render_cancel handlers tell the queue when it is done.
+# Finished items are recorded in the render journal, so nothing is lost when
+# the queue is cancelled.
+
+class RenderQueueItem:
+	def __init__(self, camera_name, resolution, filepath, output_settings, frame_start=None, frame_end=None, is_draft=False, frame=None):
+		self.camera_name = camera_name
+		self.resolution = resolution
+		self.filepath = filepath
+		self.output_settings = output_settings
+		self.is_draft = is_draft
+		
+		# A still is rendered at its frame, or the current frame when it has none.
+		# An animation is rendered from start to end.
+		self.frame = frame
+		self.frame_start = frame_start
+		self.frame_end = frame_end
+		
+		# One of QUEUED, RENDERING, DONE, SKIPPED, CANCELLED or FAILED
+		self.state = 'QUEUED'
+		self.duration = None
+		
+		# The render cache key of a still, see RenderCache
+		self.cache_key = None
+		
+		# The files the item writes, finished in the journal once the queue completes
+		self.output_paths = []
+		
+	@property
+	def is_animation(self):
+		return self.frame_start is not None
 	
-	if len(cameras_to_render) == 1:
-		return f"Rendered camera to {file_dir}"
+	@property
+	def label(self):
+		label = self.camera_name
+		if self.is_animation:
+			label += f" ({self.frame_start}-{self.frame_end})"
+		elif self.frame is not None:
+			label += f" (frame {self.frame})"
+		if self.is_draft:
+			label += " (draft)"
+		return label
+
+
+class RenderQueue:
+	def __init__(self):
+		self.items = []
+		self.scene_name = None
+		self.journal = None
+		self.render_cache = None
+		self.session = None
+		self.original_state = None
+		self.active_item = None
+		self.started_at = None
+		
+		# Render state switches saved by grouping the cameras, for the report
+		self.switches_avoided = 0
+		
+		self.is_running = False
+		self.is_paused = False
+		self.cancel_requested = False
+		
+		# Set by the render handlers, read on the next timer tick
+		self.render_outcome = None
+	
+	def start(self, scene, items, journal, render_cache=None, switches_avoided=0):
+		self.items = items
+		self.scene_name = scene.name
+		self.journal = journal
+		self.render_cache = render_cache
+		self.switches_avoided = switches_avoided
+		self.original_state = get_render_state(scene)
+		first_item = next((item for item in items if item.state == 'QUEUED'), None)
+		self.session = begin_render_session(scene, bpy.data.objects.get(first_item.camera_name) if first_item else None)
+		self.active_item = None
+		self.is_running = True
+		self.is_paused = False
+		self.cancel_requested = False
+		self.render_outcome = None
+	
+	def count(self, *states):
+		return sum(1 for item in self.items if item.state in states)
+	
+	def tick(self, context):
+		# Advances the queue, returns False once it is done
+		scene = bpy.data.scenes.get(self.scene_name)
+		if scene is None:
+			self.cancel_requested = True
+		
+		if self.active_item is not None:
+			if self.render_outcome is None:
+				# Still rendering
+				return True
+			self.finish_active_item(scene)
+		
+		if self.cancel_requested:
+			for item in self.items:
+				if item.state == 'QUEUED':
+					item.state = 'CANCELLED'
+			return False
+		
+		if self.is_paused:
+			return True
+		
+		item = next((item for item in self.items if item.state == 'QUEUED'), None)
+		if item is None:
+			return False
+		
+		self.start_item(context, scene, item)
+		return True
+	
+	def start_item(self, context, scene, item):
+		camera = bpy.data.objects.get(item.camera_name)
+		if camera is None:
+			item.state = 'FAILED'
+			return
+		
+		if item.frame is not None and scene.frame_current != item.frame:
+			# Frame-major items share the frame, so it is only evaluated when it changes.
+			# Before the camera is set, as Preview Sequence switches cameras on a frame change.
+			scene.frame_set(item.frame)
+		scene.camera = camera
+		set_if_changed(scene.render, "resolution_x", item.resolution[0])
+		set_if_changed(scene.render, "resolution_y", item.resolution[1])
+		apply_output_settings(scene, item.output_settings)
+		final_settings = self.original_state["pass_settings"]
+		apply_pass_settings(scene, get_draft_pass_settings(scene, final_settings) if item.is_draft else final_settings)
+		scene.render.filepath = item.filepath
+		if item.is_animation:
+			scene.frame_start = item.frame_start
+			scene.frame_end = item.frame_end
+			scene.frame_step = 1
+		
+		self.active_item = item
+		self.render_outcome = None
+		self.started_at = time.time()
+		item.state = 'RENDERING'
+		print(f"\nRendering {self.count('DONE', 'SKIPPED', 'FAILED', 'CANCELLED') + 1} of {len(self.items)}: \"{item.label}\".")
+		
+		if item.is_animation:
+			result = bpy.ops.render.render('INVOKE_DEFAULT', animation=True, scene=scene.name)
+		else:
+			result = bpy.ops.render.render('INVOKE_DEFAULT', write_still=True, scene=scene.name)
+		
+		if 'CANCELLED' in result:
+			# Another render is still running, try again on the next tick
+			item.state = 'QUEUED'
+			self.active_item = None
+	
+	def finish_active_item(self, scene):
+		item = self.active_item
+		item.duration = time.time() - self.started_at
+		profiler.record_render(item.camera_name, item.duration)
+		if self.render_outcome == 'COMPLETE':
+			item.state = 'DONE'
+			if self.journal and not item.is_animation and scene is not None:
+				self.journal.record(get_still_output_path(scene), item.camera_name, scene.frame_current, item.resolution)
+			if self.render_cache and item.cache_key and scene is not None:
+				self.render_cache.record(get_still_output_path(scene), item.cache_key)
+		else:
+			# Cancelling the render (Esc) cancels the queue
+			item.state = 'CANCELLED'
+			self.cancel_requested = True
+		self.active_item = None
+		self.render_outcome = None
+	
+	def stop(self):
+		scene = bpy.data.scenes.get(self.scene_name)
+		if scene is not None:
+			end_render_session(scene, self.session)
+			set_render_state(scene, self.original_state)
+		self.session = None
+		
+		# The journal is only needed to resume a queue that did not complete. Only the
+		# entries of this queue are finished, another interrupted batch may share the folder.
+		if self.journal and all(item.state in {'DONE', 'SKIPPED'} for item in self.items):
+			self.journal.finish([output_path for item in self.items for output_path in item.output_paths])
+		self.journal = None
+		self.render_cache = None
+		self.is_running = False
+		
+		done = self.count('DONE')
+		switches_feedback = f" ({self.switches_avoided} render state switches avoided)" if self.switches_avoided else ""
+		print(f"\nRender queue finished: {done} of {len(self.items)} rendered{switches_feedback}.")
+	
+	def abandon(self):
+		# Loading a file ends the modal operator without it finishing the queue. The
+		# scene the queue rendered is gone, so nothing is restored; the journal on
+		# disk still lets the batch resume when the file is opened again.
+		end_render_session(None, self.session)
+		for item in self.items:
+			if item.state in {'QUEUED', 'RENDERING'}:
+				item.state = 'CANCELLED'
+		self.session = None
+		self.journal = None
+		self.render_cache = None
+		self.active_item = None
+		self.render_outcome = None
+		self.is_running = False
+		self.is_paused = False
+		self.cancel_requested = False
+	
+	def move(self, index, offset):
+		# Reorders a queued item, items that started keep their place
+		other = index + offset
+		if 0 <= index < len(self.items) and 0 <= other < len(self.items):
+			if self.items[index].state == 'QUEUED' and self.items[other].state == 'QUEUED':
+				self.items[index], self.items[other] = self.items[other], self.items[index]
+
+
+render_queue = RenderQueue()
+
+
+def get_render_state(scene):
+	return {
+		"camera": scene.camera,
+		"resolution_x": scene.render.resolution_x,
+		"resolution_y": scene.render.resolution_y,
+		"filepath": scene.render.filepath,
+		"frame_start": scene.frame_start,
+		"frame_end": scene.frame_end,
+		"frame_step": scene.frame_step,
+		"frame_current": scene.frame_current,
+		"output_settings": get_current_output_settings(scene),
+		"pass_settings": get_pass_settings(scene),
+	}
+
+
+def set_render_state(scene, state):
+	# The frame first, as Preview Sequence switches cameras on a frame change
+	if scene.frame_current != state["frame_current"]:
+		scene.frame_set(state["frame_current"])
+	scene.camera = state["camera"]
+	set_if_changed(scene.render, "resolution_x", state["resolution_x"])
+	set_if_changed(scene.render, "resolution_y", state["resolution_y"])
+	scene.render.filepath = state["filepath"]
+	scene.frame_start = state["frame_start"]
+	scene.frame_end = state["frame_end"]
+	scene.frame_step = state["frame_step"]
+	apply_output_settings(scene, state["output_settings"])
+	apply_pass_settings(scene, state["pass_settings"])
+
+
+@persistent
+def on_queued_render_complete(scene, depsgraph=None):
+	render_queue.render_outcome = 'COMPLETE'
+
+
+@persistent
+def on_queued_render_cancel(scene, depsgraph=None):
+	render_queue.render_outcome = 'CANCEL'
+
+
+@persistent
+def on_queued_render_write(scene, depsgraph=None):
+	# Records every frame of an animation as soon as it is written
+	item = render_queue.active_item
+	if render_queue.journal and item is not None and item.is_animation:
+		frame = scene.frame_current
+		render_queue.journal.record(scene.render.frame_path(frame=frame), item.camera_name, frame, item.resolution)
+
+
+def get_queue_handlers():
+	return (
+		(bpy.app.handlers.render_complete, on_queued_render_complete),
+		(bpy.app.handlers.render_cancel, on_queued_render_cancel),
+		(bpy.app.handlers.render_write, on_queued_render_write),
+	)
+
+
+def add_queue_handlers():
+	for handlers, handler in get_queue_handlers():
+		if handler not in handlers:
+			handlers.append(handler)
+
+
+def remove_queue_handlers():
+	# The handlers are persistent, so they are removed explicitly, also when the
+	# operator that added them was ended by loading a file
+	for handlers, handler in get_queue_handlers():
+		if handler in handlers:
+			handlers.remove(handler)
+
+
+def stop_abandoned_render_queue():
+	remove_queue_handlers()
+	if render_queue.is_running:
+		render_queue.abandon()
+
+
+def plan_still_queue(scene, camera_items):
+	file_dir = get_output_directory(scene)
+	journal = open_render_journal(scene, file_dir)
+	render_cache = open_render_cache(scene, file_dir)
+	fingerprint = SceneFingerprint(scene) if render_cache else None
+	final_settings = get_pass_settings(scene)
+	
+	items = []
+	switches_avoided = 0
+	for is_draft, pass_items in get_render_passes(scene, camera_items, lambda camera_item: camera_item.get_camera()):
+		pass_dir = get_pass_directory(scene, file_dir, is_draft)
+		
+		# Cameras sharing the same render settings are rendered back to back
+		pass_items, pass_switches_avoided = schedule_by_render_state(scene, pass_items)
+		switches_avoided += pass_switches_avoided
+		print(f"Render state switches avoided by grouping cameras: {pass_switches_avoided}")
+		
+		for camera_item in pass_items:
+			resolution = (camera_item.x_dim, camera_item.y_dim)
+			filepath = get_camera_output_path(scene, pass_dir, camera_item)
+			output_settings = get_output_settings(scene, camera_item)
+			item = RenderQueueItem(camera_item.name, resolution, filepath, output_settings, is_draft=is_draft)
+			output_path = bpy.path.abspath(filepath)
+			item.output_paths.append(output_path)
+			if journal and journal.is_done(output_path, camera_item.name, scene.frame_current, resolution):
+				item.state = 'SKIPPED'
+			elif render_cache and camera_item.get_camera() is not None:
+				pass_settings = get_draft_pass_settings(scene, final_settings) if is_draft else final_settings
+				item.cache_key = fingerprint.get_camera_key(scene, camera_item.get_camera(), camera_item, output_settings, pass_settings)
+				if reuse_cached_render(render_cache, output_path, item.cache_key):
+					item.state = 'SKIPPED'
+			items.append(item)
+	return items, journal, render_cache, switches_avoided
+
+
+def plan_sequence_queue(scene):
+	# One item per run of frames that still need rendering in each segment
+	output_path = scene.render.filepath
+	journal = open_render_journal(scene, get_output_directory(scene))
+	plan = build_sequence_render_plan(get_frame_range_index(scene), scene.frame_start, scene.frame_end)
+	items = []
+	try:
+		for is_draft, pass_plan in get_render_passes(scene, plan, lambda segment: segment[0]):
+			# The frame paths are those of the pass
+			pass_output_path = get_pass_filepath(scene, output_path, is_draft)
+			scene.render.filepath = pass_output_path
+			for camera, start_frame, end_frame in pass_plan:
+				camera_item = scene.cameras.get(camera.name)
+				resolution = (camera_item.x_dim, camera_item.y_dim) if camera_item else (scene.render.resolution_x, scene.render.resolution_y)
+				output_settings = get_output_settings(scene, camera_item)
+				frame_paths = {frame: get_frame_output_path(scene, frame, output_settings) for frame in range(start_frame, end_frame + 1)}
+				done_frames = [frame for frame, frame_path in frame_paths.items() if journal and journal.is_done(frame_path, camera.name, frame, resolution)]
+				pending_frames = [frame for frame in frame_paths if frame not in set(done_frames)]
+				
+				# The frames that are done are listed as skipped, so their journal entries are finished with the rest
+				segment_items = []
+				for frames, state in ((pending_frames, 'QUEUED'), (done_frames, 'SKIPPED')):
+					for run_start, run_end in get_contiguous_runs(frames):
+						item = RenderQueueItem(camera.name, resolution, pass_output_path, output_settings, run_start, run_end, is_draft)
+						item.state = state
+						item.output_paths = [frame_paths[frame] for frame in range(run_start, run_end + 1)]
+						segment_items.append(item)
+				items.extend(sorted(segment_items, key=lambda item: item.frame_start))
+	finally:
+		scene.render.filepath = output_path
+	return items, journal, None, 0
+
+
+def plan_frame_major_queue(scene, camera_items):
+	# One still per camera and frame, ordered by frame, so each frame is only
+	# evaluated once however many cameras render it
+	journal = open_render_journal(scene, get_output_directory(scene))
+	camera_items, switches_avoided = schedule_by_render_state(scene, camera_items)
+	items = []
+	for frame in range(scene.frame_start, scene.frame_end + 1, scene.frame_step):
+		for camera_item in camera_items:
+			resolution = (camera_item.x_dim, camera_item.y_dim)
+			output_settings = get_output_settings(scene, camera_item)
+			filepath = get_animation_frame_path(scene.render.filepath, camera_item.name, frame)
+			item = RenderQueueItem(camera_item.name, resolution, filepath, output_settings, frame=frame)
+			output_path = bpy.path.abspath(filepath)
+			if scene.render.use_file_extension:
+				output_path = ensure_extension(output_path, get_image_extension(output_settings[0]))
+			item.output_paths.append(output_path)
+			if journal and journal.is_done(output_path, camera_item.name, frame, resolution):
+				item.state = 'SKIPPED'
+			items.append(item)
+	return items, journal, None, switches_avoided
+
+
+def start_render_queue(operator, scene, plan):
+	items, journal, render_cache, switches_avoided = plan
+	if render_queue.is_running:
+		operator.report({'WARNING'}, "Wait for the render queue to finish, or cancel it")
+		return {'CANCELLED'}
+	if not items:
+		operator.report({'WARNING'}, "Nothing to render")
+		return {'CANCELLED'}
+	
+	render_queue.start(scene, items, journal, render_cache, switches_avoided)
+	bpy.ops.render.multicam_render_queue('INVOKE_DEFAULT')
+	return {'FINISHED'}
+
+
+def draw_render_queue(layout):
+	box = layout.box()
+	
+	row = box.row(align=True)
+	finished = render_queue.count('DONE', 'SKIPPED', 'FAILED', 'CANCELLED')
+	if render_queue.is_running:
+		state = "Paused" if render_queue.is_paused else "Rendering"
+		row.label(text=f"{state}: {finished} of {len(render_queue.items)} done", icon='RENDER_STILL')
+		row.operator("render.multicam_render_queue_pause", text="", icon='PLAY' if render_queue.is_paused else 'PAUSE')
+		row.operator("render.multicam_render_queue_cancel", text="", icon='CANCEL')
 	else:
-		return f"Rendered {number_of_cameras_to_render} cameras to {file_dir}"
+		row.label(text=f"Rendered {render_queue.count('DONE')} of {len(render_queue.items)}", icon='CHECKMARK')
+		row.operator("render.multicam_render_queue_clear", text="", icon='X')
+		if render_queue.switches_avoided:
+			box.label(text=f"{render_queue.switches_avoided} render state switches avoided")
+	
+	state_icons = {
+		'QUEUED': 'TIME',
+		'RENDERING': 'RENDER_STILL',
+		'DONE': 'CHECKMARK',
+		'SKIPPED': 'CHECKMARK',
+		'CANCELLED': 'CANCEL',
+		'FAILED': 'ERROR',
+	}
+	
+	col = box.column(align=True)
+	for index, item in enumerate(render_queue.items):
+		row = col.row(align=True)
+		row.label(text=item.label, icon=state_icons[item.state])
+		if item.duration is not None:
+			row.label(text=format_duration(item.duration))
+		elif item.state == 'SKIPPED':
+			row.label(text="Done before")
+		if item.state == 'QUEUED' and render_queue.is_running:
+			move_up = row.operator("render.multicam_render_queue_move", text="", icon='TRIA_UP', emboss=False)
+			move_up.index = index
+			move_up.offset = -1
+			move_down = row.operator("render.multicam_render_queue_move", text="", icon='TRIA_DOWN', emboss=False)
+			move_down.index = index
+			move_down.offset = 1
+
+
+class JB_MULTICAM_OT_render_queue(bpy.types.Operator):
+	bl_idname = "render.multicam_render_queue"
+	bl_label = "Render Queue"
+	bl_description = "Renders the queued cameras one at a time while the interface stays responsive"
+	
+	_timer = None
+	
+	def invoke(self, context, event):
+		add_queue_handlers()
+		
+		self._timer = context.window_manager.event_timer_add(0.25, window=context.window)
+		context.window_manager.modal_handler_add(self)
+		return {'RUNNING_MODAL'}
+	
+	@instrumented("render.multicam_render_queue")
+	def modal(self, context, event):
+		if event.type != 'TIMER':
+			return {'PASS_THROUGH'}
+		
+		is_running = render_queue.tick(context)
+		
+		for area in context.screen.areas:
+			if area.type == 'VIEW_3D':
+				area.tag_redraw()
+		
+		if not is_running:
+			self.finish(context)
+			return {'FINISHED'}
+		return {'PASS_THROUGH'}
+	
+	def finish(self, context):
+		context.window_manager.event_timer_remove(self._timer)
+		remove_queue_handlers()
+		render_queue.stop()
+
+
+class JB_MULTICAM_OT_render_queue_pause(bpy.types.Operator):
+	bl_idname = "render.multicam_render_queue_pause"
+	bl_label = "Pause Render Queue"
+	bl_description = "Pauses the queue after the current render, or resumes it"
+	
+	def execute(self, context):
+		render_queue.is_paused = not render_queue.is_paused
+		return {'FINISHED'}
+
+
+class JB_MULTICAM_OT_render_queue_cancel(bpy.types.Operator):
+	bl_idname = "render.multicam_render_queue_cancel"
+	bl_label = "Cancel Render Queue"
+	bl_description = "Stops the queue after the current render (press Esc in the render window to stop that too). Finished renders are kept"
+	
+	def execute(self, context):
+		render_queue.cancel_requested = True
+		return {'FINISHED'}
+
+
+class JB_MULTICAM_OT_render_queue_move(bpy.types.Operator):
+	bl_idname = "render.multicam_render_queue_move"
+	bl_label = "Move in Render Queue"
+	bl_description = "Renders this camera earlier or later"
+	
+	index: bpy.props.IntProperty()
+	offset: bpy.props.IntProperty()
+	
+	def execute(self, context):
+		render_queue.move(self.index, self.offset)
+		return {'FINISHED'}
+
+
+class JB_MULTICAM_OT_render_queue_clear(bpy.types.Operator):
+	bl_idname = "render.multicam_render_queue_clear"
+	bl_label = "Clear Render Queue"
+	bl_description = "Removes the finished render queue from the panel"
+	
+	def execute(self, context):
+		if not render_queue.is_running:
+			render_queue.items = []
+		return {'FINISHED'}
+
+
+# CAMERA PREVIEWS
+#
+# Small, quick renders of every camera, shown in the camera list to check the
+# framing of all cameras at a glance. Each preview is saved in a cache folder under
+# a key made from everything that changes what the camera sees of the scene: its
+# transform, lens, resolution and the frame. Building the previews again only
+# renders the cameras whose key has no file yet.
+
+# The previews loaded in Blender, keyed by their cache key
+camera_previews = None
+
+# The cache key of the preview of each camera, keyed by camera pointer
+camera_preview_keys = {}
+
+# Longest side of a preview in pixels
+preview_size = 128
+
+
+def get_preview_directory(scene):
+	# In the Blender user folder rather than next to the .blend file, so previews
+	# do not end up in project folders or version control, and survive restarts.
+	# Each scene of each .blend file has a folder of its own, as pruning removes
+	# every preview that is not of a camera in the scene.
+	scene_key = hashlib.sha1(scene.name.encode("utf-8")).hexdigest()[:16]
+	if not bpy.data.filepath:
+		return os.path.join(bpy.app.tempdir, "multicam_previews", scene_key)
+	file_key = hashlib.sha1(bpy.data.filepath.encode("utf-8")).hexdigest()[:16]
+	return bpy.utils.user_resource('DATAFILES', path=os.path.join("multicam_previews", file_key, scene_key))
+
+
+def prune_previews(directory, keys):
+	# Removes the previews of cameras that have since moved or changed
+	removed = 0
+	for file_name in os.listdir(directory):
+		key, extension = os.path.splitext(file_name)
+		if extension == ".png" and key not in keys:
+			try:
+				os.remove(os.path.join(directory, file_name))
+				removed += 1
+			except OSError:
+				pass
+	return removed
+
+
+def get_preview_key(scene, camera, camera_item, engine):
+	data = camera.data
+	key = (
+		tuple(round(value, 5) for row in camera.matrix_world for value in row),
+		data.type,
+		round(data.angle, 6),
+		round(data.ortho_scale, 6),
+		round(data.shift_x, 6),
+		round(data.shift_y, 6),
+		round(data.clip_start, 6),
+		round(data.clip_end, 6),
+		data.sensor_fit,
+		camera_item.x_dim,
+		camera_item.y_dim,
+		scene.frame_current,
+		engine,
+	)
+	return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+
+def get_preview_resolution(width, height):
+	# The resolution of the camera scaled down to fit preview_size
+	scale = min(1, preview_size / max(width, height))
+	return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def get_camera_preview_icon(camera):
+	# The icon of the camera's preview, or 0 when there is none
+	key = camera_preview_keys.get(camera.as_pointer())
+	if camera_previews is None or key is None or key not in camera_previews:
+		return 0
+	return camera_previews[key].icon_id
+
+
+def load_camera_preview(camera, key, path):
+	if key not in camera_previews:
+		camera_previews.load(key, path, 'IMAGE')
+	camera_preview_keys[camera.as_pointer()] = key
+
+
+class JB_MULTICAM_OT_build_previews(bpy.types.Operator):
+	bl_idname = "camera.multicam_build_previews"
+	bl_label = "Build Previews"
+	bl_description = "Render a small preview of every camera in the list. Cameras that did not change since their last preview are not rendered again"
 	
+	engine: bpy.props.EnumProperty(
+		name="Engine",
+		items=(
+			('BLENDER_WORKBENCH', "Workbench", "Solid shading, quickest"),
+			('BLENDER_EEVEE', "Eevee", "Materials and lights, one sample"),
+		),
+		default='BLENDER_WORKBENCH',
+	)
+	
+	@instrumented("camera.multicam_build_previews")
+	def execute(self, context):
+		scene = context.scene
+		directory = get_preview_directory(scene)
+		os.makedirs(directory, exist_ok=True)
+		
+		# Everything changed below, to restore it afterwards
+		original_state = get_render_state(scene)
+		original_engine = scene.render.engine
+		original_eevee_samples = scene.eevee.taa_render_samples
+		
+		rendered = 0
+		cached = 0
+		keys = set()
+		window_manager = context.window_manager
+		window_manager.progress_begin(0, len(scene.cameras))
+		try:
+			set_if_changed(scene.render, "engine", self.engine)
+			if self.engine == 'BLENDER_EEVEE':
+				scene.eevee.taa_render_samples = 1
+			set_if_changed(scene.render, "resolution_percentage", 100)
+			apply_output_settings(scene, ('PNG', '8', 0, None))
+			
+			for progress, camera_item in enumerate(scene.cameras):
+				window_manager.progress_update(progress)
+				camera = camera_item.get_camera()
+				if camera is None or camera.type != 'CAMERA':
+					continue
+				
+				key = get_preview_key(scene, camera, camera_item, self.engine)
+				keys.add(key)
+				path = os.path.join(directory, key + ".png")
+				if os.path.exists(path):
+					cached += 1
+				else:
+					width, height = get_preview_resolution(camera_item.x_dim, camera_item.y_dim)
+					scene.camera = camera
+					set_if_changed(scene.render, "resolution_x", width)
+					set_if_changed(scene.render, "resolution_y", height)
+					scene.render.filepath = path
+					bpy.ops.render.render(write_still=True, scene=scene.name)
+					rendered += 1
+				
+				load_camera_preview(camera, key, path)
+		finally:
+			set_render_state(scene, original_state)
+			set_if_changed(scene.render, "engine", original_engine)
+			set_if_changed(scene.eevee, "taa_render_samples", original_eevee_samples)
+			window_manager.progress_end()
+		
+		removed = prune_previews(directory, keys)
+		
+		scene.show_camera_previews = True
+		removed_feedback = f", {removed} outdated removed" if removed else ""
+		self.report({'INFO'}, f"Rendered {rendered} previews, {cached} were up to date{removed_feedback}")
+		return {'FINISHED'}
+
 
 def get_selected_camera_count():
-	selected_camera_items = [camera_item for camera_item in bpy.context.scene.cameras if camera_item.selected_for_rendering]
-	camera_count = len(selected_camera_items)
+	camera_count = get_camera_list_cache(bpy.context.scene).selected_count
 	return f"Render {camera_count}"
 
 
 # Frame change handler to update active camera during animation playback
 @persistent
+@instrumented("update_active_camera")
 def update_active_camera(scene, dummy):
 	if scene.is_previewing_animation:
-		frame = scene.frame_current
-
-		# Check if the current frame is within the frame range of any camera
-		for camera, start_frame, end_frame in scene.cameras_with_frame_range:
-			if start_frame <= frame <= end_frame:
-				scene.camera = camera
-				break
+		# Look up the camera whose frame range contains the current frame
+		camera = get_frame_range_index(scene).camera_at(scene.frame_current)
+		if camera is not None and scene.camera != camera:
+			scene.camera = camera
 
 
 bpy.app.handlers.frame_change_pre.append(update_active_camera)
@@ -1078,14 +3818,279 @@ def update_ui_if_needed(context):
 
 
 
+class CameraListCache:
+	# What the panel and operators would otherwise count or search for by walking
+	# the whole camera list on every redraw: the row of each camera name, and the
+	# number of cameras selected for rendering. Built when first needed, dropped
+	# when rows are added, removed or renamed, and on undo and file load. The
+	# selected count follows the checkboxes as they are toggled, and the cameras
+	# the depsgraph reports as updated, see update_selected_count.
+
+	def __init__(self, scene):
+		self.rows = {item.name: row for row, item in enumerate(scene.cameras)}
+		# Camera pointer -> selected state the count was made with
+		self.selected = {}
+		for item in scene.cameras:
+			camera = item.get_camera()
+			if camera is not None:
+				self.selected[camera.as_pointer()] = item.selected_for_rendering
+		self.selected_count = sum(1 for item in scene.cameras if item.selected_for_rendering)
+
+	def set_selected(self, camera, selected):
+		pointer = camera.as_pointer()
+		was_selected = self.selected.get(pointer)
+		if was_selected is not None and was_selected != selected:
+			self.selected_count += 1 if selected else -1
+		self.selected[pointer] = selected
+
+
+def get_camera_list_cache(scene):
+	cache = camera_list_caches.get(scene.as_pointer())
+	if cache is None:
+		cache = camera_list_caches[scene.as_pointer()] = CameraListCache(scene)
+	return cache
+
+
+def invalidate_camera_list_cache(scene):
+	camera_list_caches.pop(scene.as_pointer(), None)
+
+
+def get_camera_row(scene, camera_name):
+	# The row of the camera in the list, or -1
+	row = get_camera_list_cache(scene).rows.get(camera_name, -1)
+	if row >= len(scene.cameras) or (row >= 0 and scene.cameras[row].name != camera_name):
+		# The list changed without passing through the sync
+		invalidate_camera_list_cache(scene)
+		row = get_camera_list_cache(scene).rows.get(camera_name, -1)
+	return row
+
+
 @persistent
+@instrumented("populate_camera_list")
 def populate_camera_list(scene, depsgraph=None):
+	# Full rebuild of the camera list. This walks every object in the scene, so it
+	# is only used when the list is refreshed manually or the index is missing;
+	# depsgraph updates go through sync_camera_list instead.
+	highlighted_camera_name = get_highlighted_camera_name(scene)
+
+	index = {}
 	scene.cameras.clear()
 	for obj in scene.objects:
 		if obj.type == 'CAMERA':
 			item = scene.cameras.add()
 			item.name = obj.name
+			item.camera = obj
+			index[obj.as_pointer()] = obj.name
+
+	camera_list_indices[scene.as_pointer()] = index
+	invalidate_camera_list_cache(scene)
+	restore_highlighted_camera(scene, highlighted_camera_name)
+
+
+def sync_camera_list(scene, depsgraph=None):
+	# Applies the cameras added, removed and renamed since the last update to the
+	# camera list, so the cost follows what changed rather than the size of the scene.
+	# Renames in the interface arrive through msgbus as well, see
+	# update_renamed_camera_items, but msgbus misses renames made by scripts.
+	index = camera_list_indices.get(scene.as_pointer())
+	if index is None or depsgraph is None:
+		populate_camera_list(scene)
+		return
+
+	highlighted_camera_name = get_highlighted_camera_name(scene)
+	membership_changed = False
+	renamed = False
+
+	for update in depsgraph.updates:
+		updated_id = update.id.original
+
+		if isinstance(updated_id, bpy.types.Object):
+			if updated_id.type != 'CAMERA':
+				continue
+
+			pointer = updated_id.as_pointer()
+			known_name = index.get(pointer)
+			if known_name is None:
+				# A camera we have not seen before
+				item = scene.cameras.add()
+				item.name = updated_id.name
+				item.camera = updated_id
+				index[pointer] = updated_id.name
+				invalidate_camera_list_cache(scene)
+				update_frame_range_schedule(scene, [updated_id])
+			elif known_name != updated_id.name:
+				# Renamed without msgbus noticing
+				renamed = True
+
+		elif isinstance(updated_id, (bpy.types.Collection, bpy.types.Scene)):
+			membership_changed = True
+
+	if membership_changed or renamed:
+		# Objects were renamed, unlinked or deleted. Only the indexed cameras are checked.
+		update_renamed_camera_items(scene, restore_highlight=False)
+	if renamed:
+		update_renamed_frame_ranges(scene)
+
+	restore_highlighted_camera(scene, highlighted_camera_name)
+
+
+def update_selected_count(scene, depsgraph):
+	# The checkbox of a camera is its use_camera property, which can also be edited
+	# in the Object Properties or by scripts. Only the updated cameras are read.
+	cache = camera_list_caches.get(scene.as_pointer())
+	if cache is None:
+		return
+	for update in depsgraph.updates:
+		updated_id = update.id.original
+		if isinstance(updated_id, bpy.types.Object) and updated_id.type == 'CAMERA':
+			cache.set_selected(updated_id, bool(updated_id.get("use_camera", True)))
+
+
+def resolve_indexed_cameras(scene, names):
+	# Maps each indexed camera pointer to its object, or None when the camera was
+	# deleted or unlinked from the scene. An object reference kept across updates
+	# can point at freed memory, so the objects are looked up again every time:
+	# by name, and when the name no longer leads to the same object, by pointer
+	# among the cameras of the scene, which are only walked when that happens.
+	resolved = {}
+	scene_cameras = None
+	for pointer, name in names.items():
+		camera = scene.objects.get(name)
+		if camera is None or camera.as_pointer() != pointer:
+			if scene_cameras is None:
+				scene_cameras = {obj.as_pointer(): obj for obj in scene.objects if obj.type == 'CAMERA'}
+			camera = scene_cameras.get(pointer)
+		resolved[pointer] = camera
+	return resolved
+
+
+def update_renamed_camera_items(scene, restore_highlight=True):
+	# Renames the items of renamed cameras and removes the items of deleted ones,
+	# by comparing each indexed camera with the name it was listed under
+	index = camera_list_indices.get(scene.as_pointer())
+	if not index:
+		return
 	
+	highlighted_camera_name = get_highlighted_camera_name(scene)
+	removed_pointers = []
+	for pointer, camera in resolve_indexed_cameras(scene, index).items():
+		name = index[pointer]
+		camera_name = camera.name if camera is not None else None
+		if camera_name == name:
+			continue
+		
+		invalidate_camera_list_cache(scene)
+		row = scene.cameras.find(name)
+		if camera_name is None:
+			# The camera was deleted
+			if row >= 0:
+				scene.cameras.remove(row)
+			del index[pointer]
+			removed_pointers.append(pointer)
+		else:
+			if row >= 0:
+				scene.cameras[row].name = camera_name
+			index[pointer] = camera_name
+			if highlighted_camera_name == name:
+				highlighted_camera_name = camera_name
+	
+	if removed_pointers:
+		update_frame_range_schedule(scene, removed_pointers=removed_pointers)
+	if restore_highlight:
+		restore_highlighted_camera(scene, highlighted_camera_name)
+
+
+@persistent
+def reset_pointer_caches(scene, depsgraph=None):
+	# Loading a file and undo/redo replace every datablock, so the object pointers
+	# in the camera list index, the frame range indices and the render border
+	# signature are stale. They are rebuilt the next time they are needed.
+	global render_border_signature
+	camera_list_indices.clear()
+	camera_list_caches.clear()
+	camera_preview_keys.clear()
+	frame_range_indices.clear()
+	frame_range_names.clear()
+	visibility_engine.invalidate()
+	render_border_signature = None
+
+
+@persistent
+def restore_after_load(dummy=None, depsgraph=None):
+	# Loading a file drops the msgbus subscriptions, and the frame range indices
+	# are restored from the schedules stored in the file. It also ends the modal
+	# operator of a running render queue.
+	stop_abandoned_render_queue()
+	subscribe_to_property_changes()
+	for scene in bpy.data.scenes:
+		load_frame_range_index(scene)
+	refresh_render_border(bpy.context.scene)
+
+
+def subscribe_to_property_changes():
+	bpy.msgbus.clear_by_owner(msgbus_owner)
+	
+	# A rename does not say which object it was, the names in the camera list
+	# and the frame range schedules are compared instead
+	bpy.msgbus.subscribe_rna(
+		key=(bpy.types.Object, "name"),
+		owner=msgbus_owner,
+		args=(),
+		notify=on_object_renamed,
+	)
+	
+	# Objects that are not animated are left out of the visibility timeline
+	bpy.msgbus.subscribe_rna(
+		key=(bpy.types.Object, "hide_render"),
+		owner=msgbus_owner,
+		args=(),
+		notify=on_hide_render_changed,
+	)
+	
+	# Everything the render border and the highlighted camera are built from
+	render_border_inputs = (
+		(bpy.types.RenderSettings, "resolution_x"),
+		(bpy.types.RenderSettings, "resolution_y"),
+		(bpy.types.LayerObjects, "active"),
+		(bpy.types.Scene, "camera"),
+		(bpy.types.Scene, "always_show_render_border"),
+		(bpy.types.Camera, "lens"),
+		(bpy.types.Camera, "angle"),
+		(bpy.types.Camera, "sensor_fit"),
+		(bpy.types.Camera, "sensor_width"),
+		(bpy.types.Camera, "sensor_height"),
+		(bpy.types.Camera, "clip_start"),
+		(bpy.types.Camera, "clip_end"),
+		(JB_MULTICAM_PG_CAMERALIST_CameraItem, "x_dim"),
+		(JB_MULTICAM_PG_CAMERALIST_CameraItem, "y_dim"),
+	)
+	for key in render_border_inputs:
+		bpy.msgbus.subscribe_rna(
+			key=key,
+			owner=msgbus_owner,
+			args=(),
+			notify=on_render_border_input_changed,
+		)
+
+
+def get_highlighted_camera_name(scene):
+	row = scene.camera_list.highlighted_camera_index
+	if 0 <= row < len(scene.cameras):
+		return scene.cameras[row].name
+	return None
+
+
+def restore_highlighted_camera(scene, camera_name):
+	# Keeps the same camera highlighted after rows were added or removed.
+	# Only writes the index when it moved, as the write triggers the update callback.
+	camera_list = scene.camera_list
+	row = scene.cameras.find(camera_name) if camera_name is not None else -1
+	if row < 0:
+		row = min(camera_list.highlighted_camera_index, len(scene.cameras) - 1)
+	row = max(row, 0)
+	if camera_list.highlighted_camera_index != row:
+		camera_list.highlighted_camera_index = row
+
 
 def update_camera_list_highlight_if_camera_was_changed_outside_the_list(scene):
 	
@@ -1097,37 +4102,16 @@ def update_camera_list_highlight_if_camera_was_changed_outside_the_list(scene):
 	selected_camera = bpy.context.active_object
 	if selected_camera and selected_camera.type == 'CAMERA':
 		camera_list = scene.camera_list
-		index = next((i for i, cam in enumerate(scene.cameras) if cam.name == selected_camera.name), -1)
-		camera_list.highlighted_camera_index = index
+		index = get_camera_row(scene, selected_camera.name)
+		if index >= 0:
+			# A camera that is not listed yet keeps the highlight where it is
+			camera_list.highlighted_camera_index = index
 
 
+@instrumented("resize_passepartout")
 def resize_passepartout(camera, width, height):
 
-	# A factor that results in the correct placement of the render border
-	# exactly at the front plane of the camera object.
-	factor = 0.5
-
-	# The ratio is used to scale the rendering border, as the shortest side
-	# should match the same edge of the FOV.
-	render_ratio = height/width
-	
-	# Scaling the sides to match behavior of Blender, so the rendering border
-	# ends up showing what will actually be rendered.
-	if render_ratio > 1:
-		half_width = factor / render_ratio
-		half_height = factor
-	else:
-		half_width = factor
-		half_height = factor * render_ratio
-
-	# Calculate the optimal distance using the camera's FOV
-	optimal_distance = factor / math.tan(camera.data.angle / 2)
-	distance = max(camera.data.clip_start, optimal_distance)
-	
-	# Scaling render border according to distance, so it always looks same same in view finder.
-	if distance > optimal_distance:
-		half_width = half_width * (distance / optimal_distance)
-		half_height = half_height * (distance / optimal_distance)
+	verts = get_render_border_vertices(camera.data.angle, camera.data.clip_start, width, height)
 	
 	# Somehow the clip start, camera object scale affects optimal distance for the render border.
 	# How to ensure the optimal distance is within the camera's scaled clip range?
@@ -1142,23 +4126,22 @@ def resize_passepartout(camera, width, height):
 	#
 	# For now, I'll just issue a warning when camera is selected.
 
-	verts = [
-		(-half_width, -half_height, -distance),  # Make the Z coordinate negative
-		(half_width, -half_height, -distance),  # Make the Z coordinate negative
-		(half_width, half_height, -distance),  # Make the Z coordinate negative
-		(-half_width, half_height, -distance),  # Make the Z coordinate negative
-	]
-
 	edges = [(0, 1), (1, 2), (2, 3), (3, 0)]
 	faces = []
 
 	mesh = bpy.data.meshes.get(key_mesh)
 	if mesh is None:
 		mesh = bpy.data.meshes.new(key_mesh)
-	else:
+		mesh.from_pydata(verts, edges, faces)
+	elif len(mesh.vertices) != len(verts) or len(mesh.polygons) != 0 or [tuple(edge.vertices) for edge in mesh.edges] != edges:
+		# Someone edited the border mesh, so the topology has to be rebuilt
 		mesh.clear_geometry()
+		mesh.from_pydata(verts, edges, faces)
+	else:
+		# The topology never changes, only moving the four corners is much
+		# cheaper than reallocating the mesh while the resolution is dragged.
+		mesh.vertices.foreach_set("co", [coordinate for vert in verts for coordinate in vert])
 	
-	mesh.from_pydata(verts, edges, faces)
 	mesh.update()
 	
 	passepartout = bpy.data.objects.get(key_passepartout)
@@ -1166,45 +4149,97 @@ def resize_passepartout(camera, width, height):
 		passepartout = bpy.data.objects.new(key_passepartout, mesh)
 		bpy.context.collection.objects.link(passepartout)
 	
-	passepartout.data = mesh
-
-	passepartout.parent = camera
-	passepartout.hide_render = True
-	passepartout.hide_select = True
+	# Only writing what differs, as every write tags the object for another update
+	if passepartout.data != mesh:
+		passepartout.data = mesh
+	if passepartout.parent != camera:
+		passepartout.parent = camera
+	if not passepartout.hide_render:
+		passepartout.hide_render = True
+	if not passepartout.hide_select:
+		passepartout.hide_select = True
 	
 	return passepartout
 
 
 @persistent
-def update_multiresolution_camera_frame(scene):
+@instrumented("update_multiresolution_camera_frame")
+def update_multiresolution_camera_frame(scene, depsgraph=None):
+	# Resolution, selection, camera and rename changes arrive through msgbus, see
+	# subscribe_to_property_changes. Only adding, removing and relinking objects
+	# and editing keyframes are left to the depsgraph, so edits of the objects
+	# themselves return right away, after reading the checkbox of updated cameras.
+	
+	# Update visibility of objects in scene if needed
+	if scene.objects_visibility_refresh_is_needed:
+		update_objects_visibility_if_needed(bpy.context)
+	
+	if depsgraph is None:
+		sync_camera_list(scene)
+		refresh_render_border(scene)
+		return
+	
+	collections_changed = depsgraph.id_type_updated('COLLECTION')
+	
+	# Keyframes or objects changed, so the visibility timeline is out of date
+	if collections_changed or depsgraph.id_type_updated('ACTION'):
+		visibility_engine.invalidate_timeline()
+	
+	if collections_changed or depsgraph.id_type_updated('SCENE'):
+		# Only applies the cameras that were added or removed
+		sync_camera_list(scene, depsgraph)
+	
+	if depsgraph.id_type_updated('OBJECT'):
+		update_selected_count(scene, depsgraph)
+	
+	if collections_changed:
+		# The camera may have moved to another collection
+		refresh_render_border(scene)
+
+
+def on_render_border_input_changed():
+	# msgbus callback for everything the render border and highlight depend on
+	refresh_render_border(bpy.context.scene)
+
+
+def on_hide_render_changed():
+	# msgbus callback for Object.hide_render, toggled by hand
+	visibility_engine.invalidate_timeline()
+
+
+@instrumented("refresh_render_border")
+def refresh_render_border(scene):
+	global render_border_signature
+
 	# Get the active object and check if it is a camera
 	active_object = bpy.context.active_object
 
 	# Get existing passepartout, if there is one
 	passepartout = bpy.data.objects.get(key_passepartout)
 
-	# Maybe better to not do this every time, but rather have a refresh button?
-	populate_camera_list(scene)
-
-	# Update visibility of objects in scene if needed
-	update_objects_visibility_if_needed(bpy.context)
-	
 	if active_object and active_object.type == 'CAMERA':
 		selected_camera = active_object
 		
-		if not scene.move_focus_with_keys:
+		# Also called from msgbus and after a file was loaded, when the list may not
+		# be synced yet, so the highlighted row can be out of range or the list empty
+		if not scene.move_focus_with_keys and len(scene.cameras) > 0:
 			selected_row = scene.camera_list.highlighted_camera_index
-			selected_camera_item = scene.cameras[selected_row]
 			
 			# print(f"Clicked index {selected_row}")
 			
-			if selected_camera.name != selected_camera_item.name:
+			if not 0 <= selected_row < len(scene.cameras) or selected_camera.name != scene.cameras[selected_row].name:
 				# print(f"Names: {selected_camera.name} != {selected_camera_item.name}")
 				update_camera_list_highlight_if_camera_was_changed_outside_the_list(scene)
 
 		# Check if the selected camera is in the list of cameras with custom dimensions
-		custom_camera = bpy.context.scene.cameras.get(selected_camera.name)
-		if custom_camera and (custom_camera.x_dim != bpy.context.scene.render.resolution_x or custom_camera.y_dim != bpy.context.scene.render.resolution_y):
+		custom_camera = scene.cameras.get(selected_camera.name)
+
+		# Skip the rebuild when nothing the render border depends on has changed,
+		# the writes below would only trigger another depsgraph update.
+		if get_render_border_signature(scene, selected_camera, custom_camera, passepartout) == render_border_signature:
+			return
+
+		if custom_camera and (custom_camera.x_dim != scene.render.resolution_x or custom_camera.y_dim != scene.render.resolution_y):
 			# Show the passepartout for the active camera with custom dimensions
 			passepartout = resize_passepartout(selected_camera, custom_camera.x_dim, custom_camera.y_dim)
 			passepartout.hide_viewport = False
@@ -1236,15 +4271,39 @@ def update_multiresolution_camera_frame(scene):
 					# First time linking the passepartout to a collection
 					camera_collection.objects.link(passepartout)
 
-	elif passepartout and not bpy.context.scene.always_show_render_border:
+		render_border_signature = get_render_border_signature(scene, selected_camera, custom_camera, passepartout)
+
+	elif passepartout and not scene.always_show_render_border:
+		if not passepartout.hide_viewport:
 			passepartout.hide_viewport = True
 
 
+def get_render_border_signature(scene, camera, camera_item, passepartout):
+	# Everything the render border is built from. The pointers catch a different
+	# camera, or a passepartout that was deleted and recreated.
+	camera_collection = camera.users_collection[0] if camera.users_collection else None
+	return (
+		camera.as_pointer(),
+		camera_item.x_dim if camera_item else None,
+		camera_item.y_dim if camera_item else None,
+		scene.render.resolution_x,
+		scene.render.resolution_y,
+		camera.data.angle,
+		camera.data.clip_start,
+		camera.data.sensor_fit,
+		camera_collection.as_pointer() if camera_collection else None,
+		passepartout.as_pointer() if passepartout else None,
+		passepartout.hide_viewport if passepartout else None,
+	)
+
+
 classes = (
 	JB_MULTICAM_PG_CAMERALIST_HighlightTooltip,
 	JB_MULTICAM_PG_CAMERALIST_CameraItem,
+	JB_MULTICAM_PG_frame_range,
 
 	JB_MULTICAM_PT_camera_list,
+	JB_MULTICAM_PT_diagnostics,
 	JB_MULTICAM_UL_CAMERALIST_TEMPLATE_camera_list_item,
 	
 	JB_MULTICAM_OT_clear_custom_resolution,
@@ -1258,6 +4317,14 @@ classes = (
 	JB_MULTICAM_OT_render_custom_resolution,
 	JB_MULTICAM_OT_confirmation_dialog_render_all,
 	JB_MULTICAM_OT_confirmation_dialog_render_selected,
+	JB_MULTICAM_OT_render_queue,
+	JB_MULTICAM_OT_render_queue_pause,
+	JB_MULTICAM_OT_render_queue_cancel,
+	JB_MULTICAM_OT_render_queue_move,
+	JB_MULTICAM_OT_render_queue_clear,
+	JB_MULTICAM_OT_build_previews,
+	JB_MULTICAM_OT_render_selected_animations,
+	JB_MULTICAM_OT_clear_render_cache,
 
 	JB_MULTICAM_OT_update_viewport_visibility,
 	
@@ -1268,42 +4335,167 @@ classes = (
 )
 
 
+class VisibilityEngine:
+	# Keeps the viewport visibility of the objects in line with their Disabled in
+	# Renders state (hide_render), while touching as few objects as possible.
+	#
+	# The visibility last applied to each object is cached, and only objects whose
+	# state differs are hidden or shown, as every hide_set dirties the view layer.
+	# For frame changes a timeline is compiled from the hide_render F-Curves, holding
+	# the frames where an object flips. Playing forward only applies those flips,
+	# so the cost of a frame change follows the flips rather than the object count.
+
+	def __init__(self):
+		# Object pointer -> hidden state last applied
+		self.applied = {}
+		self.view_layer_pointer = None
+		self.last_frame = None
+		
+		# The compiled timeline, None until it is needed
+		self.flip_frames = None
+		self.flips = None
+		self.animated_objects = None
+		self.volatile_objects = None
+
+	def invalidate(self):
+		# Object references and pointers become stale on undo and file load
+		self.applied.clear()
+		self.view_layer_pointer = None
+		self.invalidate_timeline()
+
+	def invalidate_timeline(self):
+		# Also called when hide_render was toggled by hand, which the timeline does
+		# not hold, so the next frame makes a full pass
+		self.flip_frames = None
+		self.last_frame = None
+
+	def compile_timeline(self, scene):
+		flips = {}
+		animated_objects = []
+		volatile_objects = []
+		
+		for obj in scene.objects:
+			animation_data = obj.animation_data
+			if animation_data is None:
+				continue
+			
+			# Drivers and NLA strips are not followed, these objects are read every frame
+			if animation_data.nla_tracks or any(driver.data_path == "hide_render" for driver in animation_data.drivers):
+				volatile_objects.append(obj)
+				continue
+			
+			action = animation_data.action
+			fcurve = action.fcurves.find("hide_render") if action else None
+			if fcurve is None:
+				continue
+			if fcurve.modifiers:
+				volatile_objects.append(obj)
+				continue
+			
+			# hide_render is a boolean, so it can only flip on a keyframe
+			frames = []
+			states = []
+			for frame in sorted({int(round(keyframe.co[0])) for keyframe in fcurve.keyframe_points}):
+				hidden = fcurve.evaluate(frame) >= 0.5
+				if not states or states[-1] != hidden:
+					frames.append(frame)
+					states.append(hidden)
+					flips.setdefault(frame, []).append((obj, hidden))
+			if frames:
+				animated_objects.append((obj, frames, states))
+		
+		self.flips = flips
+		self.flip_frames = sorted(flips)
+		self.animated_objects = animated_objects
+		self.volatile_objects = volatile_objects
+		self.last_frame = None
+
+	def set_hidden(self, view_layer, obj, hidden):
+		pointer = obj.as_pointer()
+		if self.applied.get(pointer) != hidden:
+			obj.hide_set(hidden, view_layer=view_layer)
+			self.applied[pointer] = hidden
+
+	def apply_all(self, scene, view_layer, show_only_render):
+		# Full pass over the objects, writing only where the viewport state differs.
+		# Also corrects objects that were hidden or shown by hand.
+		self.applied.clear()
+		self.view_layer_pointer = view_layer.as_pointer()
+		for obj in scene.objects:
+			hidden = obj.hide_render if show_only_render else False
+			if obj.hide_get(view_layer=view_layer) != hidden:
+				obj.hide_set(hidden, view_layer=view_layer)
+			self.applied[obj.as_pointer()] = hidden
+		self.last_frame = scene.frame_current
+
+	def apply_frame(self, scene, view_layer, frame):
+		if self.view_layer_pointer != view_layer.as_pointer() or self.flip_frames is None:
+			# Another view layer, or objects that are not animated may have changed
+			self.apply_all(scene, view_layer, True)
+			self.last_frame = None
+		if self.flip_frames is None:
+			self.compile_timeline(scene)
+		
+		if self.last_frame is not None and frame >= self.last_frame:
+			# Playing forward: only the flips since the last frame
+			first = bisect.bisect_right(self.flip_frames, self.last_frame)
+			last = bisect.bisect_right(self.flip_frames, frame)
+			for flip_frame in self.flip_frames[first:last]:
+				for obj, hidden in self.flips[flip_frame]:
+					self.set_hidden(view_layer, obj, hidden)
+		else:
+			# Jumping: look up the state of every animated object at the frame
+			for obj, frames, states in self.animated_objects:
+				position = bisect.bisect_right(frames, frame) - 1
+				self.set_hidden(view_layer, obj, states[max(position, 0)])
+		
+		for obj in self.volatile_objects:
+			self.set_hidden(view_layer, obj, obj.hide_render)
+		
+		self.last_frame = frame
+
+
+visibility_engine = VisibilityEngine()
+
+
 def update_objects_visibility_if_needed(context):
 	if context.scene.objects_visibility_refresh_is_needed:
-		if context.scene.sor_show_only_render:
-			for obj in context.scene.objects:
-				obj.hide_set(obj.hide_render)
-		else:
-			for obj in context.scene.objects:
-				obj.hide_set(False)
+		visibility_engine.apply_all(context.scene, context.view_layer, context.scene.sor_show_only_render)
 
 
 @persistent
+@instrumented("frame_change_handler")
 def frame_change_handler(self, context):
 	# Only called when the frame changes.
 	if context.scene.sor_show_only_render and context.scene.sor_refresh_with_frame:
-		context.scene.objects_visibility_refresh_is_needed = True
-		update_objects_visibility_if_needed(bpy.context)
-		context.scene.objects_visibility_refresh_is_needed = False
+		view_layer = bpy.context.view_layer
+		if view_layer is not None:
+			visibility_engine.apply_frame(context.scene, view_layer, context.scene.frame_current)
 
 
 def show_only_render_was_updated(self, context):
 		# Only called when context.scene.sor_show_only_render changes
-		context.scene.objects_visibility_refresh_is_needed = True
-		update_objects_visibility_if_needed(bpy.context)
-		context.scene.objects_visibility_refresh_is_needed = False
+		visibility_engine.invalidate_timeline()
+		visibility_engine.apply_all(context.scene, context.view_layer, context.scene.sor_show_only_render)
 
 
 def register():
+	global camera_previews
 	
 	for cls in classes:
 		bpy.utils.register_class(cls)
+	
+	camera_previews = bpy.utils.previews.new()
 
 	bpy.types.Scene.camera_list = bpy.props.PointerProperty(type=JB_MULTICAM_PG_CAMERALIST_HighlightTooltip)
 
 	bpy.types.Scene.cameras = bpy.props.CollectionProperty(
 		type=JB_MULTICAM_PG_CAMERALIST_CameraItem,
 		 description="List of properties for each camera in the scene")
+	
+	bpy.types.Scene.frame_range_schedule = bpy.props.CollectionProperty(
+		type=JB_MULTICAM_PG_frame_range,
+		description="The frame ranges in the camera names, in the order they play")
 		 
 	bpy.types.Scene.passepartout_width = bpy.props.IntProperty(
 		name="Width",
@@ -1327,17 +4519,30 @@ def register():
 	bpy.app.handlers.depsgraph_update_post.append(update_multiresolution_camera_frame)
 	bpy.app.handlers.frame_change_post.append(frame_change_handler)
 
+	# The cached object pointers do not survive these
+	bpy.app.handlers.load_post.append(reset_pointer_caches)
+	bpy.app.handlers.undo_post.append(reset_pointer_caches)
+	bpy.app.handlers.redo_post.append(reset_pointer_caches)
+	bpy.app.handlers.load_post.append(restore_after_load)
+	subscribe_to_property_changes()
+
 	bpy.types.Scene.sor_show_only_render = bpy.props.BoolProperty(name="Show Only Render", default = False, description="Hides objects that are set to be disabled in renders (camera with cross)", update=show_only_render_was_updated)	
 	bpy.types.Scene.sor_refresh_with_frame = bpy.props.BoolProperty(name="Frame Change Refresh", default = False, description="Refresh visibility of objects in scene when frame changes", update=frame_change_handler)
 
 
 
 def unregister():
+	global camera_previews
+	
 	for cls in classes:
 		bpy.utils.unregister_class(cls)
+	
+	bpy.utils.previews.remove(camera_previews)
+	camera_previews = None
 		
 	del bpy.types.Scene.camera_list
 	del bpy.types.Scene.cameras
+	del bpy.types.Scene.frame_range_schedule
 	
 	# Try to remove the passepartout
 	passepartout = bpy.data.objects.get(key_passepartout)
@@ -1348,6 +4553,13 @@ def unregister():
 	# Unregister the depsgraph update handler
 	bpy.app.handlers.depsgraph_update_post.remove(update_multiresolution_camera_frame)
 	bpy.app.handlers.frame_change_post.remove(frame_change_handler)
+	bpy.app.handlers.load_post.remove(reset_pointer_caches)
+	bpy.app.handlers.undo_post.remove(reset_pointer_caches)
+	bpy.app.handlers.redo_post.remove(reset_pointer_caches)
+	bpy.app.handlers.load_post.remove(restore_after_load)
+	stop_abandoned_render_queue()
+	bpy.msgbus.clear_by_owner(msgbus_owner)
+	reset_pointer_caches(None)
 	
 	# Remove the custom_aspect_value property
 	# del bpy.types.Scene.custom_aspect_value
@@ -1357,5 +4569,351 @@ def unregister():
 	
 	
 
+# COMMAND LINE
+#
+# Renders without the user interface, e.g. on a render node:
+#
+#   blender -b file.blend --python jb-multicamera.py -- --selected --mode stills
+#
+# Everything after -- is read by this add-on. Cameras are picked by name (wildcards
+# allowed), by their checkbox in the camera list, or by a frame range in their name.
+# Without any of these, all cameras are rendered.
+
+def parse_command_line_arguments(argv):
+	parser = argparse.ArgumentParser(
+		prog="blender -b file.blend --python jb-multicamera.py --",
+		description="Render cameras in their custom resolution without the user interface.",
+	)
+	parser.add_argument("--scene", help="Name of the scene to render (default: the active scene)")
+	parser.add_argument("--cameras", nargs="+", metavar="NAME", help="Cameras to render, wildcards like \"Shot*\" are allowed")
+	parser.add_argument("--selected", action="store_true", help="Only cameras ticked in the camera list")
+	parser.add_argument("--ranged", action="store_true", help="Only cameras with a frame range in their name")
+	parser.add_argument("--mode", choices=("stills", "animation", "sequence"), default="stills",
+		help="stills: one image per camera; animation: the animation range of each camera; sequence: the multi-camera sequence from the frame ranges")
+	parser.add_argument("--frame", type=int, help="Frame to render stills at (default: the current frame)")
+	parser.add_argument("--engine", help="Render engine, e.g. CYCLES, BLENDER_EEVEE or BLENDER_WORKBENCH")
+	parser.add_argument("--output", help="Output path (default: the output path of the scene)")
+	parser.add_argument("--format", choices=("scene", "png", "jpeg", "exr", "webp"), help="File format of the images, cameras with their own format keep it")
+	parser.add_argument("--color-depth", choices=("8", "16", "32"), help="Bits per channel, 16 and 32 for PNG and OpenEXR")
+	parser.add_argument("--compression", type=int, help="PNG compression from 0 to 100")
+	parser.add_argument("--quality", type=int, help="JPEG and WebP quality from 0 to 100")
+	parser.add_argument("--exr-codec", choices=("DWAA", "ZIP", "PIZ", "NONE"), help="OpenEXR compression")
+	parser.add_argument("--drafts", choices=("off", "auto", "approval"), help="Render drafts before the finals: of every camera, or of the cameras that are not approved")
+	parser.add_argument("--profile", metavar="PATH", help="Record timings while rendering and save them as JSON")
+	parser.add_argument("--resume", action="store_true", help="Keep a journal of the finished renders, and skip them when an interrupted batch is rendered again")
+	parser.add_argument("--restart", action="store_true", help="Render everything again, instead of resuming an interrupted batch")
+	parser.add_argument("--skip-unchanged", action="store_true", help="Skip the cameras that did not change since their last render")
+	parser.add_argument("--fast-batch", action="store_true", help="Keep the Cycles scene data between renders and compile the Eevee shaders up front")
+	parser.add_argument("--workers", type=int, default=1, help="Number of Blender processes rendering in parallel, each using an equal share of the CPU cores")
+	parser.add_argument("--jobs-per-worker", type=int, default=20, help="Restart a worker after this many jobs to cap its memory use")
+	parser.add_argument("--chunk-size", type=int, default=10, help="Frames per job handed to a worker when rendering animations and sequences")
+	parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+	return parser.parse_args(argv)
+
+
+def select_cameras_for_command_line(scene, arguments):
+	camera_items = list(scene.cameras)
+	if arguments.cameras:
+		camera_items = [camera_item for camera_item in camera_items if any(fnmatch.fnmatchcase(camera_item.name, pattern) for pattern in arguments.cameras)]
+	if arguments.selected:
+		camera_items = [camera_item for camera_item in camera_items if camera_item.selected_for_rendering]
+	if arguments.ranged:
+		camera_items = [camera_item for camera_item in camera_items if parse_frame_ranges(camera_item.name)]
+	return camera_items
+
+
+def main(argv):
+	arguments = parse_command_line_arguments(argv)
+	
+	scene = bpy.data.scenes.get(arguments.scene) if arguments.scene else bpy.context.scene
+	if scene is None:
+		print(f"Scene {arguments.scene} not found")
+		return 1
+	
+	# The stored camera list may be out of date
+	populate_camera_list(scene)
+	
+	if arguments.engine:
+		scene.render.engine = arguments.engine
+	if arguments.output:
+		scene.render.filepath = arguments.output
+	if arguments.format:
+		scene.output_format = {"scene": 'SCENE', "png": 'PNG', "jpeg": 'JPEG', "exr": 'OPEN_EXR', "webp": 'WEBP'}[arguments.format]
+	if arguments.color_depth:
+		scene.output_color_depth = arguments.color_depth
+	if arguments.compression is not None:
+		scene.output_compression = arguments.compression
+	if arguments.quality is not None:
+		scene.output_quality = arguments.quality
+	if arguments.exr_codec:
+		scene.output_exr_codec = arguments.exr_codec
+	if arguments.drafts:
+		scene.draft_mode = {"off": 'OFF', "auto": 'AUTO', "approval": 'APPROVAL'}[arguments.drafts]
+	if arguments.resume:
+		scene.resume_interrupted_renders = True
+	if arguments.restart:
+		scene.resume_interrupted_renders = False
+	if arguments.skip_unchanged:
+		scene.use_render_cache = True
+	if arguments.fast_batch:
+		scene.use_fast_batch = True
+	
+	# Every render is passed the chosen scene, which is not always the scene of
+	# the context. The scenes that were actually rendered are checked afterwards.
+	rendered_scene_names = set()
+	def record_rendered_scene(rendered_scene, depsgraph=None):
+		rendered_scene_names.add(rendered_scene.name)
+	
+	bpy.app.handlers.render_pre.append(record_rendered_scene)
+	try:
+		exit_code = run_command_line(scene, arguments)
+	finally:
+		bpy.app.handlers.render_pre.remove(record_rendered_scene)
+	
+	other_scene_names = rendered_scene_names - {scene.name}
+	if other_scene_names:
+		print(f"Rendered {', '.join(sorted(other_scene_names))} instead of scene {scene.name}")
+		return 1
+	return exit_code
+
+
+def run_command_line(scene, arguments):
+	if arguments.worker:
+		return run_render_worker(scene)
+	
+	if not arguments.profile:
+		return render_from_command_line(scene, arguments)
+	
+	profiler.is_recording = True
+	try:
+		return render_from_command_line(scene, arguments)
+	finally:
+		export_profiling_summary(arguments.profile)
+		print(f"Saved timings to {arguments.profile}")
+
+
+def render_from_command_line(scene, arguments):
+	if arguments.mode == "sequence":
+		if arguments.cameras or arguments.selected or arguments.ranged:
+			print("Camera selection is ignored when rendering a sequence, the frame ranges decide the cameras.")
+		if arguments.workers > 1:
+			return render_with_worker_pool(scene, build_render_jobs(scene, arguments, []), arguments)
+		print(render_sequence_in_passes(scene))
+		return 0
+	
+	camera_items = select_cameras_for_command_line(scene, arguments)
+	if not camera_items:
+		print("No cameras to render")
+		return 1
+	
+	if arguments.workers > 1:
+		return render_with_worker_pool(scene, build_render_jobs(scene, arguments, camera_items), arguments)
+	
+	if arguments.mode == "animation":
+		print(render_cameras_frame_major(scene, camera_items))
+	else:
+		if arguments.frame is not None:
+			scene.frame_set(arguments.frame)
+		print(render_images_in_passes(scene, camera_items))
+	
+	return 0
+
+
+# RENDER POOL
+#
+# With --workers N the jobs are rendered by N background Blender processes, each
+# using an equal share of the CPU cores. Many small renders keep more cores busy
+# this way than in one process, where scene sync and single-threaded stages dominate.
+#
+# All jobs wait in one queue. Each worker takes the next job as soon as it is done
+# with the previous one, so a worker that gets the quick jobs simply does more of
+# them. After --jobs-per-worker jobs a worker is replaced by a fresh process.
+
+worker_done_prefix = "JB_MULTICAM_WORKER_DONE"
+
+
+def build_render_jobs(scene, arguments, camera_items):
+	# Splits the batch into jobs of one still, or up to --chunk-size frames
+	chunk_size = max(1, arguments.chunk_size)
+	jobs = []
+	
+	if arguments.mode == "stills":
+		frame = arguments.frame if arguments.frame is not None else scene.frame_current
+		for is_draft, pass_items in get_render_passes(scene, camera_items, lambda camera_item: camera_item.get_camera()):
+			for camera_item in pass_items:
+				jobs.append({"kind": "still", "camera": camera_item.name, "frame": frame, "draft": is_draft})
+	
+	elif arguments.mode == "animation":
+		frames = list(range(scene.frame_start, scene.frame_end + 1, scene.frame_step))
+		for camera_item in camera_items:
+			for i in range(0, len(frames), chunk_size):
+				jobs.append({"kind": "animation", "camera": camera_item.name, "frames": frames[i:i + chunk_size]})
+	
+	else:
+		plan = build_sequence_render_plan(get_frame_range_index(scene), scene.frame_start, scene.frame_end)
+		for is_draft, pass_plan in get_render_passes(scene, plan, lambda segment: segment[0]):
+			for camera, start_frame, end_frame in pass_plan:
+				for chunk_start in range(start_frame, end_frame + 1, chunk_size):
+					jobs.append({"kind": "segment", "camera": camera.name, "start": chunk_start, "end": min(chunk_start + chunk_size - 1, end_frame), "draft": is_draft})
+	
+	return jobs
+
+
+def render_with_worker_pool(scene, jobs, arguments):
+	blend_path = bpy.data.filepath
+	if not blend_path:
+		print("Save the file before rendering with workers, they load it from disk")
+		return 1
+	if bpy.data.is_dirty:
+		print("Unsaved changes are not seen by the workers, they load the file from disk")
+	
+	worker_count = max(1, min(arguments.workers, len(jobs)))
+	threads_per_worker = max(1, (os.cpu_count() or 1) // worker_count)
+	jobs_per_worker = max(1, arguments.jobs_per_worker)
+	
+	command = [bpy.app.binary_path, "-b", blend_path, "-t", str(threads_per_worker), "--python", os.path.abspath(__file__), "--", "--worker"]
+	if arguments.scene:
+		command += ["--scene", arguments.scene]
+	if arguments.engine:
+		command += ["--engine", arguments.engine]
+	if arguments.output:
+		command += ["--output", arguments.output]
+	for option, value in (("--format", arguments.format), ("--color-depth", arguments.color_depth), ("--compression", arguments.compression), ("--quality", arguments.quality), ("--exr-codec", arguments.exr_codec)):
+		if value is not None:
+			command += [option, str(value)]
+	if arguments.resume:
+		command += ["--resume"]
+	if arguments.restart:
+		command += ["--restart"]
+	if arguments.skip_unchanged:
+		command += ["--skip-unchanged"]
+	if arguments.fast_batch:
+		command += ["--fast-batch"]
+	
+	job_queue = queue.Queue()
+	for job in jobs:
+		job_queue.put(job)
+	
+	lock = threading.Lock()
+	failed_jobs = []
+	progress = {"done": 0}
+	
+	def run_worker_slot(slot):
+		while not job_queue.empty():
+			process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1)
+			jobs_done = 0
+			while jobs_done < jobs_per_worker:
+				try:
+					job = job_queue.get_nowait()
+				except queue.Empty:
+					break
+				
+				try:
+					process.stdin.write(json.dumps(job) + "\n")
+					process.stdin.flush()
+					result = read_worker_result(process, slot)
+				except BrokenPipeError:
+					result = None
+				
+				if result is not None:
+					jobs_done += 1
+					with lock:
+						if result["ok"]:
+							progress["done"] += 1
+							print(f"Worker {slot}: finished {job['camera']} — {progress['done']} of {len(jobs)} jobs done")
+						else:
+							failed_jobs.append(job)
+					continue
+				
+				# The worker died, give the job one more chance with a fresh worker
+				job["attempts"] = job.get("attempts", 0) + 1
+				if job["attempts"] < 2:
+					job_queue.put(job)
+				else:
+					with lock:
+						failed_jobs.append(job)
+				break
+			
+			if process.poll() is None:
+				try:
+					process.stdin.close()
+				except BrokenPipeError:
+					pass
+			process.wait()
+	
+	print(f"\nRendering {len(jobs)} jobs with {worker_count} workers of {threads_per_worker} threads each.")
+	start_time = time.time()
+	
+	slots = [threading.Thread(target=run_worker_slot, args=(slot,)) for slot in range(1, worker_count + 1)]
+	for slot in slots:
+		slot.start()
+	for slot in slots:
+		slot.join()
+	
+	print(f"\nTotal time taken for rendering: {format_duration(time.time() - start_time)}")
+	for job in failed_jobs:
+		print(f"Failed to render {job}")
+	if failed_jobs:
+		return 1
+	
+	# The workers share one journal, which is done once every job is
+	journal = open_render_journal(scene, get_output_directory(scene))
+	if journal:
+		journal.finish()
+	return 0
+
+
+def read_worker_result(process, slot):
+	# Passes the output of the worker on until it reports the job as done.
+	# Returns None when the worker exited before finishing the job.
+	for line in process.stdout:
+		if line.startswith(worker_done_prefix):
+			return json.loads(line[len(worker_done_prefix):])
+		print(f"[{slot}] {line}", end="")
+	return None
+
+
+def run_render_worker(scene):
+	# Renders the jobs read from stdin, one JSON object per line, until stdin is closed.
+	# The journal is finished by the pool, once all workers are done.
+	journal = open_render_journal(scene, get_output_directory(scene))
+	
+	# One session for all jobs, so Fast Batch keeps its data from job to job
+	session = begin_render_session(scene)
+	
+	# The scene does not change between jobs, so it is read once per frame
+	fingerprints = {}
+	
+	for line in sys.stdin:
+		job = json.loads(line)
+		camera = bpy.data.objects.get(job["camera"])
+		camera_item = scene.cameras.get(job["camera"])
+		succeeded = camera is not None and camera_item is not None
+		
+		if succeeded:
+			if job["kind"] == "still":
+				scene.frame_set(job["frame"])
+				if scene.use_render_cache and job["frame"] not in fingerprints:
+					fingerprints[job["frame"]] = SceneFingerprint(scene)
+				render_images(scene, [camera_item], journal, job.get("draft", False), fingerprints.get(job["frame"]))
+			elif job["kind"] == "animation":
+				render_camera_animation(scene, camera, camera_item, job["frames"], journal)
+			else:
+				render_sequence(scene, [(camera, job["start"], job["end"])], journal, job.get("draft", False))
+		else:
+			print(f"Camera {job['camera']} not found")
+		
+		print(worker_done_prefix + json.dumps({"ok": succeeded}), flush=True)
+	
+	end_render_session(scene, session)
+	return 0
+
+
 if __name__ == "__main__":
 	register()
+	
+	# Arguments after -- are meant for the add-on, when run from the command line
+	if "--" in sys.argv:
+		exit_code = main(sys.argv[sys.argv.index("--") + 1:])
+		if exit_code:
+			sys.exit(exit_code)
@@ -0,0 +1,304 @@
+# THE MULTI-CAMERA TOOLBOX CORE
+#
+# The geometry, frame range and file name logic of the Multi-Camera Toolbox, in
+# plain Python and NumPy without bpy, so it can be unit tested and measured
+# outside Blender. jb-multicamera.py reads the scene, calls these, and writes the
+# results back. Install this file next to the add-on.
+
+import os
+import re
+import math
+import bisect
+
+import numpy as np
+
+
+# RENDER BORDER AND VIEW
+
+# Places the render border exactly at the front plane of the camera object
+render_border_factor = 0.5
+
+
+def get_render_border_extents(angles, clip_starts, widths, heights):
+	# Half width, half height and distance of the render border for any number of
+	# cameras at once, from their field of view, clip start and resolution
+	angles = np.asarray(angles, dtype=np.float64)
+	clip_starts = np.asarray(clip_starts, dtype=np.float64)
+	render_ratios = np.asarray(heights, dtype=np.float64) / np.asarray(widths, dtype=np.float64)
+
+	# Scaling the sides to match behavior of Blender, as the shortest side should
+	# match the same edge of the FOV, so the border shows what will be rendered.
+	is_portrait = render_ratios > 1
+	half_widths = np.where(is_portrait, render_border_factor / render_ratios, render_border_factor)
+	half_heights = np.where(is_portrait, render_border_factor, render_border_factor * render_ratios)
+
+	# The border sits at the optimal distance for the FOV, unless that is clipped.
+	# Further away it is scaled up, so it always looks the same in the view finder.
+	optimal_distances = render_border_factor / np.tan(angles / 2)
+	distances = np.maximum(clip_starts, optimal_distances)
+	scales = distances / optimal_distances
+	return half_widths * scales, half_heights * scales, distances
+
+
+def get_render_border_vertices(angle, clip_start, width, height):
+	# The four corners of the render border of one camera, in camera space
+	half_widths, half_heights, distances = get_render_border_extents((angle,), (clip_start,), (width,), (height,))
+	half_width, half_height, distance = float(half_widths[0]), float(half_heights[0]), float(distances[0])
+	return [
+		(-half_width, -half_height, -distance),
+		(half_width, -half_height, -distance),
+		(half_width, half_height, -distance),
+		(-half_width, half_height, -distance),
+	]
+
+
+def get_view_frame(is_perspective, lens, sensor_width, sensor_height, sensor_fit, ortho_scale, shift_x, shift_y, width, height):
+	# The four corners of what a camera sees one unit in front of it, in camera
+	# space, for a render of width × height pixels. Same as Camera.view_frame,
+	# without having to set the resolution of the scene first.
+	if sensor_fit == 'AUTO':
+		sensor_fit = 'HORIZONTAL' if width >= height else 'VERTICAL'
+		sensor = sensor_width
+	else:
+		sensor = sensor_width if sensor_fit == 'HORIZONTAL' else sensor_height
+	
+	# The full extent of the side the sensor fits, which the shift is relative to
+	size = sensor / lens if is_perspective else ortho_scale
+	if sensor_fit == 'HORIZONTAL':
+		half_width = size / 2
+		half_height = half_width * height / width
+	else:
+		half_height = size / 2
+		half_width = half_height * width / height
+	
+	center_x = shift_x * size
+	center_y = shift_y * size
+	return [
+		(center_x + half_width, center_y + half_height, -1.0),
+		(center_x + half_width, center_y - half_height, -1.0),
+		(center_x - half_width, center_y - half_height, -1.0),
+		(center_x - half_width, center_y + half_height, -1.0),
+	]
+
+
+def get_frustum_planes(frame_corners, is_perspective, clip_start, clip_end):
+	# The planes around what a camera sees, in camera space, as rows of
+	# (normal x, normal y, normal z, offset). Inside is the positive side of every plane.
+	corners = np.asarray(frame_corners, dtype=np.float64)
+	center = corners.mean(axis=0)
+	planes = []
+	for corner, next_corner in zip(corners, np.roll(corners, -1, axis=0)):
+		# The sides of a perspective view meet in the camera, those of an
+		# orthographic view run along its axis
+		if is_perspective:
+			normal = np.cross(corner, next_corner)
+		else:
+			normal = np.cross(next_corner - corner, (0.0, 0.0, 1.0))
+		offset = -normal.dot(corner)
+		if normal.dot(center) + offset < 0:
+			normal, offset = -normal, -offset
+		planes.append((*normal, offset))
+	
+	# The camera looks down -Z
+	planes.append((0.0, 0.0, -1.0, -clip_start))
+	planes.append((0.0, 0.0, 1.0, clip_end))
+	return np.array(planes)
+
+
+def get_boxes_in_frustum(planes, boxes, world_to_camera):
+	# Which boxes, each given as its 8 corners in world space, are at least partly
+	# inside the frustum planes. A box is only left out when all its corners are
+	# behind one plane, so a box near a corner of the frustum can be kept, but a
+	# box in view is never left out.
+	boxes = np.asarray(boxes, dtype=np.float64)
+	world_to_camera = np.asarray(world_to_camera, dtype=np.float64)
+	corners = boxes @ world_to_camera[:3, :3].T + world_to_camera[:3, 3]
+	distances = corners @ planes[:, :3].T + planes[:, 3]
+	return ~(distances < 0).all(axis=1).any(axis=1)
+
+
+# FILE NAMES
+
+def ensure_extension(file_path, extension):
+	# Same as bpy.path.ensure_ext, ignoring case
+	return file_path if file_path[-len(extension):].lower() == extension.lower() else file_path + extension
+
+
+# The file extension Blender uses for each image format
+image_extensions = {
+	'BMP': ".bmp",
+	'IRIS': ".rgb",
+	'PNG': ".png",
+	'JPEG': ".jpg",
+	'JPEG2000': ".jp2",
+	'TARGA': ".tga",
+	'TARGA_RAW': ".tga",
+	'CINEON': ".cin",
+	'DPX': ".dpx",
+	'OPEN_EXR_MULTILAYER': ".exr",
+	'OPEN_EXR': ".exr",
+	'HDR': ".hdr",
+	'TIFF': ".tif",
+	'WEBP': ".webp",
+}
+
+
+def get_image_extension(file_format):
+	return image_extensions.get(file_format, ".png")
+
+
+def get_supported_color_depth(file_format, color_depth):
+	# The nearest color depth the format can store
+	if file_format == 'PNG':
+		return '8' if color_depth == '8' else '16'
+	if file_format in ('OPEN_EXR', 'OPEN_EXR_MULTILAYER'):
+		return '32' if color_depth == '32' else '16'
+	return '8'
+
+
+def format_camera_output_path(file_dir, camera_name, width, height, append_resolution, extension=".png"):
+	if append_resolution:
+		camera_file_path = os.path.join(file_dir, f"{camera_name} {width} × {height}{extension}")
+	else:
+		camera_file_path = os.path.join(file_dir, f"{camera_name}{extension}")
+	return ensure_extension(camera_file_path, extension)
+
+
+# FRAME RANGES
+#
+# The frame ranges are part of the camera names, e.g. "Closeup 120-240". Anything
+# with a name can be given as a camera.
+
+class FrameRangeIndex:
+	# Immutable lookup from a frame to the camera whose frame range contains it.
+	#
+	# The ranges are flattened into sorted, non-overlapping segments so a frame is
+	# found with a binary search, or directly in a per-frame table when the timeline
+	# is short enough. Where ranges overlap the range that starts first wins, which
+	# is what the linear scan over the sorted ranges used to do.
+
+	# Longest timeline (in frames) that gets a per-frame lookup table
+	dense_lookup_limit = 100000
+
+	def __init__(self, ranges):
+		starts = []
+		ends = []
+		cameras = []
+		overlaps = []
+		gaps = []
+
+		covered_until = None
+		covering_camera = None
+		for camera, start_frame, end_frame in sorted(ranges, key=lambda x: (x[1], x[2])):
+			if end_frame < start_frame:
+				# A reversed range never contained any frame
+				continue
+
+			if covered_until is not None:
+				if start_frame <= covered_until:
+					overlaps.append((covering_camera.name, camera.name, start_frame, min(end_frame, covered_until)))
+				elif start_frame > covered_until + 1:
+					gaps.append((covered_until + 1, start_frame - 1))
+
+			# Only the part after everything covered so far belongs to this camera
+			segment_start = start_frame if covered_until is None else max(start_frame, covered_until + 1)
+			if segment_start <= end_frame:
+				starts.append(segment_start)
+				ends.append(end_frame)
+				cameras.append(camera)
+
+			if covered_until is None or end_frame > covered_until:
+				covered_until = end_frame
+				covering_camera = camera
+
+		self.starts = tuple(starts)
+		self.ends = tuple(ends)
+		self.cameras = tuple(cameras)
+		self.overlaps = tuple(overlaps)
+		self.gaps = tuple(gaps)
+
+		self.lookup_table = None
+		if starts and ends[-1] - starts[0] < self.dense_lookup_limit:
+			first_frame = starts[0]
+			lookup_table = [None] * (ends[-1] - first_frame + 1)
+			for camera, start_frame, end_frame in self.segments():
+				lookup_table[start_frame - first_frame:end_frame - first_frame + 1] = [camera] * (end_frame - start_frame + 1)
+			self.lookup_table = tuple(lookup_table)
+
+	def __len__(self):
+		return len(self.starts)
+
+	def camera_at(self, frame):
+		# Returns the camera for the frame, or None when no range contains it
+		if not self.starts:
+			return None
+
+		if self.lookup_table is not None:
+			offset = frame - self.starts[0]
+			if 0 <= offset < len(self.lookup_table):
+				return self.lookup_table[offset]
+			return None
+
+		position = bisect.bisect_right(self.starts, frame) - 1
+		if position >= 0 and frame <= self.ends[position]:
+			return self.cameras[position]
+		return None
+
+	def segments(self):
+		# The non-overlapping (camera, start, end) segments sorted by start frame
+		return zip(self.cameras, self.starts, self.ends)
+
+
+def parse_frame_ranges(camera_name):
+	# Extract all digit ranges from the camera name, allowing multiple ranges per camera
+	return [(int(range_start), int(range_end)) for range_start, range_end in re.findall(r'(\d+)-(\d+)', camera_name)]
+
+
+def get_first_frame(camera_name):
+	# The earliest frame in the name, or infinity to sort cameras without a range last
+	ranges = parse_frame_ranges(camera_name)
+	return min(start_frame for start_frame, end_frame in ranges) if ranges else math.inf
+
+
+def compile_frame_range_schedule(camera_names):
+	# All frame ranges in the camera names as (name, start, end), in the order
+	# they play, earliest start first
+	schedule = [(camera_name, start_frame, end_frame) for camera_name in camera_names for start_frame, end_frame in parse_frame_ranges(camera_name)]
+	schedule.sort(key=lambda entry: (entry[1], entry[2]))
+	return schedule
+
+
+def build_sequence_render_plan(frame_range_index, frame_start, frame_end):
+	# Compiles the sequence into contiguous (camera, start, end) segments within
+	# the frame range, merging adjacent segments that use the same camera.
+	plan = []
+	for camera, start_frame, end_frame in frame_range_index.segments():
+		start_frame = max(start_frame, frame_start)
+		end_frame = min(end_frame, frame_end)
+		if start_frame > end_frame:
+			continue
+		if plan and plan[-1][0] == camera and plan[-1][2] + 1 == start_frame:
+			plan[-1] = (camera, plan[-1][1], end_frame)
+		else:
+			plan.append((camera, start_frame, end_frame))
+	return plan
+
+
+def get_contiguous_runs(frames):
+	# Groups sorted frame numbers into (start, end) runs of consecutive frames
+	runs = []
+	for frame in frames:
+		if runs and runs[-1][1] + 1 == frame:
+			runs[-1] = (runs[-1][0], frame)
+		else:
+			runs.append((frame, frame))
+	return runs
+
+
+# RENDER STATUS
+
+def is_sampling_status(stats):
+	# Whether a render status line of Cycles or Eevee reports sampling, e.g.
+	# "... | Sample 12/128" or "... | Rendering 3 / 64 samples"
+	status = stats.rsplit("|", 1)[-1].strip()
+	return status.startswith(("Sample ", "Path Tracing Sample", "Rendering ")) and "/" in status
@@ -0,0 +1,173 @@
+# TESTS OF THE MULTI-CAMERA TOOLBOX CORE
+#
+# The core has no bpy, so these run with plain Python and NumPy:
+#
+#   python -m pytest tests/test_jb_multicamera_core.py
+
+import os
+import sys
+import math
+import unittest
+import collections
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jb_multicamera_core as core
+
+
+# Anything with a name can be a camera of a frame range
+Camera = collections.namedtuple("Camera", "name")
+
+
+class RenderBorderTest(unittest.TestCase):
+
+	def test_landscape_border_fits_the_width(self):
+		half_widths, half_heights, distances = core.get_render_border_extents([math.radians(90)], [0.1], [200], [100])
+		self.assertAlmostEqual(half_widths[0], 0.5)
+		self.assertAlmostEqual(half_heights[0], 0.25)
+		# tan(45°) is 1, so the border of a 90° camera sits half a unit in front of it
+		self.assertAlmostEqual(distances[0], 0.5)
+
+	def test_portrait_border_fits_the_height(self):
+		half_widths, half_heights, _ = core.get_render_border_extents([math.radians(90)], [0.1], [100], [200])
+		self.assertAlmostEqual(half_widths[0], 0.25)
+		self.assertAlmostEqual(half_heights[0], 0.5)
+
+	def test_clipped_border_is_moved_back_and_scaled_up(self):
+		half_widths, half_heights, distances = core.get_render_border_extents([math.radians(90)], [2.0], [200], [100])
+		self.assertAlmostEqual(distances[0], 2.0)
+		self.assertAlmostEqual(half_widths[0], 2.0)
+		self.assertAlmostEqual(half_heights[0], 1.0)
+
+	def test_vectorized_extents_match_one_camera_at_a_time(self):
+		random_numbers = np.random.default_rng(1)
+		angles = random_numbers.uniform(0.1, 2.5, 100)
+		clip_starts = random_numbers.uniform(0.01, 3.0, 100)
+		widths = random_numbers.integers(1, 4000, 100)
+		heights = random_numbers.integers(1, 4000, 100)
+		half_widths, half_heights, distances = core.get_render_border_extents(angles, clip_starts, widths, heights)
+		for camera in range(100):
+			corners = core.get_render_border_vertices(angles[camera], clip_starts[camera], widths[camera], heights[camera])
+			self.assertEqual(corners[2], (half_widths[camera], half_heights[camera], -distances[camera]))
+
+	def test_vertices_go_around_the_border(self):
+		corners = core.get_render_border_vertices(math.radians(90), 0.1, 200, 100)
+		np.testing.assert_allclose(corners, [(-0.5, -0.25, -0.5), (0.5, -0.25, -0.5), (0.5, 0.25, -0.5), (-0.5, 0.25, -0.5)])
+
+
+class ViewFrustumTest(unittest.TestCase):
+
+	def get_planes(self, width=100, height=100):
+		# A 90° perspective camera looking down -Z, from 1 to 10 units
+		frame = core.get_view_frame(True, 18, 36, 24, 'AUTO', 6, 0, 0, width, height)
+		return core.get_frustum_planes(frame, True, 1, 10)
+
+	def get_box(self, center, size=0.5):
+		return [(center[0] + x, center[1] + y, center[2] + z) for x in (-size, size) for y in (-size, size) for z in (-size, size)]
+
+	def test_view_frame_of_a_90_degree_camera(self):
+		frame = core.get_view_frame(True, 18, 36, 24, 'AUTO', 6, 0, 0, 200, 100)
+		self.assertEqual(frame, [(1.0, 0.5, -1.0), (1.0, -0.5, -1.0), (-1.0, -0.5, -1.0), (-1.0, 0.5, -1.0)])
+
+	def test_view_frame_shift_moves_the_center(self):
+		frame = core.get_view_frame(True, 18, 36, 24, 'HORIZONTAL', 6, 0.5, 0, 100, 100)
+		self.assertEqual([corner[0] for corner in frame], [2.0, 2.0, 0.0, 0.0])
+
+	def test_boxes_in_view_are_kept(self):
+		boxes = [
+			self.get_box((0, 0, -5)),     # In the middle
+			self.get_box((4.9, 0, -5)),   # Crossing the right side
+			self.get_box((0, 0, 5)),      # Behind the camera
+			self.get_box((20, 0, -5)),    # Far to the right
+			self.get_box((0, 0, -20)),    # Beyond the clip end
+		]
+		visible = core.get_boxes_in_frustum(self.get_planes(), boxes, np.identity(4))
+		self.assertEqual(visible.tolist(), [True, True, False, False, False])
+
+	def test_boxes_are_moved_into_camera_space(self):
+		# The camera moved 100 units along +X, given as its world to camera matrix
+		world_to_camera = np.identity(4)
+		world_to_camera[0, 3] = -100
+		boxes = [self.get_box((100, 0, -5)), self.get_box((0, 0, -5))]
+		visible = core.get_boxes_in_frustum(self.get_planes(), boxes, world_to_camera)
+		self.assertEqual(visible.tolist(), [True, False])
+
+
+class FileNameTest(unittest.TestCase):
+
+	def test_extension_is_added_once_ignoring_case(self):
+		self.assertEqual(core.ensure_extension("shot", ".png"), "shot.png")
+		self.assertEqual(core.ensure_extension("shot.PNG", ".png"), "shot.PNG")
+
+	def test_camera_output_path(self):
+		self.assertEqual(core.format_camera_output_path("out", "Closeup", 1920, 1080, False), os.path.join("out", "Closeup.png"))
+		self.assertEqual(core.format_camera_output_path("out", "Closeup", 1920, 1080, True, ".exr"), os.path.join("out", "Closeup 1920 × 1080.exr"))
+
+	def test_image_extension_of_each_format(self):
+		self.assertEqual(core.get_image_extension('JPEG'), ".jpg")
+		self.assertEqual(core.get_image_extension('OPEN_EXR'), ".exr")
+		self.assertEqual(core.get_image_extension('UNKNOWN'), ".png")
+
+	def test_nearest_supported_color_depth(self):
+		self.assertEqual(core.get_supported_color_depth('PNG', '32'), '16')
+		self.assertEqual(core.get_supported_color_depth('OPEN_EXR', '8'), '16')
+		self.assertEqual(core.get_supported_color_depth('JPEG', '16'), '8')
+
+
+class FrameRangeTest(unittest.TestCase):
+
+	def test_ranges_are_parsed_from_the_name(self):
+		self.assertEqual(core.parse_frame_ranges("Closeup 10-20 and 40-50"), [(10, 20), (40, 50)])
+		self.assertEqual(core.parse_frame_ranges("Closeup"), [])
+		self.assertEqual(core.get_first_frame("Wide 40-50 10-20"), 10)
+		self.assertEqual(core.get_first_frame("Wide"), math.inf)
+
+	def test_schedule_is_sorted_by_start(self):
+		schedule = core.compile_frame_range_schedule(["Wide 50-60", "Closeup 1-49", "Unused"])
+		self.assertEqual(schedule, [("Closeup 1-49", 1, 49), ("Wide 50-60", 50, 60)])
+
+	def test_index_finds_the_camera_of_each_frame(self):
+		closeup, wide = Camera("Closeup"), Camera("Wide")
+		index = core.FrameRangeIndex([(wide, 11, 20), (closeup, 1, 10)])
+		self.assertIs(index.camera_at(1), closeup)
+		self.assertIs(index.camera_at(10), closeup)
+		self.assertIs(index.camera_at(11), wide)
+		self.assertIsNone(index.camera_at(21))
+
+	def test_overlaps_go_to_the_range_that_starts_first(self):
+		closeup, wide = Camera("Closeup"), Camera("Wide")
+		index = core.FrameRangeIndex([(closeup, 1, 10), (wide, 5, 20), (closeup, 30, 40)])
+		self.assertIs(index.camera_at(7), closeup)
+		self.assertEqual(index.overlaps, (("Closeup", "Wide", 5, 10),))
+		self.assertEqual(index.gaps, ((21, 29),))
+
+	def test_long_timelines_use_the_binary_search(self):
+		closeup, wide = Camera("Closeup"), Camera("Wide")
+		index = core.FrameRangeIndex([(closeup, 1, 10), (wide, 1000000, 1000010)])
+		self.assertIsNone(index.lookup_table)
+		self.assertIs(index.camera_at(1000005), wide)
+		self.assertIsNone(index.camera_at(500))
+
+	def test_sequence_plan_merges_segments_of_the_same_camera(self):
+		closeup, wide = Camera("Closeup"), Camera("Wide")
+		index = core.FrameRangeIndex([(closeup, 1, 10), (closeup, 11, 20), (wide, 21, 30)])
+		self.assertEqual(core.build_sequence_render_plan(index, 5, 25), [(closeup, 5, 20), (wide, 21, 25)])
+
+	def test_contiguous_runs(self):
+		self.assertEqual(core.get_contiguous_runs([1, 2, 3, 7, 9, 10]), [(1, 3), (7, 7), (9, 10)])
+		self.assertEqual(core.get_contiguous_runs([]), [])
+
+
+class RenderStatusTest(unittest.TestCase):
+
+	def test_sampling_status_lines(self):
+		self.assertTrue(core.is_sampling_status("Fra:1 Mem:12M | Scene | Sample 12/128"))
+		self.assertTrue(core.is_sampling_status("Fra:1 | Rendering 3 / 64 samples"))
+		self.assertFalse(core.is_sampling_status("Fra:1 | Synchronizing object | Cube"))
+		self.assertFalse(core.is_sampling_status("Fra:1 | Loading render kernels"))
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,101 @@
+# TESTS OF THE ANIMATION RENDERS
+#
+# Renders tiny Workbench images from a scene with Preview Sequence enabled, and
+# checks which camera rendered each frame. Run it with Blender from the root of
+# the repository:
+#
+#   blender -b --factory-startup --python tests/test_render_animation.py
+#
+# Without Blender (e.g. under pytest) the tests are skipped.
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import importlib.util
+
+try:
+	import bpy
+except ImportError:
+	bpy = None
+
+
+addon_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "jb-multicamera.py")
+
+
+def load_addon(path):
+	# The file name is not a valid module name, so it is loaded from its path
+	spec = importlib.util.spec_from_file_location("jb_multicamera", path)
+	addon = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(addon)
+	addon.register()
+	return addon
+
+
+@unittest.skipIf(bpy is None, "needs Blender")
+class PreviewSequenceTest(unittest.TestCase):
+	# With Preview Sequence on, a frame change makes the camera of the frame range
+	# the scene camera. Renders of one camera's animation must not follow it.
+
+	@classmethod
+	def setUpClass(cls):
+		cls.addon = load_addon(addon_path)
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.addon.unregister()
+
+	def setUp(self):
+		bpy.ops.wm.read_factory_settings(use_empty=True)
+		self.output_directory = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.output_directory, ignore_errors=True)
+
+		scene = bpy.context.scene
+		scene.frame_start = 1
+		scene.frame_end = 3
+		scene.render.engine = 'BLENDER_WORKBENCH'
+		scene.render.resolution_x = 16
+		scene.render.resolution_y = 16
+		scene.render.resolution_percentage = 100
+		scene.render.filepath = self.output_directory + os.sep
+		scene.resume_interrupted_renders = False
+
+		# The sequence camera covers every frame, the others have no frame range
+		for name in ("Sequence 1-3", "Closeup", "Wide"):
+			camera = bpy.data.objects.new(name, bpy.data.cameras.new(name))
+			scene.collection.objects.link(camera)
+		scene.camera = bpy.data.objects["Sequence 1-3"]
+
+		self.addon.populate_camera_list(scene)
+		self.addon.compile_frame_range_index(scene)
+		scene.is_previewing_animation = True
+		self.scene = scene
+
+		# The camera of every render, in the order they ran
+		self.rendered_cameras = []
+		bpy.app.handlers.render_pre.append(self.on_render_pre)
+		self.addCleanup(bpy.app.handlers.render_pre.remove, self.on_render_pre)
+
+	def on_render_pre(self, scene, depsgraph=None):
+		self.rendered_cameras.append((scene.frame_current, scene.camera.name))
+
+	def test_camera_animation_renders_its_own_camera(self):
+		closeup = bpy.data.objects["Closeup"]
+		self.addon.render_camera_animation(self.scene, closeup, self.scene.cameras["Closeup"])
+
+		self.assertEqual(self.rendered_cameras, [(frame, "Closeup") for frame in (1, 2, 3)])
+		self.assertEqual(self.scene.camera.name, "Sequence 1-3")
+
+	def test_frame_major_renders_each_camera(self):
+		camera_items = [self.scene.cameras["Closeup"], self.scene.cameras["Wide"]]
+		self.addon.render_cameras_frame_major(self.scene, camera_items)
+
+		self.assertEqual(self.rendered_cameras, [(frame, name) for frame in (1, 2, 3) for name in ("Closeup", "Wide")])
+		self.assertEqual(self.scene.camera.name, "Sequence 1-3")
+
+
+if __name__ == "__main__":
+	argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+	result = unittest.main(argv=[sys.argv[0]] + argv, exit=False).result
+	sys.exit(0 if result.wasSuccessful() else 1)